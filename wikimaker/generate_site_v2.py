@@ -2,24 +2,23 @@
 """Static site generator v2 - Single JSON file with compression."""
 
 import argparse
-import json
-import gzip
+import sys
 from pathlib import Path
-from collections import defaultdict
 
-
-def get_latest_extraction(extractions_dir: Path) -> Path:
-    """Find the most recent extraction directory by sorting folder names."""
-    if not extractions_dir.exists():
-        raise FileNotFoundError(f"Extractions directory not found: {extractions_dir}")
-
-    # Get all directories, sort by name (timestamps sort correctly alphabetically)
-    dirs = sorted([d for d in extractions_dir.iterdir() if d.is_dir()], reverse=True)
-
-    if not dirs:
-        raise FileNotFoundError(f"No extraction directories found in: {extractions_dir}")
-
-    return dirs[0]
+# Re-exported so existing `generate_site_v2.<name>` callers keep working
+from itemdb import (  # noqa: F401
+    CATEGORIES,
+    ItemDatabase,
+    clean_extracted_data,
+    default_extractions_dir,
+    extract_item_data,
+    get_item_name,
+    get_latest_extraction,
+    is_valid_item,
+    load_items_from_path,
+)
+from itemdb.build import DEFAULT_STATE_DIR, PAYLOAD_REPORT, build_database, site_pipeline, write_database  # noqa: F401
+from itemdb.stages import print_report
 
 
 def parse_args():
@@ -36,347 +35,165 @@ def parse_args():
         default=Path("website"),
         help="Output directory for generated files (default: website)"
     )
+    parser.add_argument(
+        "--text-templates",
+        action="store_true",
+        help="Also store near-duplicate text (differing only in numbers) as shared templates"
+    )
+    parser.add_argument(
+        "--selective",
+        action="store_true",
+        help="Parse .jbp files with a field projection, skipping subtrees the extractor never reads"
+    )
+    parser.add_argument(
+        "--discover-categories",
+        action="store_true",
+        help="Build the category list from a census of the extraction instead of the hand-written one"
+    )
+    parser.add_argument(
+        "--zstd",
+        nargs="?",
+        const="category",
+        choices=("category", "item"),
+        help="Report how zstd shards (per category by default, or per item) compressed against a trained "
+             "dictionary would compare with gzip and brotli; writes no shards (needs zstandard)"
+    )
+    parser.add_argument(
+        "--zstd-dict-size",
+        type=int,
+        help="Size in bytes of the trained zstd dictionary (default: 16384)"
+    )
+    parser.add_argument(
+        "--payload-report",
+        action="store_true",
+        help="Break items.json size down by section, field, category and item, compared with the previous build"
+    )
+    parser.add_argument(
+        "--budgets",
+        type=Path,
+        help="JSON file of payload size budgets (implies --payload-report); exit with an error if any is exceeded"
+    )
+    parser.add_argument(
+        "--payload-baseline",
+        type=Path,
+        help="Previous items.json or saved report to compare the payload against "
+             "(default: the report from the last build)"
+    )
+    parser.add_argument(
+        "--images-dir",
+        type=Path,
+        default=Path("..") / "viewer-mod" / "blueprint-dump",
+        help="Directory of <guid>.png item icons to copy into <output-dir>/images "
+             "(default: ../viewer-mod/blueprint-dump)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Build stages to run at once (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun every build stage even if its outputs are up to date"
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=Path,
+        default=DEFAULT_STATE_DIR,
+        help=f"Where stage fingerprints and cached extractions are kept (default: {DEFAULT_STATE_DIR})"
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Also index every extraction next to the selected one and write per-item change timelines (history.json)"
+    )
+    parser.add_argument(
+        "--history-store",
+        type=Path,
+        default=Path(".history") / "store.json",
+        help="Path of the history store used by --history (default: .history/store.json)"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="After building, serve the output directory and rebuild when sources or extraction files change"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port for --serve (default: 8000)"
+    )
     return parser.parse_args()
 
 
-# These will be set in main() based on arguments
-DATA_DIR = None
-OUTPUT_DIR = Path("website")
-
-# Category configuration with paths
-CATEGORIES = {
-    "all": {"title": "All Items", "path": None, "icon": "📦"},
-    "weapons": {
-        "title": "Weapons",
-        "path": "Kingmaker/Blueprints/Items/Weapons/BlueprintItemWeapon",
-        "icon": "⚔️",
-    },
-    "armor": {
-        "title": "Armor",
-        "path": "Kingmaker/Blueprints/Items/Armors/BlueprintItemArmor",
-        "icon": "🛡️",
-    },
-    "shields": {
-        "title": "Shields",
-        "path": "Kingmaker/Blueprints/Items/Shields/BlueprintItemShield",
-        "icon": "🔰",
-    },
-    "helmets": {
-        "title": "Helmets",
-        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentHead",
-        "icon": "🪖",
-    },
-    "gloves": {
-        "title": "Gloves",
-        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentGloves",
-        "icon": "🧤",
-    },
-    "boots": {
-        "title": "Boots",
-        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentFeet",
-        "icon": "👢",
-    },
-    "cloaks": {
-        "title": "Cloaks",
-        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentShoulders",
-        "icon": "🧥",
-    },
-    "rings": {
-        "title": "Rings",
-        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentRing",
-        "icon": "💍",
-    },
-    "amulets": {
-        "title": "Amulets",
-        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentNeck",
-        "icon": "📿",
-    },
-    "usables": {
-        "title": "Consumables",
-        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentUsable",
-        "icon": "🧪",
-    },
-    "starship-weapons": {
-        "title": "Starship Weapons",
-        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintStarshipWeapon",
-        "icon": "🚀",
-    },
-    "void-shields": {
-        "title": "Void Shields",
-        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintItemVoidShieldGenerator",
-        "icon": "🛸",
-    },
-    "plasma-drives": {
-        "title": "Plasma Drives",
-        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintItemPlasmaDrives",
-        "icon": "⚡",
-    },
-    "auger-arrays": {
-        "title": "Auger Arrays",
-        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintItemAugerArray",
-        "icon": "📡",
-    },
-}
-
-
-def load_items_from_path(category_path: str) -> list:
-    """Load all items from a category directory."""
-    items = []
-    full_path = DATA_DIR / category_path
-    if not full_path.exists():
-        print(f"  Warning: Path does not exist: {full_path}")
-        return items
-
-    for jbp_file in full_path.glob("*.jbp"):
-        try:
-            with open(jbp_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                items.append(data)
-        except Exception as e:
-            print(f"  Error loading {jbp_file}: {e}")
-
-    return items
-
-
-def get_item_name(item: dict) -> str:
-    """Get the display name for an item, trying multiple sources."""
-    data = item.get("data", {})
-
-    # Try data.Name first (capitalized, usually the display name)
-    name = data.get("Name", "")
-    if name:
-        return name
-
-    # Try top-level name
-    name = item.get("name", "")
-    if name:
-        return name
-
-    # Fall back to data.name (internal code name)
-    name = data.get("name", "")
-    if name:
-        # Clean up internal names like "Bolter_VoidCrypt_Cutscene" -> "Bolter VoidCrypt Cutscene"
-        return name.replace("_", " ")
-
-    return ""
-
-
-def is_valid_item(item: dict, extracted: dict) -> bool:
-    """Check if an item should be included (not a template/prototype)."""
-    # Must have a name
-    if not extracted.get("name"):
-        return False
-
-    # For weapons, filter out 0-0 damage items (templates)
-    if extracted.get("category") == "weapons":
-        if extracted.get("damageMin", 0) == 0 and extracted.get("damageMax", 0) == 0:
-            # Exception: some melee weapons might legitimately have 0 base damage
-            if not extracted.get("isMelee"):
-                return False
-
-    return True
-
-
-def clean_extracted_data(extracted: dict) -> dict:
-    """Remove null/placeholder values from extracted data."""
-    cleaned = {}
-    for key, value in extracted.items():
-        # Skip empty strings
-        if value == "":
-            continue
-        # Skip -1 values (used for N/A, e.g., ammo on melee weapons)
-        if value == -1:
-            continue
-        # Skip 0 for optional numeric fields (but keep for some fields like damageMin)
-        if value == 0 and key in ("dodgePenetration", "rateOfFire", "recoil", "shieldStrength", "detectionRadius"):
-            continue
-        # Skip False for boolean fields
-        if value is False and key in ("isRanged", "isMelee"):
-            continue
-        # Skip empty lists
-        if isinstance(value, list) and len(value) == 0:
-            continue
-        cleaned[key] = value
-    return cleaned
-
-
-def extract_item_data(item: dict, category: str) -> dict:
-    """Extract relevant fields from item for the JSON database."""
-    data = item.get("data", {})
-
-    # Common fields
-    extracted = {
-        "id": item.get("guid", ""),
-        "name": get_item_name(item),
-        "category": category,
-        "type": item.get("$type", "").split(".")[-1],
-        "rarity": data.get("Rarity", "Common"),
-        "description": data.get("Description", "") or "",
-        "flavorText": data.get("FlavorText", "") or "",
-    }
-
-    # Weapon-specific fields
-    if "Weapon" in item.get("$type", "") and "Starship" not in item.get("$type", ""):
-        extracted.update({
-            "damageMin": data.get("WarhammerDamage", 0),
-            "damageMax": data.get("WarhammerMaxDamage", data.get("WarhammerDamage", 0)),
-            "penetration": data.get("WarhammerPenetration", 0),
-            "dodgePenetration": data.get("DodgePenetration", 0),
-            "range": data.get("WarhammerMaxDistance", data.get("AttackRange", 0)),
-            "ammo": data.get("WarhammerMaxAmmo", 0),
-            "rateOfFire": data.get("RateOfFire", 0),
-            "recoil": data.get("WarhammerRecoil", 0),
-            "family": data.get("Family", ""),
-            "holdingType": data.get("HoldingType", ""),
-            "isRanged": data.get("IsRanged", False),
-            "isMelee": data.get("IsMelee", False),
-            "damageType": data.get("m_DamageType", {}).get("Type", "") if isinstance(data.get("m_DamageType"), dict) else "",
-        })
-
-        # Extract weapon abilities
-        abilities = []
-        wa = data.get("WeaponAbilities", {})
-        if isinstance(wa, dict) and "items" in wa:
-            for ab in wa.get("items", []):
-                if isinstance(ab, dict) and not ab.get("IsNone", True):
-                    ab_type = ab.get("Type", "")
-                    ap = ab.get("AP", 0)
-                    if ab_type:
-                        abilities.append({"type": ab_type, "ap": ap})
-        extracted["abilities"] = abilities
-
-    # Armor-specific fields
-    elif "Armor" in item.get("$type", "") and "Plating" not in item.get("$type", ""):
-        extracted.update({
-            "damageAbsorption": data.get("DamageAbsorption", 0),
-            "damageDeflection": data.get("DamageDeflection", 0),
-            "armorCategory": data.get("Category", ""),
-        })
-
-    # Starship weapon fields
-    elif "StarshipWeapon" in item.get("$type", ""):
-        slots = data.get("AllowedSlots", {})
-        slot_list = slots.get("items", []) if isinstance(slots, dict) else []
-        extracted.update({
-            "weaponType": data.get("WeaponType", ""),
-            "damageInstances": data.get("DamageInstances", 1),
-            "allowedSlots": slot_list,
-        })
-
-    # Void shield fields
-    elif "VoidShield" in item.get("$type", ""):
-        extracted.update({
-            "shieldStrength": data.get("ShieldStrengthBonus", 0),
-        })
-
-    # Plasma drive fields
-    elif "PlasmaDrives" in item.get("$type", ""):
-        extracted.update({
-            "speed": data.get("Speed", 0),
-            "maneuverability": data.get("Maneuverability", 0),
-        })
-
-    # Auger array fields
-    elif "AugerArray" in item.get("$type", ""):
-        extracted.update({
-            "detectionRadius": data.get("DetectionRadiusBonus", 0),
-        })
-
-    return clean_extracted_data(extracted)
-
-
 def main():
-    global DATA_DIR, OUTPUT_DIR
-
     args = parse_args()
 
     # Determine extraction directory
     if args.extraction_dir:
-        DATA_DIR = args.extraction_dir
+        data_dir = args.extraction_dir
     else:
         # Find the latest extraction directory
-        script_dir = Path(__file__).parent
-        extractions_dir = script_dir / ".." / "extractions"
-        DATA_DIR = get_latest_extraction(extractions_dir.resolve())
+        data_dir = get_latest_extraction(default_extractions_dir())
 
-    OUTPUT_DIR = args.output_dir
+    output_dir = args.output_dir
 
-    print(f"Using extraction: {DATA_DIR.name}")
+    print(f"Using extraction: {data_dir.name}")
     print("Generating static site v2 (SPA with compressed JSON)...")
 
     # Ensure output directory exists
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Load all items
-    all_items = []
-    counts = {"all": 0}
-
-    for cat_id, cat_config in CATEGORIES.items():
-        if cat_id == "all":
-            continue
-
-        path = cat_config.get("path")
-        if not path:
-            continue
-
-        print(f"Loading {cat_id}...")
-        raw_items = load_items_from_path(path)
-
-        valid_count = 0
-        for item in raw_items:
-            extracted = extract_item_data(item, cat_id)
-            if is_valid_item(item, extracted):
-                all_items.append(extracted)
-                valid_count += 1
-
-        print(f"  Found {len(raw_items)} items, {valid_count} valid")
-        counts[cat_id] = valid_count
-
-    counts["all"] = len(all_items)
-
-    # Sort by name
-    all_items.sort(key=lambda x: x.get("name", "").lower())
-
-    # Create the database object
-    database = {
-        "items": all_items,
-        "counts": counts,
-        "categories": {k: {"title": v["title"], "icon": v["icon"]} for k, v in CATEGORIES.items()},
-    }
-
-    # Write uncompressed JSON
-    json_path = OUTPUT_DIR / "items.json"
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(database, f, separators=(',', ':'))  # Minified
-
-    uncompressed_size = json_path.stat().st_size
-    print(f"\nUncompressed JSON: {uncompressed_size:,} bytes ({uncompressed_size/1024/1024:.2f} MB)")
-
-    # Write gzip compressed (maximum compression level 9)
-    gz_path = OUTPUT_DIR / "items.json.gz"
-    with gzip.open(gz_path, 'wt', encoding='utf-8', compresslevel=9) as f:
-        json.dump(database, f, separators=(',', ':'))
-
-    gz_size = gz_path.stat().st_size
-    print(f"Gzip compressed:   {gz_size:,} bytes ({gz_size/1024:.2f} KB) - {gz_size/uncompressed_size*100:.1f}% of original")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Pick categories: hand-written, or discovered from a census pass over the extraction
+    categories = None
+    if args.discover_categories:
+        from itemdb.census import discover_categories, take_census
+        census = take_census(data_dir)
+        categories = discover_categories(census)
+        new = [cat_id for cat_id in categories if cat_id not in CATEGORIES]
+        print(f"Discovered {len(categories) - 1} categories from {census['files']:,} files"
+              f"{' (new: ' + ', '.join(new) + ')' if new else ''}")
+
+    # Load, extract, encode and compress as a stage graph; independent stages run concurrently.
+    # --serve rebuilds with the same options.
+    options = dict(
+        data_dir=data_dir, output_dir=output_dir, categories=categories, text_templates=args.text_templates,
+        selective=args.selective, images_dir=args.images_dir, jobs=args.jobs, state_dir=args.state_dir,
+        zstd_by=args.zstd, zstd_dict_size=args.zstd_dict_size,
+        payload=args.payload_report or args.budgets is not None or args.payload_baseline is not None,
+        budgets=args.budgets, baseline=args.payload_baseline,
+        history_store=args.history_store if args.history else None,
+        extractions_dir=args.extraction_dir.parent if args.extraction_dir else default_extractions_dir(),
+    )
+    pipeline = site_pipeline(**options)
+    results = pipeline.run(force=args.force)
+    print_report(pipeline.report)
 
-    # Try brotli if available
-    try:
-        import brotli
-        br_path = OUTPUT_DIR / "items.json.br"
-        json_bytes = json.dumps(database, separators=(',', ':')).encode('utf-8')
-        compressed = brotli.compress(json_bytes, quality=11)  # Max quality
-        with open(br_path, 'wb') as f:
-            f.write(compressed)
-        br_size = br_path.stat().st_size
-        print(f"Brotli compressed: {br_size:,} bytes ({br_size/1024:.2f} KB) - {br_size/uncompressed_size*100:.1f}% of original")
-    except ImportError:
-        print("Brotli not available (pip install brotli for better compression)")
+    if "history" in results:
+        history = results["history"]
+        print(f"History: {len(history['snapshots'])} snapshots, {len(history['timelines']):,} items with changes")
 
-    print(f"\nTotal items: {len(all_items):,}")
-    print("\nCategory counts:")
-    for cat_id, count in sorted(counts.items(), key=lambda x: -x[1]):
-        print(f"  {cat_id}: {count}")
+    db = results.get("database")
+    if db is None:
+        print("\nitems.json is up to date")
+    else:
+        print(f"\nTotal items: {len(db):,}")
+        print("\nCategory counts:")
+        for cat_id, count in sorted(db.counts().items(), key=lambda x: -x[1]):
+            print(f"  {cat_id}: {count}")
+
+    # Budgets are checked last so every other output is still written
+    if "payload" in pipeline.stages:
+        from itemdb.payload import load_report, print_violations
+        report = results.get("payload") or load_report(args.state_dir / PAYLOAD_REPORT)
+        if report["violations"]:
+            print_violations(report["violations"])
+            sys.exit(1)
+
+    if args.serve:
+        from itemdb.serve import serve
+        serve(options, port=args.port)
 
 
 if __name__ == "__main__":
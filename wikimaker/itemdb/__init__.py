@@ -0,0 +1,32 @@
+"""Importable item database built from blueprint extractions.
+
+    from itemdb import ItemDatabase
+
+    db = ItemDatabase.from_json("website/items.json")
+    db.get("50630c218e7744cd9233e3fa58b04b82")
+    db.query("weapons", where=[("penetration", ">=", 20)], sort=["-damageMax"], limit=10)
+"""
+
+from .categories import CATEGORIES
+from .database import ItemDatabase
+from .extract import (
+    clean_extracted_data,
+    default_extractions_dir,
+    extract_item_data,
+    get_item_name,
+    get_latest_extraction,
+    is_valid_item,
+    load_items_from_path,
+)
+
+__all__ = [
+    "CATEGORIES",
+    "ItemDatabase",
+    "clean_extracted_data",
+    "default_extractions_dir",
+    "extract_item_data",
+    "get_item_name",
+    "get_latest_extraction",
+    "is_valid_item",
+    "load_items_from_path",
+]
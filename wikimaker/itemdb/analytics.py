@@ -0,0 +1,143 @@
+"""Vectorized stat analytics: derived metrics and percentile ranks.
+
+Output is column-oriented so it stays compact in items.json:
+
+    {
+      "weapons": {
+        "rows": [item index, ...],
+        "avgDamage": [...],
+        "avgDamageFamilyPct": [...],
+        "avgDamageCategoryPct": [...],
+        ...
+      },
+      "armor": {...}
+    }
+
+`rows` are indexes into the database's `items` list, so analytics must be
+computed after the final sort. Percentiles are integers 0-100 giving the
+share of items in the same group with a value less than or equal to the
+item's; null means the item has no value for that metric.
+
+Requires NumPy.
+"""
+
+import numpy as np
+
+# Per-category configuration: which item field groups items into "families",
+# the raw stats to rank, and the derived metrics to compute and rank
+ANALYTICS = {
+    "weapons": {
+        "family": "family",
+        "stats": ["penetration", "rateOfFire", "range"],
+        "derived": ["avgDamage", "damagePerAP"],
+    },
+    "armor": {
+        "family": "armorCategory",
+        "stats": ["damageAbsorption", "damageDeflection"],
+        "derived": [],
+    },
+}
+
+
+def _column(items: list, field: str) -> np.ndarray:
+    """Load a numeric field into a float array, with NaN where it is missing."""
+    return np.array(
+        [item.get(field, np.nan) if isinstance(item.get(field), (int, float)) else np.nan for item in items],
+        dtype=np.float64,
+    )
+
+
+def _min_ability_ap(items: list) -> np.ndarray:
+    """Cheapest positive AP cost among each item's abilities (NaN if none)."""
+    return np.array(
+        [min((ab["ap"] for ab in item.get("abilities", []) if ab.get("ap", 0) > 0), default=np.nan) for item in items],
+        dtype=np.float64,
+    )
+
+
+def _avg_damage(items: list) -> np.ndarray:
+    """Midpoint of each item's damage range."""
+    return (_column(items, "damageMin") + _column(items, "damageMax")) / 2
+
+
+def _damage_per_ap(items: list) -> np.ndarray:
+    """Average damage per AP of the item's cheapest ability."""
+    return _avg_damage(items) / _min_ability_ap(items)
+
+
+# Derived metric name -> function computing it for a list of items
+DERIVED = {
+    "avgDamage": _avg_damage,
+    "damagePerAP": _damage_per_ap,
+}
+
+
+def derived_metrics(items: list, names: list) -> dict:
+    """Compute the named derived metrics for a list of items."""
+    return {name: DERIVED[name](items) for name in names}
+
+
+def percentile_ranks(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Percentile rank (0-100) of each value within its group.
+
+    `groups` holds integer group codes. NaN values are excluded from the
+    ranking and get NaN back.
+    """
+    result = np.full(values.shape, np.nan)
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return result
+
+    v = values[valid]
+    g = groups[valid].astype(np.int64)
+
+    # Dense-rank the values so (group, value) pairs pack into one integer key
+    _, dense = np.unique(v, return_inverse=True)
+    span = int(dense.max()) + 1
+    keys = g * span + dense
+    sorted_keys = np.sort(keys)
+
+    at_or_below = np.searchsorted(sorted_keys, keys, side="right")
+    group_start = np.searchsorted(sorted_keys, g * span, side="left")
+    group_end = np.searchsorted(sorted_keys, (g + 1) * span, side="left")
+
+    result[valid] = 100.0 * (at_or_below - group_start) / (group_end - group_start)
+    return result
+
+
+def _to_list(values: np.ndarray, decimals: int) -> list:
+    """Round an array and convert it to a JSON-friendly list (NaN -> None)."""
+    rounded = np.round(values, decimals)
+    if decimals == 0:
+        return [None if np.isnan(x) else int(x) for x in rounded]
+    return [None if np.isnan(x) else float(x) for x in rounded]
+
+
+def compute_analytics(items: list, config: dict = None) -> dict:
+    """Compute derived metrics and percentile ranks per configured category."""
+    config = config if config is not None else ANALYTICS
+    analytics = {}
+
+    for category, cat_config in config.items():
+        rows = [i for i, item in enumerate(items) if item.get("category") == category]
+        if not rows:
+            continue
+        cat_items = [items[i] for i in rows]
+
+        metrics = {field: _column(cat_items, field) for field in cat_config["stats"]}
+        metrics.update(derived_metrics(cat_items, cat_config["derived"]))
+
+        family_names = [item.get(cat_config["family"], "") for item in cat_items]
+        _, family_codes = np.unique(family_names, return_inverse=True)
+        category_codes = np.zeros(len(cat_items), dtype=np.int64)
+
+        columns = {"rows": rows}
+        for name in cat_config["derived"]:
+            columns[name] = _to_list(metrics[name], 2)
+        for name, values in metrics.items():
+            columns[f"{name}FamilyPct"] = _to_list(percentile_ranks(values, family_codes), 0)
+            columns[f"{name}CategoryPct"] = _to_list(percentile_ranks(values, category_codes), 0)
+
+        analytics[category] = columns
+
+    return analytics
@@ -0,0 +1,285 @@
+"""Build stages that turn an ItemDatabase into the site's items.json artifacts.
+
+`build_database` / `write_database` run the steps in sequence;
+`site_pipeline` wires the same steps, per-category loading, the item icon
+copy and the derived outputs into a stages.Pipeline so independent ones run
+concurrently and up-to-date outputs are skipped. The generator and the
+preview server's rebuilds both run that pipeline.
+"""
+
+import gzip
+import importlib.util
+import json
+import os
+import shutil
+from pathlib import Path
+
+from .categories import CATEGORIES, category_paths
+from .database import ItemDatabase
+from .extract import extract_item_data, is_valid_item, load_items_from_path
+from .images import attach_icons, icon_index
+from .markup import COMPILED_FIELDS, compile_text
+from .stages import Pipeline, Stage, files_in
+from .strings import intern_text
+
+# Generator sources; any change invalidates every stage that extracts or encodes
+SOURCE_FILES = tuple(sorted(Path(__file__).parent.glob("*.py")))
+
+# Stage fingerprints and cached per-category extractions (kept out of the site)
+DEFAULT_STATE_DIR = Path(".build")
+
+# Last payload size report, the default baseline for the next one
+PAYLOAD_REPORT = "payload.json"
+
+# Last zstd shard size report (itemdb.shards)
+ZSTD_REPORT = "zstd.json"
+
+# Shards that builds used to write into the site; removed when found
+ZSTD_DIR = "zstd"
+
+
+def compute_analytics_section(db: ItemDatabase):
+    """Derived metrics and rankings (needs NumPy); None if it is unavailable."""
+    try:
+        from .analytics import compute_analytics
+    except ImportError:
+        print("NumPy not available (pip install numpy for stat rankings)")
+        return None
+    analytics = compute_analytics(db.items)
+    print(f"Computed analytics for: {', '.join(analytics)}")
+    return analytics
+
+
+def compile_database_text(db: ItemDatabase, text_templates: bool = False) -> tuple:
+    """Compile description markup and intern text; return (items, text table)."""
+    # Compile description markup once here so the client does no regex work
+    items = compile_text(db.items)
+
+    # Move repeated text into a shared string table
+    items, text = intern_text(items, fields=COMPILED_FIELDS, templates=text_templates)
+    print(f"String table: {len(text['strings']):,} strings, {len(text.get('templates', [])):,} templates")
+    return items, text
+
+
+def assemble_database(db: ItemDatabase, analytics, compiled: tuple, icons: dict = None) -> dict:
+    """Create the items.json database object from the stage results."""
+    database = db.to_dict()
+    if analytics is not None:
+        database["analytics"] = analytics
+    database["items"], database["text"] = compiled
+    if icons is not None:
+        attach_icons(database["items"], icons)
+    return database
+
+
+def build_database(db: ItemDatabase, text_templates: bool = False, icons: dict = None) -> dict:
+    """Create the items.json database object from loaded items (and icon metadata)."""
+    return assemble_database(db, compute_analytics_section(db), compile_database_text(db, text_templates), icons)
+
+
+def write_file(path: Path, data: bytes):
+    """Write a file atomically so a server never sees it half-written."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def encode_database(database: dict, output_dir: Path) -> bytes:
+    """Write minified items.json; return its bytes."""
+    json_bytes = json.dumps(database, separators=(',', ':')).encode('utf-8')
+    write_file(output_dir / "items.json", json_bytes)
+    print(f"Uncompressed JSON: {len(json_bytes):,} bytes ({len(json_bytes)/1024/1024:.2f} MB)")
+    return json_bytes
+
+
+def _read_json_bytes(output_dir: Path, json_bytes) -> bytes:
+    return json_bytes if json_bytes is not None else (output_dir / "items.json").read_bytes()
+
+
+def write_gzip(output_dir: Path, json_bytes: bytes = None) -> int:
+    """Write items.json.gz (level 9, reproducible); return its size."""
+    json_bytes = _read_json_bytes(output_dir, json_bytes)
+    gz_bytes = gzip.compress(json_bytes, compresslevel=9, mtime=0)
+    write_file(output_dir / "items.json.gz", gz_bytes)
+    print(f"Gzip compressed:   {len(gz_bytes):,} bytes ({len(gz_bytes)/1024:.2f} KB) - "
+          f"{len(gz_bytes)/len(json_bytes)*100:.1f}% of original")
+    return len(gz_bytes)
+
+
+def write_brotli(output_dir: Path, json_bytes: bytes = None) -> int:
+    """Write items.json.br (quality 11); return its size. Needs brotli."""
+    import brotli
+    json_bytes = _read_json_bytes(output_dir, json_bytes)
+    compressed = brotli.compress(json_bytes, quality=11)  # Max quality
+    write_file(output_dir / "items.json.br", compressed)
+    print(f"Brotli compressed: {len(compressed):,} bytes ({len(compressed)/1024:.2f} KB) - "
+          f"{len(compressed)/len(json_bytes)*100:.1f}% of original")
+    return len(compressed)
+
+
+def write_database(database: dict, output_dir: Path) -> dict:
+    """Write items.json plus its gzip and brotli encodings; return their sizes."""
+    print()
+    json_bytes = encode_database(database, output_dir)
+    sizes = {"json": len(json_bytes), "gz": write_gzip(output_dir, json_bytes)}
+    try:
+        sizes["br"] = write_brotli(output_dir, json_bytes)
+    except ImportError:
+        print("Brotli not available (pip install brotli for better compression)")
+    return sizes
+
+
+def encode_stage(output_dir: Path, db: ItemDatabase, analytics, compiled: tuple, icons: dict = None) -> bytes:
+    """Assemble the database object from the stage results and write items.json."""
+    return encode_database(assemble_database(db, analytics, compiled, icons), output_dir)
+
+
+def load_category(data_dir: Path, cat_id: str, paths: tuple, selective: bool = False) -> list:
+    """Load and extract one category from its directories; return its valid items."""
+    raw_items = [item for path in paths for item in load_items_from_path(data_dir, path, selective)]
+    items = []
+    for item in raw_items:
+        extracted = extract_item_data(item, cat_id)
+        if is_valid_item(item, extracted):
+            items.append(extracted)
+    print(f"  {cat_id}: {len(raw_items)} items, {len(items)} valid")
+    return items
+
+
+def merge_categories(categories: dict, *category_items) -> ItemDatabase:
+    """Combine per-category results into a sorted ItemDatabase."""
+    db = ItemDatabase([], categories)
+    for items in category_items:
+        for item in items:
+            db.add(item)
+    db.sort()
+    return db
+
+
+def copy_images(source_dir: Path, dest_dir: Path) -> int:
+    """Copy item icons whose size or mtime changed; return the number copied."""
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for source in files_in(source_dir, "*.png"):
+        dest = dest_dir / source.name
+        st = source.stat()
+        try:
+            existing = dest.stat()
+            if existing.st_size == st.st_size and existing.st_mtime_ns == st.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        shutil.copy2(source, dest)
+        copied += 1
+    print(f"Images: copied {copied:,} changed icons to {dest_dir}")
+    return copied
+
+
+def site_pipeline(data_dir: Path, output_dir: Path, categories: dict = None, text_templates: bool = False,
+                  selective: bool = False, images_dir: Path = None, jobs: int = None,
+                  state_dir: Path = DEFAULT_STATE_DIR, zstd_by: str = None, zstd_dict_size: int = None,
+                  payload: bool = False, budgets: Path = None, baseline: Path = None,
+                  history_store: Path = None, extractions_dir: Path = None) -> Pipeline:
+    """Build the stage graph that generates the site from an extraction.
+
+    load:<category> -> database -> (analytics, text) -> encode -> (gzip, brotli, zstd,
+    search, prerender). Icons in `images_dir` are copied by `images` and summarized by
+    `icons`, whose metadata encode adds to the items. `references` indexes
+    blueprint-to-blueprint references across the whole extraction. `zstd`
+    (a shard size report; no shards are written) only runs when `zstd_by`
+    ("category" or "item") is given, and `payload`
+    (size attribution, checked against `budgets`) when `payload` is set.
+    `history` indexes every extraction in `extractions_dir` (default: the
+    one holding `data_dir`) into `history_store` when a store is given.
+    """
+    categories = categories if categories is not None else CATEGORIES
+    pipeline = Pipeline(state_dir / "state.json", jobs)
+    outputs = {name: output_dir / name for name in ("items.json", "items.json.gz", "items.json.br")}
+
+    load_stages = []
+    for cat_id, cat_config in categories.items():
+        paths = tuple(category_paths(cat_config))
+        if not paths:
+            continue
+        name = f"load:{cat_id}"
+        pipeline.add(Stage(
+            name, load_category, args=(data_dir, cat_id, paths, selective),
+            sources=[f for path in paths for f in files_in(data_dir / path, "*.jbp")] + list(SOURCE_FILES),
+            params={"selective": selective}, process=True, cache=True,
+        ))
+        load_stages.append(name)
+
+    pipeline.add(Stage("database", merge_categories, args=(categories,), deps=load_stages,
+                       params={"categories": categories}))
+    pipeline.add(Stage("analytics", compute_analytics_section, deps=("database",)))
+    pipeline.add(Stage("text", compile_database_text, deps=("database",),
+                       params={"textTemplates": text_templates}))
+    encode_deps = ["database", "analytics", "text"]
+    if images_dir is not None and images_dir.is_dir():
+        icon_files = files_in(images_dir, "*.png")
+        pipeline.add(Stage("images", copy_images, args=(images_dir, output_dir / "images"),
+                           outputs=[output_dir / "images"], sources=icon_files))
+        pipeline.add(Stage("icons", icon_index, args=(images_dir,), sources=icon_files + list(SOURCE_FILES),
+                           params={"pillow": importlib.util.find_spec("PIL") is not None}, process=True, cache=True))
+        encode_deps.append("icons")
+
+    pipeline.add(Stage("encode", encode_stage, args=(output_dir,), deps=encode_deps,
+                       outputs=[outputs["items.json"]]))
+    pipeline.add(Stage("gzip", write_gzip, args=(output_dir,), after=("encode",),
+                       outputs=[outputs["items.json.gz"]]))
+    try:
+        import brotli  # noqa: F401
+        pipeline.add(Stage("brotli", write_brotli, args=(output_dir,), after=("encode",),
+                           outputs=[outputs["items.json.br"]], process=True))
+    except ImportError:
+        print("Brotli not available (pip install brotli for better compression)")
+
+    from .search import SEARCH_INDEX_FILE, write_search_index_from_json
+    pipeline.add(Stage("search", write_search_index_from_json, args=(output_dir,), after=("encode",),
+                       outputs=[output_dir / SEARCH_INDEX_FILE]))
+
+    from .references import REFERENCES_FILE, write_references
+    # Every blueprint in the extraction, not only the categories' item folders
+    pipeline.add(Stage("references", write_references, args=(data_dir, output_dir),
+                       outputs=[output_dir / REFERENCES_FILE],
+                       sources=files_in(data_dir, "**/*.jbp") + list(SOURCE_FILES), process=True))
+
+    from .prerender import ITEMS_DIR, TEMPLATE, write_shells
+    # Static pages for item and category links; they read the SPA page as their template
+    pipeline.add(Stage("prerender", write_shells, args=(output_dir,), after=("encode",),
+                       outputs=[output_dir / ITEMS_DIR, *(output_dir / f"{cat_id}.html" for cat_id in categories
+                                                          if cat_id != "all")],
+                       sources=[TEMPLATE, *SOURCE_FILES], process=True))
+
+    if zstd_by:
+        try:
+            from .shards import DEFAULT_DICT_SIZE, zstd_report_from_json
+            dict_size = zstd_dict_size or DEFAULT_DICT_SIZE
+            # Report only, kept in the state dir: nothing in the site reads shards
+            pipeline.add(Stage("zstd", zstd_report_from_json,
+                               args=(output_dir, state_dir / ZSTD_REPORT, zstd_by, dict_size), after=("encode",),
+                               outputs=[state_dir / ZSTD_REPORT], params={"by": zstd_by, "dictSize": dict_size},
+                               process=True))
+        except ImportError:
+            print("zstandard not available (pip install zstandard for the zstd shard report)")
+    if (output_dir / ZSTD_DIR).is_dir():
+        shutil.rmtree(output_dir / ZSTD_DIR)
+        print(f"Removed zstd shards left by an older build ({output_dir / ZSTD_DIR})")
+
+    if payload:
+        from .payload import payload_report
+        # The last report (kept in the state dir) is the baseline unless one is given
+        pipeline.add(Stage("payload", payload_report,
+                           args=(outputs["items.json"], state_dir / PAYLOAD_REPORT, budgets, baseline),
+                           after=tuple(name for name in ("encode", "gzip", "brotli") if name in pipeline.stages),
+                           outputs=[state_dir / PAYLOAD_REPORT], sources=[path for path in (budgets, baseline) if path],
+                           process=True))
+
+    if history_store is not None:
+        from .history import build_history
+        # Reads every extraction and keeps its own incremental store, so it always runs
+        pipeline.add(Stage("history", build_history,
+                           args=(extractions_dir or data_dir.parent, history_store, output_dir, selective, categories),
+                           always=True))
+    return pipeline
@@ -0,0 +1,84 @@
+"""Category configuration shared by the generator and the query tools."""
+
+# Category configuration with paths. A category may list several directories
+# as `paths` (discovered categories do, for types spread over more than one).
+CATEGORIES = {
+    "all": {"title": "All Items", "path": None, "icon": "📦"},
+    "weapons": {
+        "title": "Weapons",
+        "path": "Kingmaker/Blueprints/Items/Weapons/BlueprintItemWeapon",
+        "icon": "⚔️",
+    },
+    "armor": {
+        "title": "Armor",
+        "path": "Kingmaker/Blueprints/Items/Armors/BlueprintItemArmor",
+        "icon": "🛡️",
+    },
+    "shields": {
+        "title": "Shields",
+        "path": "Kingmaker/Blueprints/Items/Shields/BlueprintItemShield",
+        "icon": "🔰",
+    },
+    "helmets": {
+        "title": "Helmets",
+        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentHead",
+        "icon": "🪖",
+    },
+    "gloves": {
+        "title": "Gloves",
+        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentGloves",
+        "icon": "🧤",
+    },
+    "boots": {
+        "title": "Boots",
+        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentFeet",
+        "icon": "👢",
+    },
+    "cloaks": {
+        "title": "Cloaks",
+        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentShoulders",
+        "icon": "🧥",
+    },
+    "rings": {
+        "title": "Rings",
+        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentRing",
+        "icon": "💍",
+    },
+    "amulets": {
+        "title": "Amulets",
+        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentNeck",
+        "icon": "📿",
+    },
+    "usables": {
+        "title": "Consumables",
+        "path": "Kingmaker/Blueprints/Items/Equipment/BlueprintItemEquipmentUsable",
+        "icon": "🧪",
+    },
+    "starship-weapons": {
+        "title": "Starship Weapons",
+        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintStarshipWeapon",
+        "icon": "🚀",
+    },
+    "void-shields": {
+        "title": "Void Shields",
+        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintItemVoidShieldGenerator",
+        "icon": "🛸",
+    },
+    "plasma-drives": {
+        "title": "Plasma Drives",
+        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintItemPlasmaDrives",
+        "icon": "⚡",
+    },
+    "auger-arrays": {
+        "title": "Auger Arrays",
+        "path": "Warhammer/SpaceCombat/Blueprints/BlueprintItemAugerArray",
+        "icon": "📡",
+    },
+}
+
+
+def category_paths(config: dict) -> list:
+    """Return the directories a category loads its .jbp files from."""
+    if config.get("paths"):
+        return list(config["paths"])
+    return [config["path"]] if config.get("path") else []
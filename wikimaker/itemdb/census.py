@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Census of an extraction and automatic category discovery.
+
+Walks the extraction tree once and records, per blueprint $type, how many
+files there are, where they live, how big they are and which `data` fields
+they carry (with the JSON kinds seen for each). This is a pass of its own:
+the census keeps only these counts, and the build's load stages read their
+categories' files again afterwards. From the census:
+
+- discover_categories() builds a CATEGORIES-style map: every item type
+  becomes a category, reusing the id/title/icon of a hand-written
+  category whose path matches and CATEGORY_OVERRIDES for known new ones.
+  A type spread over several directories loads from all of them (`paths`)
+- the report lists unmapped types and per-type field coverage
+
+Usage (run from wikimaker/):
+    python -m itemdb.census
+    python -m itemdb.census --fields BlueprintItemArmorPlating --output census.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from .categories import CATEGORIES, category_paths
+from .extract import default_extractions_dir, get_latest_extraction
+
+# Id, title, icon and nav section for item types without a hand-written
+# category. A None value excludes the type.
+CATEGORY_OVERRIDES = {
+    "BlueprintItem": {"id": "miscellaneous", "title": "Miscellaneous", "icon": "🏺"},
+    "BlueprintItemEquipmentPetProtocol": {"id": "pet-protocols", "title": "Pet Protocols", "icon": "🐾"},
+    "BlueprintItemMechadendrite": {"id": "mechadendrites", "title": "Mechadendrites", "icon": "🦾"},
+    "BlueprintItemKey": {"id": "keys", "title": "Keys", "icon": "🔑"},
+    "BlueprintItemNote": {"id": "notes", "title": "Notes", "icon": "📜"},
+    "BlueprintItemResourceMiner": {"id": "resource-miners", "title": "Resource Miners", "icon": "⛏️"},
+    "BlueprintItemArmorPlating": {"id": "armor-plating", "title": "Armor Plating", "icon": "🧱", "section": "starship"},
+    "BlueprintItemArsenal": {"id": "arsenals", "title": "Arsenals", "icon": "🎯", "section": "starship"},
+    "BlueprintItemLifeSustainer": {"id": "life-sustainers", "title": "Life Sustainers", "icon": "🫁", "section": "starship"},
+}
+
+# Blueprint types that are items even though their name does not say so
+EXTRA_ITEM_TYPES = {"BlueprintStarshipWeapon"}
+
+STARSHIP_ROOT = "Warhammer/SpaceCombat/"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Census blueprint types and fields, and discover item categories")
+    parser.add_argument(
+        "--extraction-dir",
+        type=Path,
+        help="Path to extraction directory. If not specified, uses latest in ../extractions/"
+    )
+    parser.add_argument("--output", type=Path, help="Write the census, discovered categories and coverage as JSON")
+    parser.add_argument(
+        "--fields",
+        action="append",
+        metavar="TYPE",
+        help="Print field coverage for a type (short or full name; repeatable)"
+    )
+    return parser.parse_args(argv)
+
+
+def json_kind(value) -> str:
+    """Name the JSON kind of a decoded value."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def take_census(data_dir: Path) -> dict:
+    """Walk an extraction once and summarize every .jbp file by $type."""
+    types = {}
+    totals = {"files": 0, "bytes": 0, "errors": 0}
+
+    for dirpath, dirnames, filenames in os.walk(data_dir):
+        dirnames.sort()
+        rel_dir = Path(dirpath).relative_to(data_dir).as_posix()
+        for filename in sorted(filenames):
+            if not filename.endswith(".jbp"):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                blueprint = json.loads(raw)
+            except (OSError, ValueError):
+                totals["errors"] += 1
+                continue
+
+            size = len(raw)
+            totals["files"] += 1
+            totals["bytes"] += size
+
+            type_name = blueprint.get("$type", "")
+            entry = types.get(type_name)
+            if entry is None:
+                entry = types[type_name] = {
+                    "count": 0, "bytes": 0, "minBytes": size, "maxBytes": size,
+                    "dirs": Counter(), "fields": Counter(), "kinds": defaultdict(Counter),
+                }
+            entry["count"] += 1
+            entry["bytes"] += size
+            entry["minBytes"] = min(entry["minBytes"], size)
+            entry["maxBytes"] = max(entry["maxBytes"], size)
+            entry["dirs"][rel_dir] += 1
+
+            data = blueprint.get("data")
+            if isinstance(data, dict):
+                for key, value in data.items():
+                    entry["fields"][key] += 1
+                    entry["kinds"][key][json_kind(value)] += 1
+
+    # Plain dicts, most common first, so the census serializes cleanly
+    census_types = {}
+    for type_name, entry in sorted(types.items(), key=lambda x: (-x[1]["count"], x[0])):
+        census_types[type_name] = {
+            "count": entry["count"],
+            "bytes": entry["bytes"],
+            "minBytes": entry["minBytes"],
+            "maxBytes": entry["maxBytes"],
+            "dirs": dict(entry["dirs"].most_common()),
+            "fields": {
+                key: {"present": count, "kinds": dict(entry["kinds"][key].most_common())}
+                for key, count in entry["fields"].most_common()
+            },
+        }
+    return {"extraction": data_dir.name, **totals, "types": census_types}
+
+
+def short_type(type_name: str) -> str:
+    return type_name.split(".")[-1]
+
+
+def is_item_type(type_name: str) -> bool:
+    """Whether a $type is an inventory item (not a list, stash, table or visual)."""
+    name = short_type(type_name)
+    return (name.startswith("BlueprintItem") and not name.startswith("BlueprintItems")) or name in EXTRA_ITEM_TYPES
+
+
+def default_category_id(name: str) -> str:
+    """Derive a category id from a type name, e.g. BlueprintItemFooBar -> foo-bar."""
+    for prefix in ("BlueprintItem", "Blueprint"):
+        if name.startswith(prefix) and len(name) > len(prefix):
+            name = name[len(prefix):]
+            break
+    words = []
+    for char in name:
+        if char.isupper() and words:
+            words.append("-")
+        words.append(char.lower())
+    return "".join(words)
+
+
+def discover_categories(census: dict, base: dict = None, overrides: dict = None) -> dict:
+    """Build a CATEGORIES-style map covering every item type in the census.
+
+    Types whose directory is the path of a category in `base` keep that
+    category; others take their id/title/icon from `overrides` (None
+    excludes a type) or get one derived from the type name. Other
+    directories of a type are added to its category's `paths`, unless
+    another category already loads them (that is reported).
+    """
+    base = base if base is not None else CATEGORIES
+    overrides = overrides if overrides is not None else CATEGORY_OVERRIDES
+    by_path = {config["path"]: cat_id for cat_id, config in base.items() if config.get("path")}
+
+    categories = {cat_id: dict(config) for cat_id, config in base.items() if not config.get("path")}
+    matched = defaultdict(list)
+    discovered = []
+    for type_name, entry in census["types"].items():
+        if not is_item_type(type_name):
+            continue
+        name = short_type(type_name)
+        # Files of one type normally share a directory; the largest one names the category
+        path = next(iter(entry["dirs"]))
+        if path in by_path:
+            matched[by_path[path]].append(type_name)
+            continue
+        override = overrides.get(name, {})
+        if override is None:
+            continue
+        cat_id = override.get("id") or default_category_id(name)
+        title = override.get("title") or cat_id.replace("-", " ").title()
+        section = override.get("section") or ("starship" if path.startswith(STARSHIP_ROOT) else "equipment")
+        discovered.append((cat_id, type_name, {"title": title, "path": path, "icon": override.get("icon", "📦"),
+                                               "section": section}))
+
+    # Hand-written categories first, in their original order, then new ones
+    for cat_id, config in base.items():
+        if cat_id in matched:
+            categories[cat_id] = dict(config)
+    for cat_id, _, config in discovered:
+        if cat_id not in categories:
+            categories[cat_id] = config
+
+    # Directory -> the category it belongs to; a type's other directories go to its category if free
+    owners = {**by_path, **{config["path"]: cat_id for cat_id, config in categories.items() if config.get("path")}}
+    types = [(cat_id, type_name) for cat_id, names in matched.items() for type_name in names]
+    types += [(cat_id, type_name) for cat_id, type_name, _ in discovered if cat_id in categories]
+    for cat_id, type_name in types:
+        for path in list(census["types"][type_name]["dirs"])[1:]:
+            owner = owners.setdefault(path, cat_id)
+            if owner != cat_id:
+                print(f"  Warning: {census['types'][type_name]['dirs'][path]} {short_type(type_name)} files in "
+                      f"{path} belong to {owner}, not {cat_id}")
+                continue
+            config = categories[cat_id]
+            config["paths"] = category_paths(config) + [path]
+    return categories
+
+
+def coverage_report(census: dict, categories: dict) -> dict:
+    """Summarize which item types the category map covers."""
+    covered_paths = {path for config in categories.values() for path in category_paths(config)}
+    report = {"covered": {}, "uncovered": {}, "nonItem": {}}
+    for type_name, entry in census["types"].items():
+        in_category = sum(count for path, count in entry["dirs"].items() if path in covered_paths)
+        if in_category:
+            report["covered"][type_name] = in_category
+        elif is_item_type(type_name):
+            report["uncovered"][type_name] = entry["count"]
+        else:
+            report["nonItem"][type_name] = entry["count"]
+    return report
+
+
+def resolve_type(census: dict, name: str):
+    """Find a census type by full or short name."""
+    if name in census["types"]:
+        return name
+    for type_name in census["types"]:
+        if short_type(type_name) == name:
+            return type_name
+    return None
+
+
+def print_field_coverage(census: dict, type_name: str):
+    entry = census["types"][type_name]
+    print(f"\n{type_name} ({entry['count']:,} files)")
+    for key, field in entry["fields"].items():
+        kinds = ", ".join(f"{kind} {count}" for kind, count in field["kinds"].items())
+        print(f"  {field['present'] / entry['count']:6.1%}  {key:<40} {kinds}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    data_dir = args.extraction_dir or get_latest_extraction(default_extractions_dir())
+
+    print(f"Taking census of {data_dir.name}...")
+    census = take_census(data_dir)
+    print(f"  {census['files']:,} files, {census['bytes'] / 1024 / 1024:.1f} MB, "
+          f"{len(census['types'])} types, {census['errors']} unreadable")
+
+    categories = discover_categories(census)
+    coverage = coverage_report(census, categories)
+    hand_written = coverage_report(census, CATEGORIES)
+
+    width = max(len(type_name) for type_name in census["types"]) if census["types"] else 4
+    print(f"\n{'Type':<{width}} {'Files':>6} {'Avg KB':>7}  Category")
+    path_to_category = {path: cat_id for cat_id, config in categories.items() for path in category_paths(config)}
+    for type_name, entry in census["types"].items():
+        path = next(iter(entry["dirs"]))
+        category = path_to_category.get(path, "-" if type_name in coverage["nonItem"] else "(excluded)")
+        if category != "-" and type_name in hand_written["uncovered"]:
+            category += " (new)"
+        print(f"{type_name:<{width}} {entry['count']:>6} {entry['bytes'] / entry['count'] / 1024:>7.1f}  {category}")
+
+    print(f"\nHand-written categories: {len(CATEGORIES) - 1}, covering {sum(hand_written['covered'].values()):,} files")
+    print(f"Discovered categories:   {len(categories) - 1}, covering {sum(coverage['covered'].values()):,} files")
+    if coverage["uncovered"]:
+        print(f"Still uncovered item types: {', '.join(coverage['uncovered'])}")
+
+    for name in args.fields or []:
+        type_name = resolve_type(census, name)
+        if type_name is None:
+            print(f"\nUnknown type: {name}", file=sys.stderr)
+            continue
+        print_field_coverage(census, type_name)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"census": census, "categories": categories, "coverage": coverage}, f, indent=2, ensure_ascii=False)
+        print(f"\nWrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
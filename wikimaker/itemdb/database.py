@@ -0,0 +1,201 @@
+"""In-process item database with lookup indexes."""
+
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from .categories import CATEGORIES, category_paths
+from .extract import extract_item_data, is_valid_item, load_items_from_path
+from .markup import compile_text
+from .strings import expand_text
+
+
+class ItemDatabase:
+    """Extracted items plus indexes by GUID, category and name.
+
+    Build one with `from_extraction` (parses .jbp files) or `from_json`
+    (reads a previously generated items.json, which is much faster). Both
+    give items with compiled description fields (descriptionHtml,
+    flavorTextHtml, summary) in place of the raw markup.
+    """
+
+    def __init__(self, items: list, categories: dict = None):
+        self.categories = categories if categories is not None else CATEGORIES
+        self.items = []
+        self.by_id = {}
+        self.by_category = defaultdict(list)
+        self.by_name = defaultdict(list)
+        for item in items:
+            self.add(item)
+
+    @classmethod
+    def from_extraction(cls, data_dir: Path, categories: dict = None, verbose: bool = False,
+                        selective: bool = False) -> "ItemDatabase":
+        """Load and extract every category from an extraction directory.
+
+        With `selective`, .jbp files are parsed with a field projection
+        instead of being fully materialized (same result, less work).
+        """
+        categories = categories if categories is not None else CATEGORIES
+        db = cls([], categories)
+
+        for cat_id, cat_config in categories.items():
+            paths = category_paths(cat_config)
+            if not paths:
+                continue
+
+            if verbose:
+                print(f"Loading {cat_id}...")
+            raw_items = [item for path in paths for item in load_items_from_path(data_dir, path, selective)]
+
+            valid = []
+            for item in raw_items:
+                extracted = extract_item_data(item, cat_id)
+                if is_valid_item(item, extracted):
+                    valid.append(extracted)
+            # Same item shape as items.json (see itemdb/markup.py)
+            for item in compile_text(valid):
+                db.add(item)
+            valid_count = len(valid)
+
+            if verbose:
+                print(f"  Found {len(raw_items)} items, {valid_count} valid")
+
+        db.sort()
+        return db
+
+    @classmethod
+    def from_json(cls, json_path: Path) -> "ItemDatabase":
+        """Load a database previously written by `to_dict`."""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            database = json.load(f)
+        if "text" in database:
+            expand_text(database["items"], database["text"])
+        return cls(database["items"], database.get("categories", CATEGORIES))
+
+    def add(self, item: dict):
+        """Add an extracted item and index it."""
+        self.items.append(item)
+        self.by_id[item.get("id", "")] = item
+        self.by_category[item.get("category", "")].append(item)
+        self.by_name[item.get("name", "").lower()].append(item)
+
+    def sort(self):
+        """Sort items (and the category index) by name."""
+        def key(x):
+            return x.get("name", "").lower()
+
+        self.items.sort(key=key)
+        for cat_items in self.by_category.values():
+            cat_items.sort(key=key)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def get(self, guid: str) -> dict:
+        """Look up an item by GUID, or None."""
+        return self.by_id.get(guid)
+
+    def in_category(self, category: str) -> list:
+        """Return the items of a category ("all" returns everything)."""
+        if category == "all":
+            return self.items
+        return self.by_category.get(category, [])
+
+    def find_by_name(self, name: str, exact: bool = False) -> list:
+        """Find items by name, case-insensitively.
+
+        With exact=False any item whose name contains `name` matches.
+        """
+        needle = name.lower()
+        if exact:
+            return list(self.by_name.get(needle, []))
+        return [item for key, items in self.by_name.items() if needle in key for item in items]
+
+    def query(self, category: str = "all", where: list = None, name: str = None,
+              sort: list = None, limit: int = None) -> list:
+        """Filter and sort items.
+
+        `where` is a list of (field, op, value) tuples using the operators in
+        FILTER_OPS. `sort` is a list of field names, each optionally prefixed
+        with "-" for descending order. Items missing a sort field go last.
+        """
+        items = self.in_category(category)
+        if name:
+            ids = {item.get("id") for item in self.find_by_name(name)}
+            items = [item for item in items if item.get("id") in ids]
+
+        for field, op, value in where or []:
+            items = [item for item in items if field in item and _matches(item[field], op, value)]
+
+        items = list(items)
+        for field in reversed(sort or []):
+            descending = field.startswith("-")
+            field = field.lstrip("-")
+            present = [item for item in items if item.get(field) is not None]
+            missing = [item for item in items if item.get(field) is None]
+            present.sort(key=lambda x: _sort_key(x[field]), reverse=descending)
+            items = present + missing
+
+        if limit is not None:
+            items = items[:limit]
+        return items
+
+    def counts(self) -> dict:
+        """Return item counts per category, including "all"."""
+        counts = {"all": len(self.items)}
+        for cat_id in self.categories:
+            if cat_id != "all":
+                counts[cat_id] = len(self.by_category.get(cat_id, []))
+        return counts
+
+    def to_dict(self) -> dict:
+        """Return the items.json database object."""
+        return {
+            "items": self.items,
+            "counts": self.counts(),
+            "categories": {
+                k: {"title": v["title"], "icon": v["icon"], **({"section": v["section"]} if "section" in v else {})}
+                for k, v in self.categories.items()
+            },
+        }
+
+
+def _sort_key(value):
+    """Sort strings case-insensitively and everything else as-is."""
+    if isinstance(value, str):
+        return (1, value.lower())
+    if isinstance(value, (list, dict)):
+        return (2, len(value))
+    return (0, value)
+
+
+def _contains(field_value, value) -> bool:
+    """Substring match for strings, membership for lists."""
+    if isinstance(field_value, list):
+        return any(_contains(v, value) for v in field_value)
+    if isinstance(field_value, dict):
+        return any(_contains(v, value) for v in field_value.values())
+    return str(value).lower() in str(field_value).lower()
+
+
+FILTER_OPS = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    "~": _contains,
+}
+
+
+def _matches(field_value, op: str, value) -> bool:
+    """Apply a filter operator, treating incomparable types as no match."""
+    try:
+        return FILTER_OPS[op](field_value, value)
+    except TypeError:
+        return False
@@ -0,0 +1,241 @@
+"""Loading and field extraction for raw .jbp blueprint files."""
+
+import json
+from pathlib import Path
+
+from .jbp import parse_blueprint
+
+
+def get_latest_extraction(extractions_dir: Path) -> Path:
+    """Find the most recent extraction directory by sorting folder names."""
+    if not extractions_dir.exists():
+        raise FileNotFoundError(f"Extractions directory not found: {extractions_dir}")
+
+    # Get all directories, sort by name (timestamps sort correctly alphabetically)
+    dirs = sorted([d for d in extractions_dir.iterdir() if d.is_dir()], reverse=True)
+
+    if not dirs:
+        raise FileNotFoundError(f"No extraction directories found in: {extractions_dir}")
+
+    return dirs[0]
+
+
+def default_extractions_dir() -> Path:
+    """Return the repository's extractions/ directory."""
+    return (Path(__file__).parent / ".." / ".." / "extractions").resolve()
+
+
+def load_blueprint(jbp_file: Path, selective: bool = False) -> dict:
+    """Load a .jbp file; `selective` keeps only the fields extract_item_data reads."""
+    with open(jbp_file, 'r', encoding='utf-8') as f:
+        if selective:
+            return parse_blueprint(f.read(), data_fields)
+        return json.load(f)
+
+
+def load_items_from_path(data_dir: Path, category_path: str, selective: bool = False) -> list:
+    """Load all items from a category directory."""
+    items = []
+    full_path = data_dir / category_path
+    if not full_path.exists():
+        print(f"  Warning: Path does not exist: {full_path}")
+        return items
+
+    for jbp_file in full_path.glob("*.jbp"):
+        try:
+            items.append(load_blueprint(jbp_file, selective))
+        except Exception as e:
+            print(f"  Error loading {jbp_file}: {e}")
+
+    return items
+
+
+def get_item_name(item: dict) -> str:
+    """Get the display name for an item, trying multiple sources."""
+    data = item.get("data", {})
+
+    # Try data.Name first (capitalized, usually the display name)
+    name = data.get("Name", "")
+    if name:
+        return name
+
+    # Try top-level name
+    name = item.get("name", "")
+    if name:
+        return name
+
+    # Fall back to data.name (internal code name)
+    name = data.get("name", "")
+    if name:
+        # Clean up internal names like "Bolter_VoidCrypt_Cutscene" -> "Bolter VoidCrypt Cutscene"
+        return name.replace("_", " ")
+
+    return ""
+
+
+def is_valid_item(item: dict, extracted: dict) -> bool:
+    """Check if an item should be included (not a template/prototype)."""
+    # Must have a name
+    if not extracted.get("name"):
+        return False
+
+    # For weapons, filter out 0-0 damage items (templates)
+    if extracted.get("category") == "weapons":
+        if extracted.get("damageMin", 0) == 0 and extracted.get("damageMax", 0) == 0:
+            # Exception: some melee weapons might legitimately have 0 base damage
+            if not extracted.get("isMelee"):
+                return False
+
+    return True
+
+
+def clean_extracted_data(extracted: dict) -> dict:
+    """Remove null/placeholder values from extracted data."""
+    cleaned = {}
+    for key, value in extracted.items():
+        # Skip empty strings
+        if value == "":
+            continue
+        # Skip -1 values (used for N/A, e.g., ammo on melee weapons)
+        if value == -1:
+            continue
+        # Skip 0 for optional numeric fields (but keep for some fields like damageMin)
+        if value == 0 and key in ("dodgePenetration", "rateOfFire", "recoil", "shieldStrength", "detectionRadius"):
+            continue
+        # Skip False for boolean fields
+        if value is False and key in ("isRanged", "isMelee"):
+            continue
+        # Skip empty lists
+        if isinstance(value, list) and len(value) == 0:
+            continue
+        cleaned[key] = value
+    return cleaned
+
+
+def item_kind(type_name: str) -> str:
+    """Classify a blueprint $type into the field set extract_item_data reads."""
+    if "Weapon" in type_name and "Starship" not in type_name:
+        return "weapon"
+    if "Armor" in type_name and "Plating" not in type_name:
+        return "armor"
+    if "StarshipWeapon" in type_name:
+        return "starship_weapon"
+    if "VoidShield" in type_name:
+        return "void_shield"
+    if "PlasmaDrives" in type_name:
+        return "plasma_drive"
+    if "AugerArray" in type_name:
+        return "auger_array"
+    return "other"
+
+
+# Keys of item["data"] read by extract_item_data, per item kind.
+# Keep in sync with the branches below; selective parsing drops everything else.
+COMMON_DATA_FIELDS = ("Name", "name", "Rarity", "Description", "FlavorText")
+DATA_FIELDS = {
+    kind: frozenset(COMMON_DATA_FIELDS + fields)
+    for kind, fields in {
+        "weapon": (
+            "WarhammerDamage", "WarhammerMaxDamage", "WarhammerPenetration", "DodgePenetration",
+            "WarhammerMaxDistance", "AttackRange", "WarhammerMaxAmmo", "RateOfFire", "WarhammerRecoil",
+            "Family", "HoldingType", "IsRanged", "IsMelee", "m_DamageType", "WeaponAbilities",
+        ),
+        "armor": ("DamageAbsorption", "DamageDeflection", "Category"),
+        "starship_weapon": ("WeaponType", "DamageInstances", "AllowedSlots"),
+        "void_shield": ("ShieldStrengthBonus",),
+        "plasma_drive": ("Speed", "Maneuverability"),
+        "auger_array": ("DetectionRadiusBonus",),
+        "other": (),
+    }.items()
+}
+
+
+def data_fields(type_name: str) -> frozenset:
+    """Return the `data` keys extract_item_data reads for a blueprint $type."""
+    return DATA_FIELDS[item_kind(type_name)]
+
+
+def extract_item_data(item: dict, category: str) -> dict:
+    """Extract relevant fields from item for the JSON database."""
+    data = item.get("data", {})
+    kind = item_kind(item.get("$type", ""))
+
+    # Common fields
+    extracted = {
+        "id": item.get("guid", ""),
+        "name": get_item_name(item),
+        "category": category,
+        "type": item.get("$type", "").split(".")[-1],
+        "rarity": data.get("Rarity", "Common"),
+        "description": data.get("Description", "") or "",
+        "flavorText": data.get("FlavorText", "") or "",
+    }
+
+    # Weapon-specific fields
+    if kind == "weapon":
+        extracted.update({
+            "damageMin": data.get("WarhammerDamage", 0),
+            "damageMax": data.get("WarhammerMaxDamage", data.get("WarhammerDamage", 0)),
+            "penetration": data.get("WarhammerPenetration", 0),
+            "dodgePenetration": data.get("DodgePenetration", 0),
+            "range": data.get("WarhammerMaxDistance", data.get("AttackRange", 0)),
+            "ammo": data.get("WarhammerMaxAmmo", 0),
+            "rateOfFire": data.get("RateOfFire", 0),
+            "recoil": data.get("WarhammerRecoil", 0),
+            "family": data.get("Family", ""),
+            "holdingType": data.get("HoldingType", ""),
+            "isRanged": data.get("IsRanged", False),
+            "isMelee": data.get("IsMelee", False),
+            "damageType": data.get("m_DamageType", {}).get("Type", "") if isinstance(data.get("m_DamageType"), dict) else "",
+        })
+
+        # Extract weapon abilities
+        abilities = []
+        wa = data.get("WeaponAbilities", {})
+        if isinstance(wa, dict) and "items" in wa:
+            for ab in wa.get("items", []):
+                if isinstance(ab, dict) and not ab.get("IsNone", True):
+                    ab_type = ab.get("Type", "")
+                    ap = ab.get("AP", 0)
+                    if ab_type:
+                        abilities.append({"type": ab_type, "ap": ap})
+        extracted["abilities"] = abilities
+
+    # Armor-specific fields
+    elif kind == "armor":
+        extracted.update({
+            "damageAbsorption": data.get("DamageAbsorption", 0),
+            "damageDeflection": data.get("DamageDeflection", 0),
+            "armorCategory": data.get("Category", ""),
+        })
+
+    # Starship weapon fields
+    elif kind == "starship_weapon":
+        slots = data.get("AllowedSlots", {})
+        slot_list = slots.get("items", []) if isinstance(slots, dict) else []
+        extracted.update({
+            "weaponType": data.get("WeaponType", ""),
+            "damageInstances": data.get("DamageInstances", 1),
+            "allowedSlots": slot_list,
+        })
+
+    # Void shield fields
+    elif kind == "void_shield":
+        extracted.update({
+            "shieldStrength": data.get("ShieldStrengthBonus", 0),
+        })
+
+    # Plasma drive fields
+    elif kind == "plasma_drive":
+        extracted.update({
+            "speed": data.get("Speed", 0),
+            "maneuverability": data.get("Maneuverability", 0),
+        })
+
+    # Auger array fields
+    elif kind == "auger_array":
+        extracted.update({
+            "detectionRadius": data.get("DetectionRadiusBonus", 0),
+        })
+
+    return clean_extracted_data(extracted)
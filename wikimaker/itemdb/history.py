@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""History mode: index every extraction and emit per-item change timelines.
+
+The store is a single JSON file with three tables:
+
+    files     extraction -> {relative path: [size, mtime_ns, record hash, category]}
+    records   record hash -> extracted item (or null if the item is invalid)
+    snapshots extraction -> {guid: record hash}
+
+Records are keyed by a hash of the category and the raw .jbp bytes, so an
+item that did not change between extractions is parsed and stored once. The
+`files` table lets a re-run skip reading files that were already indexed in
+the same category. The store also keeps
+a fingerprint of the extraction code (extract.py, jbp.py); when that changes
+every extraction is re-parsed, so old and new snapshots are never compared
+across extractor versions.
+
+Usage (run from wikimaker/):
+    python -m itemdb.history --output-dir website
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from . import extract, jbp
+from .categories import CATEGORIES, category_paths
+from .extract import data_fields, default_extractions_dir, extract_item_data, is_valid_item
+from .jbp import parse_blueprint
+
+STORE_VERSION = 2
+
+# Long text fields are reported as changed without their old/new values
+TEXT_FIELDS = ("description", "flavorText")
+
+# Pseudo-fields used for items appearing in or disappearing from a snapshot
+ADDED = "$added"
+REMOVED = "$removed"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Index all extractions and emit per-item change timelines")
+    parser.add_argument(
+        "--extractions-dir",
+        type=Path,
+        default=default_extractions_dir(),
+        help="Directory containing one folder per extraction (default: ../extractions)"
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=Path(".history") / "store.json",
+        help="Path of the history store (default: .history/store.json)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("website"),
+        help="Output directory for history.json (default: website)"
+    )
+    parser.add_argument(
+        "--selective",
+        action="store_true",
+        help="Parse .jbp files with a field projection instead of loading them fully"
+    )
+    return parser.parse_args(argv)
+
+
+def extractor_fingerprint() -> str:
+    """Hash the modules that turn a .jbp file into a record."""
+    h = hashlib.blake2b(digest_size=10)
+    for module in (extract, jbp):
+        h.update(Path(module.__file__).read_bytes())
+    return h.hexdigest()
+
+
+def category_files(data_dir: Path, categories: dict):
+    """Yield (category, .jbp file) for every file in the categories' directories."""
+    for cat_id, cat_config in categories.items():
+        for path in category_paths(cat_config):
+            if (data_dir / path).exists():
+                yield from ((cat_id, jbp_file) for jbp_file in (data_dir / path).glob("*.jbp"))
+
+
+def record_hash(category: str, raw: bytes) -> str:
+    """Hash a raw blueprint file together with the category it was loaded as."""
+    h = hashlib.blake2b(digest_size=10)
+    h.update(category.encode("utf-8"))
+    h.update(b"\0")
+    h.update(raw)
+    return h.hexdigest()
+
+
+class HistoryStore:
+    """Content-addressed store of extracted items across extractions."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.files = {}
+        self.records = {}
+        self.snapshots = {}
+        self.extractor = extractor_fingerprint()
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != STORE_VERSION:
+                print(f"History store {path} has an old format, re-indexing")
+            elif data.get("extractor") != self.extractor:
+                print("Extraction code changed since the history store was written, re-indexing")
+            else:
+                self.files = data["files"]
+                self.records = data["records"]
+                self.snapshots = data["snapshots"]
+
+    def save(self):
+        """Write the store atomically, dropping records no snapshot references."""
+        referenced = {h for snapshot in self.snapshots.values() for h in snapshot.values()}
+        referenced.update(entry[2] for files in self.files.values() for entry in files.values())
+        self.records = {h: r for h, r in self.records.items() if h in referenced}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": STORE_VERSION,
+                "extractor": self.extractor,
+                "files": self.files,
+                "records": self.records,
+                "snapshots": self.snapshots,
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def index_extraction(self, data_dir: Path, categories: dict = None, selective: bool = False) -> dict:
+        """Index one extraction directory and return parse statistics."""
+        categories = categories if categories is not None else CATEGORIES
+        name = data_dir.name
+        old_files = self.files.get(name, {})
+        files = {}
+        snapshot = {}
+        stats = {"files": 0, "parsed": 0, "reused": 0}
+
+        for cat_id, jbp_file in category_files(data_dir, categories):
+            rel = jbp_file.relative_to(data_dir).as_posix()
+            st = jbp_file.stat()
+            stats["files"] += 1
+
+            cached = old_files.get(rel)
+            # The record depends on the category too, e.g. with --discover-categories toggled
+            if (cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns and cached[3] == cat_id
+                    and cached[2] in self.records):
+                h = cached[2]
+                stats["reused"] += 1
+            else:
+                raw = jbp_file.read_bytes()
+                h = record_hash(cat_id, raw)
+                if h in self.records:
+                    stats["reused"] += 1
+                else:
+                    self.records[h] = self._extract(raw, cat_id, jbp_file, selective)
+                    stats["parsed"] += 1
+
+            files[rel] = [st.st_size, st.st_mtime_ns, h, cat_id]
+            record = self.records[h]
+            if record is not None:
+                snapshot[record["id"]] = h
+
+        self.files[name] = files
+        self.snapshots[name] = snapshot
+        return stats
+
+    @staticmethod
+    def _extract(raw: bytes, category: str, jbp_file: Path, selective: bool = False):
+        """Parse and extract a blueprint, or None if it is not a valid item."""
+        try:
+            item = parse_blueprint(raw.decode("utf-8"), data_fields) if selective else json.loads(raw)
+        except Exception as e:
+            print(f"  Error loading {jbp_file}: {e}")
+            return None
+        extracted = extract_item_data(item, category)
+        return extracted if is_valid_item(item, extracted) else None
+
+    def prune(self, names: list):
+        """Forget extractions that are not in `names`."""
+        for table in (self.files, self.snapshots):
+            for name in list(table):
+                if name not in names:
+                    del table[name]
+
+    def timelines(self, names: list) -> dict:
+        """Compute per-item change timelines across the given snapshots (oldest first).
+
+        Returns {guid: [[snapshot index, field, old, new], ...]} for items that
+        changed at least once. Unchanged items are omitted.
+        """
+        timelines = {}
+        previous = {}
+        for idx, name in enumerate(names):
+            snapshot = self.snapshots.get(name, {})
+            for guid, h in snapshot.items():
+                old_h = previous.get(guid)
+                if old_h == h:
+                    continue
+                if old_h is None:
+                    if idx > 0:
+                        timelines.setdefault(guid, []).append([idx, ADDED, None, None])
+                    continue
+                changes = diff_records(self.records[old_h], self.records[h])
+                if changes:
+                    timelines.setdefault(guid, []).extend([idx, *change] for change in changes)
+            for guid in previous.keys() - snapshot.keys():
+                timelines.setdefault(guid, []).append([idx, REMOVED, None, None])
+            previous = snapshot
+        return timelines
+
+
+def diff_records(old: dict, new: dict) -> list:
+    """Return [field, old, new] triples for fields that differ."""
+    changes = []
+    for field in sorted(old.keys() | new.keys()):
+        if field in ("id", "category"):
+            continue
+        a, b = old.get(field), new.get(field)
+        if a == b:
+            continue
+        if field in TEXT_FIELDS:
+            changes.append([field, None, None])
+        else:
+            changes.append([field, a, b])
+    return changes
+
+
+def list_extractions(extractions_dir: Path) -> list:
+    """Return all extraction directories, oldest first."""
+    if not extractions_dir.exists():
+        raise FileNotFoundError(f"Extractions directory not found: {extractions_dir}")
+    return sorted(d for d in extractions_dir.iterdir() if d.is_dir())
+
+
+def build_history(extractions_dir: Path, store_path: Path, output_dir: Path, selective: bool = False,
+                  categories: dict = None) -> dict:
+    """Index every extraction, update the store and write history.json.
+
+    `categories` is the build's category map (CATEGORIES by default).
+    """
+    dirs = list_extractions(extractions_dir)
+    names = [d.name for d in dirs]
+
+    store = HistoryStore(store_path)
+    store.prune(names)
+    for data_dir in dirs:
+        stats = store.index_extraction(data_dir, categories, selective)
+        print(f"  {data_dir.name}: {stats['files']} files, {stats['parsed']} parsed, {stats['reused']} reused")
+    store.save()
+
+    history = {
+        "snapshots": names,
+        "timelines": store.timelines(names),
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "history.json", 'w', encoding='utf-8') as f:
+        json.dump(history, f, separators=(',', ':'))
+    return history
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"Indexing extractions in {args.extractions_dir}...")
+    try:
+        history = build_history(args.extractions_dir, args.store, args.output_dir, args.selective)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"\nSnapshots: {len(history['snapshots'])}")
+    print(f"Items with changes: {len(history['timelines']):,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Build-time metadata for item icons.
+
+Each <guid>.png icon is read once and summarized as
+
+    {"width": 128, "height": 128, "color": "#6b5a3f"}
+
+`attach_icons` stores that on every item as `icon`, or None when the item
+has no icon, so the SPA can reserve the icon's box, skip requests for icons
+that do not exist and show the dominant colour while the real one
+lazy-loads. Dimensions come from the PNG header; the colour needs Pillow
+(pip install Pillow) and is left out without it.
+"""
+
+import struct
+from pathlib import Path
+
+from .stages import files_in
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Icons are downscaled to at most this many pixels a side before picking a colour
+SAMPLE_SIZE = 32
+
+# Pixels at least this opaque count toward the dominant colour
+MIN_ALPHA = 128
+
+
+def read_png_size(path: Path) -> tuple:
+    """Return (width, height) from a PNG's IHDR chunk."""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) < 24 or not header.startswith(PNG_SIGNATURE) or header[12:16] != b"IHDR":
+        raise ValueError(f"{path} is not a PNG file")
+    return struct.unpack(">II", header[16:24])
+
+
+def dominant_color(image):
+    """Return the most common colour of an image's opaque pixels as #rrggbb, or None."""
+    sample = image.convert("RGBA")
+    sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+    data = sample.tobytes()
+
+    # Group similar colours (3 bits per channel) and average the largest group
+    buckets = {}
+    for i in range(0, len(data), 4):
+        r, g, b, a = data[i], data[i + 1], data[i + 2], data[i + 3]
+        if a < MIN_ALPHA:
+            continue
+        total = buckets.setdefault((r >> 5, g >> 5, b >> 5), [0, 0, 0, 0])
+        total[0] += r
+        total[1] += g
+        total[2] += b
+        total[3] += 1
+    if not buckets:
+        return None
+    r, g, b, count = max(buckets.values(), key=lambda total: total[3])
+    return f"#{r // count:02x}{g // count:02x}{b // count:02x}"
+
+
+def icon_metadata(path: Path, pil_image=None) -> dict:
+    """Summarize one icon; `pil_image` is PIL.Image, or None to skip the colour."""
+    width, height = read_png_size(path)
+    meta = {"width": width, "height": height}
+    if pil_image is not None:
+        with pil_image.open(path) as image:
+            color = dominant_color(image)
+        if color is not None:
+            meta["color"] = color
+    return meta
+
+
+def icon_index(images_dir: Path) -> dict:
+    """Return {guid: metadata} for every <guid>.png icon in a directory."""
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+        print("Pillow not available (pip install Pillow for icon placeholder colours)")
+
+    icons = {}
+    for path in files_in(images_dir, "*.png"):
+        try:
+            icons[path.stem] = icon_metadata(path, Image)
+        except (OSError, ValueError) as e:
+            print(f"  Skipping icon {path.name}: {e}")
+    print(f"Icons: {len(icons):,} read from {images_dir}")
+    return icons
+
+
+def attach_icons(items: list, icons: dict) -> list:
+    """Set each item's `icon` to its metadata, or None if it has no icon."""
+    missing = 0
+    for item in items:
+        item["icon"] = icons.get(item["id"])
+        missing += item["icon"] is None
+    print(f"Icons: {len(items) - missing:,} items with icons, {missing:,} without")
+    return items
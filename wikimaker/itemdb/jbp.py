@@ -0,0 +1,171 @@
+"""Selective parsing of .jbp blueprint files.
+
+A blueprint's `data` object carries large component, element and reference
+trees that extract_item_data never reads. `parse_blueprint` decodes only the
+top-level header keys and the `data` keys a projection selects for the
+blueprint's $type (see extract.data_fields); no Python objects are built for
+anything else.
+
+Extracted .jbp files are pretty-printed, and JSON strings cannot contain raw
+newlines, so a key's indentation gives its depth: each projected key is
+found with a plain substring search for `\n<indent>"Key": ` inside the
+`data` object and only its value is decoded. Minified files fall back to a
+scanner that skips unwanted values by matching brackets and whole strings.
+
+The result has the same shape as json.load() output restricted to those
+keys, so it can be passed straight to extract_item_data.
+"""
+
+import json
+import re
+from functools import lru_cache
+from json.decoder import scanstring
+
+# Top-level keys kept besides the projected `data` object
+HEADER_FIELDS = frozenset({"$type", "guid", "name"})
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# A complete string, or a single bracket; everything between is skipped
+SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+SCALAR = re.compile(r"[^,}\]\s]+")
+# An object whose first key starts an indented line; captures the indent
+# and the key/value separator, which the formatter uses throughout
+INDENTED_OBJECT = re.compile(r'\s*\{\r?\n([ \t]+)"(?:[^"\\]|\\.)*"([ \t]*:[ \t]*)')
+
+_decoder = json.JSONDecoder()
+_scan_once = _decoder.scan_once
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    return WHITESPACE.match(text, pos).end()
+
+
+def _skip_value(text: str, pos: int) -> int:
+    """Return the index just past the JSON value starting at pos."""
+    char = text[pos]
+    if char == '"':
+        return STRING.match(text, pos).end()
+    if char not in "[{":
+        return SCALAR.match(text, pos).end()
+    depth = 0
+    for match in SKIP_TOKEN.finditer(text, pos):
+        token = match.group()
+        if token in "[{":
+            depth += 1
+        elif token in "]}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError(f"Unterminated container at {pos}")
+
+
+def _scan_object(text: str, pos: int, wanted, on_key=None):
+    """Decode the wanted keys of the object at pos; return (values, end).
+
+    `wanted` is a set of keys (or None for all keys). `on_key(key, pos)` may
+    claim a key by returning the index just past its value.
+    """
+    if text[pos] != "{":
+        raise ValueError(f"Expected object at {pos}")
+    values = {}
+    pos = _skip_ws(text, pos + 1)
+    if text[pos] == "}":
+        return values, pos + 1
+
+    while True:
+        if text[pos] != '"':
+            raise ValueError(f"Expected key at {pos}")
+        key, pos = scanstring(text, pos + 1)
+        pos = _skip_ws(text, pos)
+        if text[pos] != ":":
+            raise ValueError(f"Expected ':' at {pos}")
+        pos = _skip_ws(text, pos + 1)
+
+        end = on_key(key, pos) if on_key else None
+        if end is None:
+            if wanted is None or key in wanted:
+                values[key], end = _decoder.raw_decode(text, pos)
+            else:
+                end = _skip_value(text, pos)
+
+        pos = _skip_ws(text, end)
+        if text[pos] == "}":
+            return values, pos + 1
+        if text[pos] != ",":
+            raise ValueError(f"Expected ',' or '}}' at {pos}")
+        pos = _skip_ws(text, pos + 1)
+
+
+@lru_cache(maxsize=None)
+def _key_needles(indent: str, separator: str, keys: frozenset) -> tuple:
+    """Return (key, '\\n<indent>"key"<separator>') pairs to search for."""
+    return tuple((key, f"\n{indent}{json.dumps(key)}{separator}") for key in sorted(keys))
+
+
+def _decode_indented(text: str, start: int, end: int, keys: frozenset):
+    """Decode the given keys of the indented object at start, or return None."""
+    layout = INDENTED_OBJECT.match(text, start)
+    if layout is None:
+        return None
+    values = {}
+    for key, needle in _key_needles(layout.group(1), layout.group(2), keys):
+        pos = text.find(needle, start, end)
+        if pos != -1:
+            values[key] = _scan_once(text, pos + len(needle))[0]
+    return values
+
+
+def _parse_indented(text: str, data_fields):
+    """Fast path for pretty-printed files; None if the layout does not fit."""
+    layout = INDENTED_OBJECT.match(text)
+    if layout is None:
+        return None
+    result = _decode_indented(text, 0, len(text), HEADER_FIELDS)
+
+    data_key = f"\n{layout.group(1)}\"data\"{layout.group(2)}"
+    data_pos = text.find(data_key)
+    if data_pos != -1:
+        data_pos += len(data_key)
+        # The data object closes with a brace at the indentation of its key
+        data_end = text.find(f"\n{layout.group(1)}}}", data_pos)
+        if data_end == -1:
+            data_end = len(text)
+        fields = data_fields(result.get("$type", ""))
+        data = _decode_indented(text, data_pos, data_end, fields)
+        if data is None:
+            data, _ = _scan_object(text, data_pos, fields)
+        result["data"] = data
+    return result
+
+
+def parse_blueprint(text: str, data_fields) -> dict:
+    """Parse a .jbp document, keeping the header and the projected `data` keys.
+
+    `data_fields($type)` returns the set of `data` keys to decode.
+    """
+    result = _parse_indented(text, data_fields)
+    if result is not None:
+        return result
+
+    data_pos = []
+    result = {}
+
+    def on_key(key, pos):
+        if key == "data":
+            if "$type" in result:
+                result["data"], end = _scan_object(text, pos, data_fields(result["$type"]))
+                return end
+            # $type comes later in this file; project once it is known
+            data_pos.append(pos)
+            return _skip_value(text, pos)
+        if key in HEADER_FIELDS:
+            result[key], end = _decoder.raw_decode(text, pos)
+            return end
+        return _skip_value(text, pos)
+
+    _scan_object(text, _skip_ws(text, 0), None, on_key)
+    if data_pos:
+        result["data"], _ = _scan_object(text, data_pos[0], data_fields(result.get("$type", "")))
+    return result
+
@@ -0,0 +1,104 @@
+"""Build-time compiler for the game's description markup.
+
+Descriptions use `{g|Encyclopedia:...}text{/g}` links, `{unit_stat|...}`
+placeholders and Unity rich-text tags (`<b>`, `<indent=...>`, ...). These are
+compiled once per distinct string into:
+
+- `descriptionHtml` / `flavorTextHtml`: sanitized HTML for the detail view
+- `summary`: plain text for card previews and search
+
+The rules mirror the SPA's former `formatDescription` / `cleanDescription`.
+"""
+
+import html
+import re
+from functools import lru_cache
+
+# Raw field -> compiled HTML field
+HTML_FIELDS = {
+    "description": "descriptionHtml",
+    "flavorText": "flavorTextHtml",
+}
+
+# Raw field compiled to plain text
+SUMMARY_SOURCE = "description"
+SUMMARY_FIELD = "summary"
+
+# Fields produced by compile_text, in the order they are added
+COMPILED_FIELDS = (*HTML_FIELDS.values(), SUMMARY_FIELD)
+
+GLOSSARY_LINK = re.compile(r"\{g\|[^}]+\}([^{]*)\{/g\}")
+UNIT_STAT = re.compile(r"\{unit_stat\|(\w+)\|(\w+)\}")
+ORPHAN_GLOSSARY_END = re.compile(r"\{/g\}")
+ANY_BRACE_TAG = re.compile(r"\{[^}]+\}")
+ESCAPED_INDENT_OPEN = re.compile(r"&lt;indent=[^&]*&gt;", re.IGNORECASE)
+ESCAPED_INDENT_CLOSE = re.compile(r"&lt;/indent&gt;", re.IGNORECASE)
+LIST_MARKER = re.compile(r"\s*-\s+")
+ANY_ANGLE_TAG = re.compile(r"<[^>]+>")
+WHITESPACE = re.compile(r"\s+")
+
+# Escaped rich-text tags that are turned back into real HTML
+SAFE_TAGS = [
+    (re.compile(r"&lt;b&gt;", re.IGNORECASE), "<strong>"),
+    (re.compile(r"&lt;/b&gt;", re.IGNORECASE), "</strong>"),
+    (re.compile(r"&lt;i&gt;", re.IGNORECASE), "<em>"),
+    (re.compile(r"&lt;/i&gt;", re.IGNORECASE), "</em>"),
+    (re.compile(r"&lt;u&gt;", re.IGNORECASE), "<u>"),
+    (re.compile(r"&lt;/u&gt;", re.IGNORECASE), "</u>"),
+]
+
+
+@lru_cache(maxsize=None)
+def format_description(text: str) -> str:
+    """Compile game markup to safe HTML for the detail view."""
+    if not text:
+        return ""
+
+    # Escape everything first for safety
+    result = html.escape(text, quote=False)
+
+    # Game-specific curly brace markup
+    result = GLOSSARY_LINK.sub(r"\1", result)
+    result = UNIT_STAT.sub(r"[\1 \2]", result)
+    result = ORPHAN_GLOSSARY_END.sub("", result)
+    result = ANY_BRACE_TAG.sub("", result)
+
+    # Convert safe rich-text tags back to HTML
+    for pattern, replacement in SAFE_TAGS:
+        result = pattern.sub(replacement, result)
+
+    # Indent tags are dropped, list markers become bullets
+    result = ESCAPED_INDENT_OPEN.sub("", result)
+    result = ESCAPED_INDENT_CLOSE.sub("", result)
+    result = LIST_MARKER.sub(" • ", result)
+
+    result = result.replace("\n", "<br>")
+    return result.strip()
+
+
+@lru_cache(maxsize=None)
+def clean_description(text: str) -> str:
+    """Compile game markup to plain text for card previews and search."""
+    if not text:
+        return ""
+    result = ANY_ANGLE_TAG.sub("", text)
+    result = GLOSSARY_LINK.sub(r"\1", result)
+    result = ANY_BRACE_TAG.sub("", result)
+    result = WHITESPACE.sub(" ", result)
+    return result.strip()
+
+
+def compile_text(items: list) -> list:
+    """Return copies of items with raw markup fields replaced by compiled forms."""
+    compiled = []
+    for item in items:
+        item = dict(item)
+        summary = clean_description(item.get(SUMMARY_SOURCE, ""))
+        for raw_field, html_field in HTML_FIELDS.items():
+            raw = item.pop(raw_field, "")
+            if raw:
+                item[html_field] = format_description(raw)
+        if summary:
+            item[SUMMARY_FIELD] = summary
+        compiled.append(item)
+    return compiled
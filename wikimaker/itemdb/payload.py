@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Payload size attribution for items.json, with budgets and build-to-build diffs.
+
+Breaks the minified items.json down by top-level section, item field,
+category and item:
+
+- raw bytes are exact: the bytes each part occupies in the minified file
+- compressed bytes are deflate level 9 (gzip without its 18-byte header).
+  For sections and fields they are what removing that part would save. For
+  items they are measured in context with one sync-flushed deflate pass
+  over the file, and categories sum their items.
+
+Budgets are a JSON file of byte limits and allowed growth, e.g.:
+
+    {
+      "total": {"raw": 1200000, "gzip": 220000, "brotli": 170000},
+      "sections": {"text": {"gzip": 90000}},
+      "categories": {"weapons": {"gzip": 60000}},
+      "fields": {"descriptionHtml": {"gzip": 45000}},
+      "growth": {"total": {"gzip": 0.05}, "categories": {"gzip": 0.25}}
+    }
+
+Growth limits are fractions of the baseline (a previous items.json or a saved
+report) and are only checked when one is given.
+
+Usage (run from wikimaker/):
+    python -m itemdb.payload website/items.json
+    git show HEAD~1:wikimaker/website/items.json > /tmp/previous.json
+    python -m itemdb.payload website/items.json --baseline /tmp/previous.json --budgets payload-budgets.json
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import zlib
+from pathlib import Path
+
+REPORT_KIND = "payload-report"
+REPORT_VERSION = 1
+
+# Budget/report metrics, and the report tables budgets can address
+METRICS = ("raw", "gzip", "brotli")
+TABLES = ("sections", "categories", "fields")
+SINGULAR = {"sections": "section", "categories": "category", "fields": "field"}
+
+
+class BudgetError(ValueError):
+    """Raised for a malformed budgets file."""
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Attribute items.json size to sections, fields, categories and items")
+    parser.add_argument("items_json", type=Path, help="Generated items.json")
+    parser.add_argument("--baseline", type=Path, help="Previous items.json or saved report to compare against")
+    parser.add_argument("--budgets", type=Path, help="JSON file of size budgets; exit 1 if any is exceeded")
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    parser.add_argument("--top", type=int, default=10, help="Rows to print per table (default: 10)")
+    return parser.parse_args(argv)
+
+
+def encode(value) -> bytes:
+    """Encode exactly as build.encode_database does (minified)."""
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def deflate_size(data: bytes) -> int:
+    return len(zlib.compress(data, 9))
+
+
+def _member_size(key: str, value) -> int:
+    """Bytes of `"key":value` plus its separating comma."""
+    return len(encode(key)) + 1 + len(encode(value)) + 1
+
+
+def item_compressed_sizes(database: dict) -> list:
+    """Estimate each item's compressed bytes in the context of the whole file.
+
+    Items are fed to one deflate stream with a sync flush after each, so every
+    item is compressed against everything before it. Flush markers add a few
+    bytes apiece, so the counts are scaled to the real compressed size.
+    """
+    items = database["items"]
+    rest = {key: value for key, value in database.items() if key != "items"}
+    compressor = zlib.compressobj(9)
+    flushed = len(compressor.compress(b'{"items":['))
+    sizes = []
+    for index, item in enumerate(items):
+        chunk = encode(item) + (b"," if index < len(items) - 1 else b"")
+        produced = len(compressor.compress(chunk)) + len(compressor.flush(zlib.Z_SYNC_FLUSH))
+        sizes.append(produced)
+    tail = b"]" + (b"," + encode(rest)[1:] if rest else b"}")
+    flushed += sum(sizes) + len(compressor.compress(tail)) + len(compressor.flush())
+
+    scale = deflate_size(encode(database)) / flushed if flushed else 1.0
+    return [round(size * scale) for size in sizes]
+
+
+def build_report(items_json: Path, compressed_files: bool = True) -> dict:
+    """Attribute the size of an items.json to its sections, fields, categories and items."""
+    raw_bytes = items_json.read_bytes()
+    database = json.loads(raw_bytes)
+    encoded = encode(database)
+    full = deflate_size(encoded)
+
+    totals = {"raw": len(raw_bytes), "gzip": len(gzip.compress(raw_bytes, compresslevel=9, mtime=0))}
+    brotli_path = items_json.with_name(items_json.name + ".br")
+    if compressed_files and brotli_path.exists():
+        totals["brotli"] = brotli_path.stat().st_size
+
+    sections = {}
+    for key, value in database.items():
+        without = {k: v for k, v in database.items() if k != key}
+        sections[key] = {"raw": _member_size(key, value), "gzip": full - deflate_size(encode(without))}
+
+    items = database.get("items", [])
+    fields = {}
+    for item in items:
+        for key, value in item.items():
+            entry = fields.setdefault(key, {"raw": 0, "gzip": 0, "items": 0})
+            entry["raw"] += _member_size(key, value)
+            entry["items"] += 1
+    for key in fields:
+        without = dict(database, items=[{k: v for k, v in item.items() if k != key} for item in items])
+        fields[key]["gzip"] = full - deflate_size(encode(without))
+
+    item_sizes = {}
+    categories = {}
+    for item, compressed in zip(items, item_compressed_sizes(database) if items else []):
+        category = item.get("category", "")
+        raw = len(encode(item)) + 1
+        item_sizes[item.get("id", "")] = {"raw": raw, "gzip": compressed, "category": category, "name": item.get("name", "")}
+        entry = categories.setdefault(category, {"raw": 0, "gzip": 0, "items": 0})
+        entry["raw"] += raw
+        entry["gzip"] += compressed
+        entry["items"] += 1
+
+    return {
+        "kind": REPORT_KIND,
+        "version": REPORT_VERSION,
+        "source": items_json.name,
+        "totals": totals,
+        "sections": sections,
+        "categories": dict(sorted(categories.items(), key=lambda x: -x[1]["raw"])),
+        "fields": dict(sorted(fields.items(), key=lambda x: -x[1]["raw"])),
+        "items": item_sizes,
+    }
+
+
+def load_baseline(path: Path) -> dict:
+    """Load a saved report, or build one from a previous items.json."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and data.get("kind") == REPORT_KIND:
+        return data
+    return build_report(path, compressed_files=False)
+
+
+def load_budgets(path: Path) -> dict:
+    """Load and validate a budgets file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        budgets = json.load(f)
+    scopes = {"total", *TABLES}
+    unknown = set(budgets) - scopes - {"growth"}
+    unknown |= {f"growth.{scope}" for scope in set(budgets.get("growth", {})) - scopes}
+    if unknown:
+        raise BudgetError(f"{path}: unknown budget sections {sorted(unknown)} (expected {sorted(scopes | {'growth'})})")
+
+    limit_sets = [("total", budgets.get("total", {}))]
+    limit_sets += [(f"growth.{scope}", limits) for scope, limits in budgets.get("growth", {}).items()]
+    limit_sets += [(f"{table}.{name}", limits) for table in TABLES for name, limits in budgets.get(table, {}).items()]
+    for label, limits in limit_sets:
+        bad = set(limits) - set(METRICS)
+        if bad:
+            raise BudgetError(f"{path}: unknown metrics {sorted(bad)} in {label} (expected {list(METRICS)})")
+    return budgets
+
+
+def diff_reports(report: dict, baseline: dict) -> dict:
+    """Per-table byte deltas against a baseline report."""
+    diff = {"totals": {m: report["totals"][m] - baseline["totals"][m]
+                       for m in METRICS if m in report["totals"] and m in baseline["totals"]}}
+    for table in TABLES:
+        rows = {}
+        for name in set(report[table]) | set(baseline[table]):
+            now = report[table].get(name, {})
+            before = baseline[table].get(name, {})
+            rows[name] = {m: now.get(m, 0) - before.get(m, 0) for m in ("raw", "gzip")}
+        diff[table] = rows
+    added = set(report["items"]) - set(baseline["items"])
+    removed = set(baseline["items"]) - set(report["items"])
+    diff["itemsAdded"] = len(added)
+    diff["itemsRemoved"] = len(removed)
+    return diff
+
+
+def check_budgets(report: dict, budgets: dict, baseline: dict = None) -> list:
+    """Return a message for every budget the report exceeds."""
+    violations = []
+
+    def check(label, sizes, limits):
+        for metric, limit in limits.items():
+            if metric in sizes and sizes[metric] > limit:
+                violations.append(f"{label} {metric}: {sizes[metric]:,} bytes exceeds budget of {limit:,} "
+                                  f"by {sizes[metric] - limit:,}")
+
+    check("total", report["totals"], budgets.get("total", {}))
+    for table in TABLES:
+        for name, limits in budgets.get(table, {}).items():
+            if name in report[table]:
+                check(f"{SINGULAR[table]} {name!r}", report[table][name], limits)
+
+    if baseline is not None:
+        growth = budgets.get("growth", {})
+
+        def check_growth(label, now, before, limits):
+            for metric, allowed in limits.items():
+                if metric in now and before.get(metric):
+                    change = now[metric] / before[metric] - 1
+                    if change > allowed:
+                        violations.append(f"{label} {metric}: grew {change:.1%} ({before[metric]:,} -> {now[metric]:,} "
+                                          f"bytes), more than the allowed {allowed:.1%}")
+
+        check_growth("total", report["totals"], baseline["totals"], growth.get("total", {}))
+        for table in TABLES:
+            for name in report[table]:
+                if name in baseline[table]:
+                    check_growth(f"{SINGULAR[table]} {name!r}", report[table][name], baseline[table][name],
+                                 growth.get(table, {}))
+    return violations
+
+
+def _delta(value: int) -> str:
+    return f"{value:+,}" if value else "0"
+
+
+def print_report(report: dict, diff: dict = None, top: int = 10):
+    """Print totals and the largest sections, fields, categories and items."""
+    totals = report["totals"]
+    print("\nPayload (gzip column: deflate-9 bytes; removal savings for sections/fields, in context for items)")
+    line = "  Total: " + ", ".join(f"{metric} {totals[metric]:,}" for metric in METRICS if metric in totals)
+    if diff:
+        line += "  (" + ", ".join(f"{m} {_delta(d)}" for m, d in diff["totals"].items()) + " vs baseline)"
+    print(line)
+
+    def table(title, rows, extra=None):
+        print(f"\n  {title:<36} {'Raw':>10} {'Gzip':>8}" + ("   Raw Δ  Gzip Δ" if diff and extra else ""))
+        for name, row in list(rows.items())[:top]:
+            text = f"  {name[:36]:<36} {row['raw']:>10,} {row['gzip']:>8,}"
+            if diff and extra and name in extra:
+                text += f" {_delta(extra[name]['raw']):>8} {_delta(extra[name]['gzip']):>7}"
+            print(text)
+
+    table("Section", report["sections"], diff and diff["sections"])
+    table("Field", report["fields"], diff and diff["fields"])
+    table("Category", report["categories"], diff and diff["categories"])
+    largest = dict(sorted(report["items"].items(), key=lambda x: -x[1]["raw"])[:top])
+    table("Item", {f"{row['name']} ({row['category']})": row for row in largest.values()})
+
+    if diff:
+        print(f"\n  Items: {diff['itemsAdded']:,} added, {diff['itemsRemoved']:,} removed since baseline")
+        for table_name in ("fields", "categories"):
+            movers = sorted(diff[table_name].items(), key=lambda x: -abs(x[1]["gzip"]))[:5]
+            movers = [f"{name} {_delta(row['gzip'])}" for name, row in movers if row["gzip"]]
+            if movers:
+                print(f"  Biggest gzip changes by {SINGULAR[table_name]}: {', '.join(movers)}")
+
+
+def payload_report(items_json: Path, report_path: Path = None, budgets_path: Path = None,
+                   baseline_path: Path = None, top: int = 10) -> dict:
+    """Build, print and save a report; its "violations" list any exceeded budgets.
+
+    Without `baseline_path`, a report previously saved at `report_path` is the baseline.
+    """
+    budgets = load_budgets(budgets_path) if budgets_path else {}
+    baseline = None
+    if baseline_path:
+        baseline = load_baseline(baseline_path)
+    elif report_path and report_path.exists():
+        baseline = load_baseline(report_path)
+
+    report = build_report(items_json)
+    diff = diff_reports(report, baseline) if baseline else None
+    print_report(report, diff, top)
+
+    report["violations"] = check_budgets(report, budgets, baseline)
+    if report_path:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+    return report
+
+
+def load_report(path: Path) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_violations(violations: list):
+    print("\nPayload budget exceeded:", file=sys.stderr)
+    for message in violations:
+        print(f"  - {message}", file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.items_json.exists():
+        print(f"Error: {args.items_json} not found", file=sys.stderr)
+        return 1
+    try:
+        report = payload_report(args.items_json, args.output, args.budgets, args.baseline, args.top)
+    except (BudgetError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if report["violations"]:
+        print_violations(report["violations"])
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
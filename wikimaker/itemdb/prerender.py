@@ -0,0 +1,389 @@
+"""Static shells for item and category links.
+
+The SPA (website/index.html) shows nothing until the whole database has
+loaded. `write_shells` renders a small page for every item
+(items/<guid>.html) and category (<category>.html, the URLs the v1 generator
+used) holding only that route's title, header, navigation and content, so
+it paints at once from a few KB of HTML. The shells take their <head> (and
+so the css/ links) from index.html and load the same js/app.js. A short
+inline script moves the address to the SPA route (#/item/<guid>,
+#/<category>); app.js then fetches index.html once for the search, sort and
+filter controls, moves the prerendered markup into it and re-renders the
+route once the database is in.
+
+The markup mirrors renderNavigation, renderItemCard and renderItemDetailPage
+in website/js/app.js; keep them in step. Rankings, references and history
+are left to the SPA.
+"""
+
+import html
+import json
+import re
+from pathlib import Path
+
+from .build import write_file
+from .strings import expand_text
+
+TEMPLATE = Path(__file__).parent.parent / "website" / "index.html"
+
+ITEMS_DIR = "items"
+
+# Cards shown on a category shell before the SPA's grid takes over
+CARD_LIMIT = 24
+
+# Sidebar order (renderNavigation); other categories go by their section
+EQUIPMENT_CATEGORIES = ("all", "weapons", "armor", "shields", "helmets", "gloves", "boots", "cloaks",
+                        "rings", "amulets", "usables")
+STARSHIP_CATEGORIES = ("starship-weapons", "void-shields", "plasma-drives", "auger-arrays")
+
+CATEGORY_LABELS = {
+    "helmets": "Helmet",
+    "gloves": "Gloves",
+    "boots": "Boots",
+    "cloaks": "Cloak",
+    "rings": "Ring",
+    "amulets": "Amulet",
+    "shields": "Shield",
+    "usables": "Consumable",
+}
+
+RARITY_CLASSES = {
+    "Common": "common",
+    "Uncommon": "uncommon",
+    "Rare": "rare",
+    "VeryRare": "veryrare",
+    "Unique": "unique",
+}
+
+# Moves a shell's address to its SPA route; links and reloads then behave as on index.html
+BOOT_SCRIPT = """<script>
+        (function () {
+            var route = %s;
+            try {
+                history.replaceState(null, '', new URL(route, location.href));
+            } catch (e) {
+                location.hash = route.slice(route.indexOf('#'));
+            }
+        })();
+    </script>"""
+
+
+# The parts of index.html's body a route needs before app.js swaps in the full page
+SHELL = """<!DOCTYPE html>
+<html lang="en">
+<head>{head}</head>
+<body data-prerendered="{kind}">
+    {boot}
+    <div class="container">
+        <nav class="sidebar" id="sidebar">
+            <div class="sidebar-header">
+                <h1>RT Database</h1>
+                <div class="subtitle">Warhammer 40K: Rogue Trader</div>
+                <div class="db-size" id="db-size"></div>
+            </div>
+            <div id="nav-categories">{navigation}</div>
+        </nav>
+
+        <main class="main-content">
+            <div class="page-header">
+                <h1 id="page-title">{heading}</h1>
+                <p class="description" id="page-description">{subheading}</p>
+            </div>
+
+            <div id="content">{content}
+            </div>
+        </main>
+    </div>
+
+    <script src="js/app.js"></script>
+</body>
+</html>
+"""
+
+
+def escape(text) -> str:
+    """HTML escape text."""
+    if text is None:
+        return ""
+    return html.escape(_js(text))
+
+
+def _js(value) -> str:
+    """Format a value the way the SPA's template strings do."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def get_rarity_class(rarity: str) -> str:
+    """Get CSS class for rarity."""
+    return RARITY_CLASSES.get(rarity, "common")
+
+
+def render_icon(item: dict) -> str:
+    """Icon markup (renderIcon)."""
+    fallback = "onerror=\"this.style.display='none';this.parentElement.innerHTML='[IMG]';\""
+    if "icon" not in item:
+        return f'<img src="images/{item["id"]}.png" alt="" {fallback}>'
+    icon = item["icon"]
+    if not icon:
+        return "[IMG]"
+    color = icon.get("color")
+    placeholder = f' style="background-color: {color}" onload="this.style.backgroundColor=\'\'"' if color else ""
+    return (f'<img src="images/{item["id"]}.png" alt="" width="{icon["width"]}" height="{icon["height"]}" '
+            f'loading="lazy" decoding="async"{placeholder} {fallback}>')
+
+
+def render_navigation(database: dict, active: str = None) -> str:
+    """Sidebar category links (renderNavigation)."""
+    categories, counts = database["categories"], database.get("counts", {})
+    sections = {"Browse": list(EQUIPMENT_CATEGORIES), "Starship": list(STARSHIP_CATEGORIES)}
+    known = set(EQUIPMENT_CATEGORIES + STARSHIP_CATEGORIES)
+    for cat_id, cat in categories.items():
+        if cat_id not in known:
+            sections["Starship" if cat.get("section") == "starship" else "Browse"].append(cat_id)
+
+    parts = []
+    for title, cat_ids in sections.items():
+        parts.append(f'<div class="nav-section"><div class="nav-section-title">{title}</div>')
+        for cat_id in cat_ids:
+            if cat_id not in categories:
+                continue
+            css = "nav-item active" if cat_id == active else "nav-item"
+            parts.append(f'<a href="#/{cat_id}" class="{css}" data-category="{cat_id}">'
+                         f'{escape(categories[cat_id]["title"])} '
+                         f'<span class="count">{counts.get(cat_id, 0):,}</span></a>')
+        parts.append('</div>')
+    return "".join(parts)
+
+
+def _stat_row(label: str, value, css: str = "") -> str:
+    css = f"stat-value {css}".strip()
+    return (f'<div class="stat-row"><span class="stat-label">{label}</span>'
+            f'<span class="{css}">{escape(value)}</span></div>')
+
+
+def render_item_card(item: dict) -> str:
+    """Grid card for an item (renderItemCard)."""
+    rarity_class = get_rarity_class(item.get("rarity"))
+    category = item.get("category")
+    type_label = CATEGORY_LABELS.get(category) or (
+        item.get("type", "").replace("Blueprint", "", 1).replace("Item", "", 1).replace("Equipment", "", 1))
+    stats = []
+
+    if category == "weapons":
+        attack_type = "Ranged" if item.get("isRanged") else "Melee" if item.get("isMelee") else ""
+        type_label = " • ".join(filter(None, (attack_type, item.get("family")))) or type_label
+        stats += [_stat_row("Damage", f'{_js(item.get("damageMin"))}-{_js(item.get("damageMax"))}', "damage"),
+                  _stat_row("Penetration", f'{_js(item.get("penetration"))}%', "penetration"),
+                  _stat_row("Range", item.get("range"), "range")]
+    elif category == "armor":
+        type_label = f'{item["armorCategory"]} Armor' if item.get("armorCategory") else "Armor"
+        stats += [_stat_row("Absorption", f'{_js(item.get("damageAbsorption"))}%'),
+                  _stat_row("Deflection", item.get("damageDeflection"))]
+    elif category == "starship-weapons":
+        type_label = item.get("weaponType") or "Starship Weapon"
+        slots = ", ".join(item["allowedSlots"]) if isinstance(item.get("allowedSlots"), list) else ""
+        stats += [_stat_row("Shots", item.get("damageInstances")), _stat_row("Slot", slots or "Any")]
+    elif category == "void-shields":
+        type_label = "Void Shield Generator"
+        stats.append(_stat_row("Shield Bonus", item.get("shieldStrength") or 0))
+    elif category == "plasma-drives":
+        type_label = "Plasma Drive"
+        stats += [_stat_row("Speed", item.get("speed") or 0), _stat_row("Maneuver", item.get("maneuverability") or 0)]
+    elif category == "auger-arrays":
+        type_label = "Auger Array"
+        stats.append(_stat_row("Detection", item.get("detectionRadius") or 0))
+    stats.append(_stat_row("Rarity", item.get("rarity"), f"rarity-{rarity_class}"))
+
+    summary = item.get("summary")
+    return f"""
+        <div class="item-card" onclick="showItemDetail('{item["id"]}')">
+            <div class="item-card-header">
+                <div class="item-icon rarity-border-{rarity_class}">{render_icon(item)}</div>
+                <div class="item-title-area">
+                    <div class="item-name rarity-{rarity_class}">{escape(item.get("name"))}</div>
+                    <div class="item-type">{escape(type_label)}</div>
+                </div>
+            </div>
+            <div class="item-card-body">
+                <div class="item-stats">{"".join(stats)}</div>
+                {f'<div class="item-description">{escape(summary)}</div>' if summary else ''}
+            </div>
+        </div>"""
+
+
+def _stat_box(label: str, value) -> str:
+    return f'<div class="stat-box"><div class="label">{label}</div><div class="value">{escape(value)}</div></div>'
+
+
+def _detail_stats(item: dict) -> list:
+    """Statistics boxes of the detail page."""
+    category = item.get("category")
+    get = item.get
+    if category == "weapons":
+        boxes = [_stat_box("Damage", f'{_js(get("damageMin"))} - {_js(get("damageMax"))}'),
+                 _stat_box("Armour Penetration", f'{_js(get("penetration"))}%')]
+        if get("dodgePenetration"):
+            boxes.append(_stat_box("Dodge Penalty", f'-{_js(get("dodgePenetration"))}'))
+        if get("rateOfFire") is not None:
+            recoil = f' (Recoil {_js(get("recoil"))})' if get("recoil") else ""
+            boxes.append(_stat_box("Rate of Fire", f'{_js(get("rateOfFire"))}{recoil}'))
+        boxes.append(_stat_box("Range", get("range")))
+        if get("ammo") is not None:
+            boxes.append(_stat_box("Max Ammo", get("ammo")))
+        for label, field in (("Family", "family"), ("Holding", "holdingType"), ("Damage Type", "damageType")):
+            if get(field):
+                boxes.append(_stat_box(label, get(field)))
+        return boxes
+    if category == "armor":
+        return [_stat_box("Damage Absorption", f'{_js(get("damageAbsorption"))}%'),
+                _stat_box("Damage Deflection", get("damageDeflection")),
+                _stat_box("Category", get("armorCategory") or "Unknown")]
+    if category == "starship-weapons":
+        slots = ", ".join(item["allowedSlots"]) if isinstance(get("allowedSlots"), list) else "Any"
+        return [_stat_box("Weapon Type", get("weaponType") or "Unknown"),
+                _stat_box("Damage Instances", get("damageInstances")),
+                _stat_box("Allowed Slots", slots)]
+    if category == "void-shields":
+        return [_stat_box("Shield Strength Bonus", get("shieldStrength") or 0)]
+    if category == "plasma-drives":
+        return [_stat_box("Speed", get("speed") or 0), _stat_box("Maneuverability", get("maneuverability") or 0)]
+    if category == "auger-arrays":
+        return [_stat_box("Detection Radius Bonus", get("detectionRadius") or 0)]
+    return []
+
+
+def render_item_detail(item: dict, cat_title: str) -> str:
+    """Detail page content for an item (renderItemDetailPage)."""
+    rarity_class = get_rarity_class(item.get("rarity"))
+    stats = _detail_stats(item)
+    sections = []
+    if stats:
+        sections.append(f'<div class="detail-section"><h2>Statistics</h2><div class="stats-grid">{"".join(stats)}</div></div>')
+    if item.get("abilities"):
+        tags = "".join(f'<span class="ability-tag">{escape(ability.get("type"))}'
+                       f'<span class="ap">{escape(ability.get("ap"))} AP</span></span>'
+                       for ability in item["abilities"])
+        sections.append(f'<div class="detail-section"><h2>Weapon Abilities</h2><div class="abilities-list">{tags}</div></div>')
+    # Compiled HTML from the build (itemdb/markup.py)
+    sections.append(f'<div class="detail-section"><h2>Description</h2>'
+                    f'<p class="description-text">{item.get("descriptionHtml") or "No description available."}</p></div>')
+    if item.get("flavorTextHtml"):
+        sections.append(f'<div class="detail-section"><h2>Flavor Text</h2><p class="flavor-text">{item["flavorTextHtml"]}</p></div>')
+    sections_html = "\n\n            ".join(sections)
+
+    return f"""
+        <div class="item-detail-page">
+            <a href="#/{item.get("category")}" class="back-link">&larr; Back to {escape(cat_title)}</a>
+
+            <div class="detail-header">
+                <div class="detail-icon rarity-border-{rarity_class}">{render_icon(item)}</div>
+                <div class="detail-title">
+                    <h1 class="rarity-{rarity_class}">{escape(item.get("name"))}</h1>
+                    <div class="detail-meta">
+                        <span class="rarity-{rarity_class}">{escape(item.get("rarity"))}</span>
+                        <span>{escape(cat_title)}</span>
+                    </div>
+                </div>
+            </div>
+
+            {sections_html}
+
+            <div id="item-references"></div>
+
+            <div id="item-history"></div>
+
+            <div class="detail-section">
+                <h2>Technical Info</h2>
+                <p class="tech-info">GUID: <code>{item["id"]}</code></p>
+            </div>
+        </div>"""
+
+
+def _replace(page: str, pattern: str, replacement: str) -> str:
+    """Replace the one match of a template marker; fail loudly if the template changed."""
+    page, count = re.subn(pattern, lambda match: replacement, page, count=1, flags=re.S)
+    if count != 1:
+        raise ValueError(f"{TEMPLATE.name} has no match for {pattern!r}")
+    return page
+
+
+def page_head(template: str) -> str:
+    """The SPA page's <head> contents, with the title left as a {title} slot."""
+    match = re.search(r"<head>(.*?)</head>", template, flags=re.S)
+    if match is None:
+        raise ValueError(f"{TEMPLATE.name} has no <head>")
+    return _replace(match.group(1).replace("{", "{{").replace("}", "}}"), r"<title>.*?</title>", "{title}")
+
+
+def render_shell(head: str, route: str, title: str, description: str, heading: str,
+                 subheading: str, navigation: str, content: str, kind: str, base: str = None) -> str:
+    """A page with one route's prerendered markup and the ids app.js fills in."""
+    title_tags = (f"<title>{escape(title)} - RT Database</title>\n"
+                  f'    <meta name="description" content="{escape(description)}">'
+                  + (f'\n    <base href="{base}">' if base else ""))
+    return SHELL.format(
+        head=head.format(title=title_tags), kind=kind,
+        boot=BOOT_SCRIPT % json.dumps(route).replace("</", "<\\/"),
+        heading=escape(heading), subheading=escape(subheading), navigation=navigation, content=content,
+    )
+
+
+def write_shells(output_dir: Path, template_path: Path = TEMPLATE) -> dict:
+    """Write a static shell for every item and category in output_dir's items.json."""
+    with open(output_dir / "items.json", 'r', encoding='utf-8') as f:
+        database = json.load(f)
+    if database.get("text"):
+        expand_text(database["items"], database["text"])
+    head = page_head(template_path.read_text(encoding='utf-8'))
+    categories = database["categories"]
+    items_dir = output_dir / ITEMS_DIR
+    items_dir.mkdir(parents=True, exist_ok=True)
+
+    navigation = render_navigation(database)
+    written = set()
+    size = 0
+    for item in database["items"]:
+        cat_title = categories.get(item.get("category"), {}).get("title", "Item")
+        page = render_shell(
+            head, f"../#/item/{item['id']}", item.get("name") or item["id"],
+            item.get("summary") or f"{cat_title} - {item.get('rarity')}", item.get("name") or "",
+            f"{cat_title} - {item.get('rarity')}", navigation, render_item_detail(item, cat_title),
+            "item", base="../",
+        ).encode('utf-8')
+        write_file(items_dir / f"{item['id']}.html", page)
+        written.add(f"{item['id']}.html")
+        size += len(page)
+
+    # Shells of items that are gone would show stale data
+    removed = 0
+    for path in items_dir.glob("*.html"):
+        if path.name not in written:
+            path.unlink()
+            removed += 1
+
+    by_name = sorted(database["items"], key=lambda item: (item.get("name") or "").lower())
+    category_shells = 0
+    for cat_id, cat in categories.items():
+        # index.html is the shell for #/all
+        if cat_id == "all":
+            continue
+        items = [item for item in by_name if item.get("category") == cat_id]
+        title = cat["title"]
+        cards = "".join(render_item_card(item) for item in items[:CARD_LIMIT])
+        page = render_shell(
+            head, f"./#/{cat_id}", title, f"{len(items):,} items in {title.lower()}", title,
+            f"{len(items):,} items in {title.lower()}", render_navigation(database, cat_id),
+            f'<div class="item-grid">{cards}</div>', "category",
+        ).encode('utf-8')
+        write_file(output_dir / f"{cat_id}.html", page)
+        category_shells += 1
+        size += len(page)
+
+    counts = {"items": len(written), "categories": category_shells, "removed": removed, "bytes": size}
+    print(f"Shells: {counts['items']:,} item and {counts['categories']:,} category pages "
+          f"({size/1024/1024:.2f} MB), {removed:,} stale removed")
+    return counts
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Query CLI over the item database.
+
+Examples (run from wikimaker/):
+    python -m itemdb.query --category weapons --where "penetration>=20" --sort=-damageMax --limit 10
+    python -m itemdb.query --name bolter --fields name,damageMin,damageMax,family
+    python -m itemdb.query --id 50630c218e7744cd9233e3fa58b04b82 --json
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from .database import ItemDatabase
+from .extract import default_extractions_dir, get_latest_extraction
+
+WHERE_PATTERN = re.compile(r"^\s*(\w+)\s*(!=|>=|<=|=|>|<|~)\s*(.*?)\s*$")
+
+DEFAULT_FIELDS = ["id", "name", "category", "rarity"]
+
+
+def parse_value(text: str):
+    """Parse a filter value as bool, int or float, falling back to a string."""
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_where(expr: str) -> tuple:
+    """Parse "field<op>value" into a (field, op, value) tuple."""
+    match = WHERE_PATTERN.match(expr)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid filter (expected FIELD<op>VALUE): {expr!r}")
+    field, op, value = match.groups()
+    return field, op, parse_value(value)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Filtered and sorted lookups over the item database")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--db",
+        type=Path,
+        help="Path to a generated items.json (default: website/items.json if present)"
+    )
+    source.add_argument(
+        "--extraction-dir",
+        type=Path,
+        help="Load from an extraction directory instead of items.json"
+    )
+    parser.add_argument("--id", help="Look up a single item by GUID")
+    parser.add_argument("--category", default="all", help="Category ID (default: all)")
+    parser.add_argument("--name", help="Case-insensitive substring match on the item name")
+    parser.add_argument(
+        "--where",
+        type=parse_where,
+        action="append",
+        default=[],
+        help='Filter such as "penetration>=20", "family=Bolt" or "summary~burning" (repeatable)'
+    )
+    parser.add_argument(
+        "--sort",
+        action="append",
+        default=[],
+        help="Sort field, prefix with - for descending, e.g. --sort=-damageMax (repeatable, first is primary)"
+    )
+    parser.add_argument("--limit", type=int, help="Maximum number of results")
+    parser.add_argument(
+        "--fields",
+        help=f"Comma-separated fields to print (default: {','.join(DEFAULT_FIELDS)})"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matches")
+    return parser.parse_args(argv)
+
+
+def load_database(args) -> ItemDatabase:
+    """Load the database from the source selected on the command line."""
+    if args.extraction_dir:
+        return ItemDatabase.from_extraction(args.extraction_dir)
+
+    db_path = args.db or Path("website") / "items.json"
+    if db_path.exists():
+        return ItemDatabase.from_json(db_path)
+    if args.db:
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    return ItemDatabase.from_extraction(get_latest_extraction(default_extractions_dir()))
+
+
+def format_table(items: list, fields: list) -> str:
+    """Format items as a plain-text table."""
+    rows = [fields] + [[_format_cell(item.get(field)) for field in fields] for item in items]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(fields))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def _format_cell(value) -> str:
+    """Format a single table cell."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(_format_cell(v) if not isinstance(v, dict) else v.get("type", "") for v in value)
+    return str(value).replace("\n", " ")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    try:
+        db = load_database(args)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.id:
+        item = db.get(args.id)
+        items = [item] if item else []
+    else:
+        if args.category != "all" and args.category not in db.categories:
+            print(f"Error: Unknown category: {args.category}", file=sys.stderr)
+            return 1
+        items = db.query(args.category, where=args.where, name=args.name, sort=args.sort, limit=args.limit)
+
+    if args.count:
+        print(len(items))
+        return 0
+
+    fields = args.fields.split(",") if args.fields else None
+    if args.json:
+        if fields:
+            items = [{field: item[field] for field in fields if field in item} for item in items]
+        print(json.dumps(items, indent=2, ensure_ascii=False))
+    else:
+        print(format_table(items, fields or DEFAULT_FIELDS))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
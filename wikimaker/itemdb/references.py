@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Blueprint reference index: which blueprints point at which.
+
+Blueprints refer to each other with `{"$type": "...Reference", "guid": ...}`
+objects (weapon enchantments, armor types, default ammo, shield weapon
+components, ...). `build_reference_index` walks every .jbp file of an
+extraction, not only the ones in CATEGORIES, and records each non-empty
+reference as an edge labelled with the field it sits in.
+
+references.json stores the graph as compressed sparse rows, so the
+references from or to a node are one slice:
+
+    guids        node guid; the first `blueprints` nodes are blueprints in
+                 the extraction, the rest only appear as reference targets.
+                 Blueprints without references either way are left out.
+    names/types  name and type index (into typeNames) of each blueprint
+    fields       edge labels
+    forward      {"offsets", "targets", "fields"}: references from node i are
+                 targets[offsets[i]:offsets[i + 1]]
+    reverse      {"offsets", "sources", "fields"}: the same, for references to i
+
+Usage (run from wikimaker/):
+    python -m itemdb.references --output-dir website
+    python -m itemdb.references --guid 57818d38b6924b6ba972af645664ecbb
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from .build import write_file
+from .extract import default_extractions_dir, get_latest_extraction
+
+REFERENCES_FILE = "references.json"
+
+# Keys holding a reference's target guid
+GUID_KEYS = ("guid", "Guid")
+
+# Wrapper keys whose references are labelled with the enclosing field instead
+CONTAINER_KEYS = frozenset({"items"})
+
+# A blueprint's own id object, not a reference
+SELF_KEY = "$id"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Index blueprint-to-blueprint references")
+    parser.add_argument(
+        "--extraction-dir",
+        type=Path,
+        help="Path to extraction directory. If not specified, uses latest in ../extractions/"
+    )
+    parser.add_argument("--output-dir", type=Path, help="Write references.json to this directory")
+    parser.add_argument("--guid", action="append", help="Print the references from and to a blueprint (repeatable)")
+    return parser.parse_args(argv)
+
+
+def blueprint_references(data) -> list:
+    """Return (field, target guid) for every non-empty reference in blueprint data."""
+    refs = []
+
+    def walk(value, field):
+        if isinstance(value, dict):
+            guid = next((value[key] for key in GUID_KEYS if value.get(key)), None)
+            if isinstance(guid, str) and field != SELF_KEY:
+                refs.append((field, guid))
+            for key, child in value.items():
+                if key not in GUID_KEYS:
+                    walk(child, field if key in CONTAINER_KEYS else key)
+        elif isinstance(value, list):
+            for child in value:
+                walk(child, field)
+
+    walk(data, "")
+    return refs
+
+
+def _csr(count: int, edges: list) -> tuple:
+    """Group (node, other, field) edges by node; return (offsets, others, fields)."""
+    offsets = [0] * (count + 1)
+    for node, _, _ in edges:
+        offsets[node + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+    others = [0] * len(edges)
+    fields = [0] * len(edges)
+    position = offsets[:-1]
+    for node, other, field in edges:
+        others[position[node]] = other
+        fields[position[node]] = field
+        position[node] += 1
+    return offsets, others, fields
+
+
+def build_reference_index(data_dir: Path) -> dict:
+    """Walk an extraction once and build the forward and reverse reference tables."""
+    blueprints = {}
+    errors = 0
+    for dirpath, dirnames, filenames in os.walk(data_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if not filename.endswith(".jbp"):
+                continue
+            try:
+                with open(os.path.join(dirpath, filename), 'r', encoding='utf-8') as f:
+                    blueprint = json.load(f)
+            except (OSError, ValueError):
+                errors += 1
+                continue
+            guid = blueprint.get("guid")
+            if guid:
+                blueprints[guid] = (blueprint.get("name") or "", blueprint.get("$type", "").rsplit(".", 1)[-1],
+                                    blueprint_references(blueprint.get("data")))
+
+    referenced = {guid for *_, refs in blueprints.values() for _, guid in refs}
+    guids = sorted(guid for guid, (*_, refs) in blueprints.items() if refs or guid in referenced)
+    targets = sorted(referenced - set(blueprints))
+    node = {guid: i for i, guid in enumerate(guids + targets)}
+    type_names = sorted({type_name for _, type_name, _ in blueprints.values()})
+    type_index = {type_name: i for i, type_name in enumerate(type_names)}
+    field_names = sorted({field for *_, refs in blueprints.values() for field, _ in refs})
+    field_index = {field: i for i, field in enumerate(field_names)}
+
+    edges = set()
+    for guid in guids:
+        _, _, refs = blueprints[guid]
+        for field, target in refs:
+            if target != guid:
+                edges.add((node[guid], node[target], field_index[field]))
+    edges = sorted(edges)
+
+    count = len(node)
+    forward = _csr(count, edges)
+    reverse = _csr(count, sorted((target, source, field) for source, target, field in edges))
+    return {
+        "blueprints": len(guids),
+        "scanned": len(blueprints),
+        "errors": errors,
+        "guids": guids + targets,
+        "names": [blueprints[guid][0] for guid in guids],
+        "types": [type_index[blueprints[guid][1]] for guid in guids],
+        "typeNames": type_names,
+        "fields": field_names,
+        "forward": dict(zip(("offsets", "targets", "fields"), forward)),
+        "reverse": dict(zip(("offsets", "sources", "fields"), reverse)),
+    }
+
+
+def write_references(data_dir: Path, output_dir: Path) -> dict:
+    """Write references.json for an extraction; return its counts."""
+    index = build_reference_index(data_dir)
+    data = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    write_file(output_dir / REFERENCES_FILE, data)
+    counts = {
+        "scanned": index["scanned"],
+        "blueprints": index["blueprints"],
+        "targets": len(index["guids"]) - index["blueprints"],
+        "references": len(index["forward"]["targets"]),
+    }
+    print(f"References: {counts['references']:,} between {counts['blueprints']:,} of {counts['scanned']:,} blueprints "
+          f"and {counts['targets']:,} outside targets ({len(data)/1024:.2f} KB)")
+    return counts
+
+
+def lookup(index: dict, guid: str) -> tuple:
+    """Return ([(field, guid), ...] referenced by a guid, [(field, guid), ...] referring to it)."""
+    try:
+        i = index["guids"].index(guid)
+    except ValueError:
+        return [], []
+    result = []
+    for table, key in ((index["forward"], "targets"), (index["reverse"], "sources")):
+        start, end = table["offsets"][i], table["offsets"][i + 1]
+        result.append([(index["fields"][table["fields"][j]], index["guids"][table[key][j]])
+                       for j in range(start, end)])
+    return tuple(result)
+
+
+def describe(index: dict, guid: str) -> str:
+    i = index["guids"].index(guid)
+    if i >= index["blueprints"]:
+        return f"{guid} (not in extraction)"
+    return f"{guid} {index['names'][i]} [{index['typeNames'][index['types'][i]]}]"
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    data_dir = args.extraction_dir or get_latest_extraction(default_extractions_dir())
+
+    if args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        write_references(data_dir, args.output_dir)
+        with open(args.output_dir / REFERENCES_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    else:
+        index = build_reference_index(data_dir)
+        print(f"References: {len(index['forward']['targets']):,} between {index['blueprints']:,} of "
+              f"{index['scanned']:,} blueprints and {len(index['guids']) - index['blueprints']:,} outside targets")
+
+    for guid in args.guid or []:
+        if guid not in index["guids"]:
+            print(f"\nUnknown guid: {guid}", file=sys.stderr)
+            continue
+        forward, reverse = lookup(index, guid)
+        print(f"\n{describe(index, guid)}")
+        for label, refs, arrow in (("References", forward, "->"), ("Referenced by", reverse, "<-")):
+            print(f"  {label}: {len(refs)}")
+            for field, other in refs:
+                print(f"    {arrow} {field}: {describe(index, other)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
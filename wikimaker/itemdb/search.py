@@ -0,0 +1,75 @@
+"""Build-time search index for the SPA's search worker.
+
+search-index.json holds only what search, filtering and sorting read, as
+one column per field in items.json order:
+
+    {"items": N, "fields": [...], "columns": {"id": [...], "name": {...}, ...}}
+
+website/js/search-worker.js loads it and answers queries with row numbers
+into the database's item list, so the page never runs Fuse.js or re-sorts
+the full list on the main thread. Ids are listed as-is and flags as 0/1.
+Every other column is dictionary-encoded, since summaries, types and
+rarities repeat across items: {"values": [distinct strings], "codes":
+[value index per item]}. String table references are resolved here.
+"""
+
+import json
+from pathlib import Path
+
+from .build import write_file
+from .strings import resolve_text
+
+SEARCH_INDEX_FILE = "search-index.json"
+
+# Searched by Fuse.js (summary is the plain-text description)
+TEXT_FIELDS = ("name", "summary", "family", "type")
+
+# Read by the category, rarity, weapon and armor filters
+FILTER_FIELDS = ("category", "rarity", "isMelee", "isRanged", "armorCategory")
+
+SEARCH_FIELDS = ("id", *TEXT_FIELDS, *FILTER_FIELDS)
+FLAG_FIELDS = ("isMelee", "isRanged")
+
+
+def _value(item: dict, field: str, table: dict):
+    value = item.get(field)
+    if field in FLAG_FIELDS:
+        return 1 if value else 0
+    if value is None:
+        return ""
+    if not isinstance(value, str) and field in table.get("fields", ()):
+        return resolve_text(value, table)
+    return value
+
+
+def _dictionary_encode(values: list) -> dict:
+    codes = {}
+    for value in values:
+        codes.setdefault(value, len(codes))
+    return {"values": list(codes), "codes": [codes[value] for value in values]}
+
+
+def build_search_index(database: dict) -> dict:
+    """Project the database's items onto the searched and filtered fields."""
+    items = database["items"]
+    table = database.get("text", {})
+    columns = {}
+    for field in SEARCH_FIELDS:
+        values = [_value(item, field, table) for item in items]
+        columns[field] = values if field == "id" or field in FLAG_FIELDS else _dictionary_encode(values)
+    return {"items": len(items), "fields": list(SEARCH_FIELDS), "columns": columns}
+
+
+def write_search_index(database: dict, output_dir: Path) -> int:
+    """Write search-index.json for a database object; return its size."""
+    data = json.dumps(build_search_index(database), separators=(',', ':')).encode('utf-8')
+    write_file(output_dir / SEARCH_INDEX_FILE, data)
+    print(f"Search index:      {len(data):,} bytes ({len(data)/1024:.2f} KB)")
+    return len(data)
+
+
+def write_search_index_from_json(output_dir: Path) -> int:
+    """Write search-index.json for the items.json already in output_dir."""
+    with open(output_dir / "items.json", 'r', encoding='utf-8') as f:
+        database = json.load(f)
+    return write_search_index(database, output_dir)
@@ -0,0 +1,376 @@
+"""Local preview server with compression negotiation and hot rebuild.
+
+Serves the output directory the way a real static host would:
+
+- precompressed `.br` / `.gz` siblings are sent with `Content-Encoding` when
+  the browser accepts them
+- `ETag` / `If-None-Match` and single `Range` requests are supported
+- a polling watcher reruns the generator's stage pipeline when extraction
+  files, item icons, the page template or generator sources change, and
+  pushes a reload event to open pages over Server-Sent Events (`/__events`)
+
+Rebuilds use the options of the build that started the server and its
+state file, so only stages whose inputs changed do work: a changed .jbp file
+re-extracts its category, a changed index.html rewrites the static shells.
+A change to the generator sources reloads the itemdb modules first, still
+without restarting the server.
+"""
+
+import importlib
+import mimetypes
+import os
+import sys
+import threading
+import time
+import traceback
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from . import build, categories, prerender, stages
+from .stages import files_in
+
+EVENTS_PATH = "/__events"
+
+RELOAD_SCRIPT = (
+    b'<script>new EventSource("' + EVENTS_PATH.encode() + b'")'
+    b'.addEventListener("reload", () => location.reload());</script>'
+)
+
+# Encodings we have precompressed siblings for, in order of preference
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+# Generated outputs; changes to these never trigger a reload on their own
+GENERATED_SUFFIXES = (".json", ".gz", ".br", ".tmp")
+
+# Watched page assets in the output directory
+STATIC_SUFFIXES = (".html", ".css", ".js")
+
+# Output subdirectories the watcher skips: item shells and copied icons
+GENERATED_DIRS = (prerender.ITEMS_DIR, "images")
+
+# itemdb modules in dependency order, reloaded when generator sources change
+RELOAD_MODULES = [
+    "itemdb.categories",
+    "itemdb.jbp",
+    "itemdb.extract",
+    "itemdb.strings",
+    "itemdb.markup",
+    "itemdb.analytics",
+    "itemdb.database",
+    "itemdb.history",
+    "itemdb.stages",
+    "itemdb.images",
+    "itemdb.build",
+    "itemdb.search",
+    "itemdb.references",
+    "itemdb.prerender",
+    "itemdb.payload",
+    "itemdb.census",
+    "itemdb.shards",
+    "itemdb",
+]
+
+SOURCE_DIR = Path(__file__).parent
+
+
+class SiteBuilder:
+    """Reruns `build.site_pipeline` with fixed options; up-to-date stages are skipped."""
+
+    def __init__(self, options: dict):
+        # Keyword arguments of build.site_pipeline
+        self.options = options
+        self.data_dir = options["data_dir"]
+        self.output_dir = options["output_dir"]
+
+    def categories(self) -> dict:
+        category_map = self.options.get("categories")
+        return category_map if category_map is not None else categories.CATEGORIES
+
+    def category_files(self) -> list:
+        """Return (category, path) for every blueprint file of every category."""
+        files = []
+        for cat_id, cat_config in self.categories().items():
+            for path in categories.category_paths(cat_config):
+                if (self.data_dir / path).exists():
+                    files.extend((cat_id, f) for f in (self.data_dir / path).glob("*.jbp"))
+        return files
+
+    def input_files(self) -> list:
+        """Files whose changes call for a rebuild, apart from generator sources."""
+        files = [f for _, f in self.category_files()]
+        images_dir = self.options.get("images_dir")
+        if images_dir is not None:
+            files.extend(files_in(images_dir, "*.png"))
+        files.append(prerender.TEMPLATE)
+        return files
+
+    def rebuild(self, reload_sources: bool = False):
+        """Run the pipeline; optionally reload generator modules first."""
+        if reload_sources:
+            for name in RELOAD_MODULES:
+                if name in sys.modules:
+                    importlib.reload(sys.modules[name])
+        # Looked up on the modules so a reload takes effect
+        pipeline = build.site_pipeline(**self.options)
+        pipeline.run()
+        stages.print_report(pipeline.report)
+
+
+class ReloadBroadcaster:
+    """Tracks a build generation counter that SSE clients wait on."""
+
+    def __init__(self):
+        self.generation = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation: int, timeout: float) -> int:
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+def snapshot(paths) -> dict:
+    """Return {path: (size, mtime_ns)} for the given files."""
+    result = {}
+    for path in paths:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        result[path] = (st.st_size, st.st_mtime_ns)
+    return result
+
+
+class Watcher(threading.Thread):
+    """Polls sources, build inputs and static assets for changes."""
+
+    def __init__(self, builder: SiteBuilder, broadcaster: ReloadBroadcaster, interval: float = 1.0):
+        super().__init__(daemon=True)
+        self.builder = builder
+        self.broadcaster = broadcaster
+        self.interval = interval
+
+    def source_files(self) -> list:
+        return list(SOURCE_DIR.glob("*.py")) + list(SOURCE_DIR.parent.glob("generate_site_v2.py"))
+
+    def static_files(self) -> list:
+        files = []
+        for root, dirs, names in os.walk(self.builder.output_dir):
+            if Path(root) == self.builder.output_dir:
+                # Written by the pipeline, which announces its own rebuilds
+                dirs[:] = [d for d in dirs if d not in GENERATED_DIRS]
+            files.extend(Path(root) / name for name in names
+                         if name.endswith(STATIC_SUFFIXES) and not name.endswith(GENERATED_SUFFIXES))
+        return files
+
+    def run(self):
+        sources = snapshot(self.source_files())
+        data = snapshot(self.builder.input_files())
+        static = snapshot(self.static_files())
+
+        while True:
+            time.sleep(self.interval)
+            new_sources = snapshot(self.source_files())
+            new_data = snapshot(self.builder.input_files())
+
+            changed = False
+            try:
+                if new_sources != sources:
+                    print("\nGenerator sources changed, reloading and rebuilding...")
+                    self.builder.rebuild(reload_sources=True)
+                    changed = True
+                elif new_data != data:
+                    print("\nBuild inputs changed, rebuilding...")
+                    self.builder.rebuild()
+                    changed = True
+            except Exception:
+                traceback.print_exc()
+                print("Rebuild failed; keeping previous output")
+            # Taken after the rebuild, so pages it rewrites (shells) do not reload twice
+            new_static = snapshot(self.static_files())
+            if new_static != static:
+                print("\nStatic files changed")
+                changed = True
+
+            sources, data, static = new_sources, new_data, new_static
+            if changed:
+                self.broadcaster.notify()
+
+
+def accepted_encodings(header: str) -> dict:
+    """Parse Accept-Encoding into {coding: q}; q=0 means the coding is refused."""
+    accepted = {}
+    for part in header.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def parse_range(header: str, size: int):
+    """Parse a single "bytes=start-end" range; return (start, end) inclusive or None.
+
+    Raises ValueError for unsatisfiable ranges.
+    """
+    if not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[6:].strip().partition("-")
+    try:
+        if start_text == "":
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError("empty suffix range")
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        raise ValueError(f"invalid range: {header}")
+    if start >= size or end < start:
+        raise ValueError(f"unsatisfiable range: {header}")
+    return start, min(end, size - 1)
+
+
+class PreviewRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with encoding negotiation, ETags, ranges and SSE."""
+
+    broadcaster: ReloadBroadcaster = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] == EVENTS_PATH:
+            self.send_events()
+            return
+        self.send_file(head=False)
+
+    def do_HEAD(self):
+        self.send_file(head=True)
+
+    def select_representation(self, path: Path):
+        """Pick the precompressed sibling the client accepts, if any."""
+        accepted = accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        for encoding, suffix in ENCODINGS:
+            candidate = path.with_name(path.name + suffix)
+            if accepted.get(encoding, accepted.get("*", 0)) > 0 and candidate.exists() and candidate.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                return candidate, encoding
+        return path, None
+
+    def send_file(self, head: bool):
+        path = Path(self.translate_path(self.path))
+        if path.is_dir():
+            path = path / "index.html"
+        if not path.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        source, encoding = self.select_representation(path)
+        st = source.stat()
+        body = source.read_bytes()
+        if content_type == "text/html" and encoding is None:
+            body = body.replace(b"</body>", RELOAD_SCRIPT + b"</body>", 1)
+
+        etag = f'"{st.st_mtime_ns:x}-{len(body):x}{"-" + encoding if encoding else ""}"'
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        status = HTTPStatus.OK
+        content_range = None
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            try:
+                byte_range = parse_range(range_header, len(body))
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if byte_range:
+                start, end = byte_range
+                content_range = f"bytes {start}-{end}/{len(body)}"
+                body = body[start:end + 1]
+                status = HTTPStatus.PARTIAL_CONTENT
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Cache-Control", "no-cache")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def send_events(self):
+        """Stream a "reload" event each time a rebuild finishes."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        generation = self.broadcaster.generation
+        try:
+            while True:
+                new_generation = self.broadcaster.wait(generation, timeout=15)
+                if new_generation != generation:
+                    generation = new_generation
+                    self.wfile.write(b"event: reload\ndata: {}\n\n")
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(options: dict, port: int = 8000, watch: bool = True):
+    """Serve the output directory and, if `watch` is set, rebuild on changes.
+
+    `options` are the build.site_pipeline arguments of the build being served.
+    """
+    mimetypes.add_type("application/json", ".json")
+    broadcaster = ReloadBroadcaster()
+    output_dir = options["output_dir"]
+
+    if watch:
+        Watcher(SiteBuilder(options), broadcaster).start()
+
+    handler = type("Handler", (PreviewRequestHandler,), {"broadcaster": broadcaster})
+
+    def make_handler(*args, **kwargs):
+        return handler(*args, directory=str(output_dir), **kwargs)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler)
+    server.daemon_threads = True
+    print(f"\nServing {output_dir} at http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server")
+    finally:
+        server.server_close()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Size report for sharding items.json with a trained zstd dictionary.
+
+Small JSON files compress poorly on their own, but items share most of their
+vocabulary (field names, types, rarities, families). `zstd_report` trains one
+zstd dictionary on the items and their text and compresses, in memory, a base
+shard (items.json without `items`) plus one shard per category
+(`by="category"`) or per item (`by="item"`), then compares every shard with
+gzip level 9 and brotli quality 11.
+
+Nothing is written to the site: the SPA loads the single items.json, and for
+its default route (every item plus the string table) items.json.br is
+smaller than the shards and dictionary together. The report shows whether a
+per-category or per-item client would change that.
+
+Requires zstandard (pip install zstandard).
+
+Usage (run from wikimaker/, after generate_site_v2.py):
+    python -m itemdb.shards --output-dir website
+    python -m itemdb.shards --output-dir website --by item --dict-size 65536 --report zstd.json
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import zstandard
+
+from .build import write_file
+
+BASE_SHARD = "base"
+
+DEFAULT_DICT_SIZE = 16 * 1024
+DEFAULT_LEVEL = 19
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Report the size of dictionary-compressed zstd shards of items.json")
+    parser.add_argument("--output-dir", type=Path, default=Path("website"),
+                        help="Directory containing items.json (default: website)")
+    parser.add_argument("--by", choices=("category", "item"), default="category",
+                        help="Shard granularity (default: category)")
+    parser.add_argument("--dict-size", type=int, default=DEFAULT_DICT_SIZE,
+                        help=f"Dictionary size in bytes (default: {DEFAULT_DICT_SIZE})")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL,
+                        help=f"zstd compression level (default: {DEFAULT_LEVEL})")
+    parser.add_argument("--report", type=Path, help="Also save the report as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def encode(value) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def shard_database(database: dict, by: str = "category") -> tuple:
+    """Split a database object into (base object, {shard name: shard object})."""
+    items = database["items"]
+    base = {key: value for key, value in database.items() if key != "items"}
+
+    groups = defaultdict(list)
+    for row, item in enumerate(items):
+        groups[item.get("category", "") if by == "category" else item["id"]].append(row)
+
+    shards = {name: {"rows": rows, "items": [items[row] for row in rows]} for name, rows in groups.items()}
+    return base, shards
+
+
+def train_dictionary(database: dict, dict_size: int = DEFAULT_DICT_SIZE, level: int = DEFAULT_LEVEL):
+    """Train a zstd dictionary on individual items and the interned text they share."""
+    samples = [encode(item) for item in database["items"]]
+    samples.extend(text.encode('utf-8') for text in database.get("text", {}).get("strings", []))
+    return zstandard.train_dictionary(dict_size, samples, level=level)
+
+
+def _sizes(raw: bytes, zstd_bytes: bytes, brotli) -> dict:
+    sizes = {"raw": len(raw), "gzip": len(gzip.compress(raw, compresslevel=9, mtime=0)), "zstd": len(zstd_bytes)}
+    if brotli is not None:
+        sizes["brotli"] = len(brotli.compress(raw, quality=11))
+    return sizes
+
+
+def size_report(artifacts: dict, compressed: dict, dictionary_size: int, whole: bytes, whole_zstd: bytes) -> dict:
+    """Compare each artifact's zstd size with gzip level 9 and brotli quality 11.
+
+    `whole` is the single-file items.json, for comparison with shipping it unsharded.
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    rows = {name: _sizes(raw, compressed[name], brotli) for name, raw in artifacts.items()}
+    keys = ("raw", "gzip", "brotli", "zstd") if brotli is not None else ("raw", "gzip", "zstd")
+    totals = {key: sum(row[key] for row in rows.values()) for key in keys}
+    # The dictionary is downloaded once, alongside the shards
+    totals["zstdWithDictionary"] = totals["zstd"] + dictionary_size
+    return {
+        "artifacts": rows,
+        "totals": totals,
+        "dictionary": dictionary_size,
+        "single": _sizes(whole, whole_zstd, brotli),
+    }
+
+
+def zstd_report(database: dict, by: str = "category", dict_size: int = DEFAULT_DICT_SIZE,
+                level: int = DEFAULT_LEVEL) -> dict:
+    """Shard and compress a database in memory; return the size report."""
+    base, shards = shard_database(database, by)
+    dictionary = train_dictionary(database, dict_size, level)
+    compressor = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+
+    artifacts = {BASE_SHARD: encode(base)}
+    artifacts.update((name, encode(shard)) for name, shard in shards.items())
+    compressed = {name: compressor.compress(raw) for name, raw in artifacts.items()}
+
+    whole = encode(database)
+    report = size_report(artifacts, compressed, len(dictionary.as_bytes()), whole,
+                         zstandard.ZstdCompressor(level=level).compress(whole))
+    report.update({"by": by, "dictSize": dict_size, "level": level})
+    return report
+
+
+def _gain(zstd_size: int, other: int) -> str:
+    return f"{(1 - zstd_size / other) * 100:+.1f}%" if other else "-"
+
+
+def print_report(report: dict, by: str = "category"):
+    """Print per-artifact sizes and the zstd gain over gzip 9 and brotli 11."""
+    has_brotli = "brotli" in report["totals"]
+    print(f"\nzstd shards ({by}, {report['dictionary']:,} byte dictionary):")
+    print("  Zstd sizes use the dictionary but exclude it; it is added once in the last total")
+    print(f"  {'Artifact':<24} {'Raw':>9} {'Gzip 9':>9} {'Brotli 11':>9} {'Zstd':>9}  vs gzip  vs brotli")
+
+    def line(name, row):
+        brotli_size = f"{row['brotli']:,}" if has_brotli else "-"
+        print(f"  {name:<24} {row['raw']:>9,} {row['gzip']:>9,} {brotli_size:>9} {row['zstd']:>9,}  "
+              f"{_gain(row['zstd'], row['gzip']):>7}  {_gain(row['zstd'], row.get('brotli', 0)):>8}")
+
+    artifacts = report["artifacts"]
+    # Per-item shards are too many to list one by one
+    if by == "category":
+        for name, row in artifacts.items():
+            line(name, row)
+    totals = report["totals"]
+    line(f"total ({len(artifacts)} files)", totals)
+    line("total + dictionary", {**totals, "zstd": totals["zstdWithDictionary"]})
+    line("items.json (no dict)", report["single"])
+
+
+def zstd_report_from_json(output_dir: Path, report_path: Path = None, by: str = "category",
+                          dict_size: int = DEFAULT_DICT_SIZE, level: int = DEFAULT_LEVEL) -> dict:
+    """Report on the items.json already in output_dir, saving it to report_path if given."""
+    with open(output_dir / "items.json", 'r', encoding='utf-8') as f:
+        database = json.load(f)
+    report = zstd_report(database, by, dict_size, level)
+    print_report(report, by)
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        write_file(report_path, json.dumps(report, indent=2).encode('utf-8'))
+    return report
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not (args.output_dir / "items.json").exists():
+        print(f"Error: {args.output_dir / 'items.json'} not found (run generate_site_v2.py first)", file=sys.stderr)
+        return 1
+    zstd_report_from_json(args.output_dir, args.report, args.by, args.dict_size, args.level)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Dependency-ordered build stages with concurrent execution and skipping.
+
+Each Stage declares:
+
+- `deps`: stages whose results it is called with (after its own `args`)
+- `after`: stages it only has to follow, e.g. a compressor that reads the
+  file an encoder wrote
+- `outputs`: files or directories it produces
+- `sources` and `params`: the files and option values it reads
+
+Pipeline.run() starts every stage as soon as its deps and `after` stages
+finish, on a thread pool (or a process pool for `process=True` stages), so
+wall time approaches the critical path rather than the sum of all stages.
+
+A stage's fingerprint hashes its sources' sizes and mtimes, its params, its
+output paths and its upstream fingerprints. It is up to date when its
+outputs exist and the fingerprint matches the one recorded in the state
+file after its last successful run. Up-to-date stages are skipped unless a
+stage that does run needs their result; `cache=True` stages keep their
+result as JSON so they can be skipped even then.
+
+Threads only overlap stages that wait on I/O or release the GIL (zlib,
+zstandard); pure-Python or otherwise CPU-bound stages should set
+`process=True` and take picklable args.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+RAN = "ran"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+class Stage:
+    """One unit of build work and what it reads and writes."""
+
+    def __init__(self, name: str, func, args: tuple = (), deps: tuple = (), after: tuple = (),
+                 outputs: tuple = (), sources: tuple = (), params=None, process: bool = False,
+                 cache: bool = False, always: bool = False):
+        self.name = name
+        self.func = func
+        self.args = tuple(args)
+        self.deps = tuple(deps)
+        self.after = tuple(after)
+        self.outputs = tuple(Path(p) for p in outputs)
+        self.sources = tuple(Path(p) for p in sources)
+        self.params = params
+        self.process = process
+        self.cache = cache
+        # Stages whose inputs cannot be listed up front (always run)
+        self.always = always
+
+    @property
+    def upstream(self) -> tuple:
+        return self.deps + self.after
+
+
+def files_in(directory: Path, pattern: str = "*") -> list:
+    """List the files matching a pattern in a directory (empty if it is missing)."""
+    directory = Path(directory)
+    return sorted(directory.glob(pattern)) if directory.is_dir() else []
+
+
+class Pipeline:
+    """A set of stages run in dependency order with a shared state file."""
+
+    def __init__(self, state_path: Path, jobs: int = None):
+        self.state_path = Path(state_path)
+        self.cache_dir = self.state_path.parent / (self.state_path.stem + ".cache")
+        self.jobs = jobs or os.cpu_count() or 1
+        self.stages = {}
+        self.report = {}
+
+    def add(self, stage: Stage) -> Stage:
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage: {stage.name}")
+        self.stages[stage.name] = stage
+        return stage
+
+    def order(self) -> list:
+        """Return stage names in a dependency-respecting order."""
+        order = []
+        state = {}
+
+        def visit(name, chain):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Stage cycle: {' -> '.join(chain + [name])}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage {name!r} required by {chain[-1]}")
+            state[name] = "visiting"
+            for upstream in self.stages[name].upstream:
+                visit(upstream, chain + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def fingerprints(self, order: list) -> dict:
+        """Hash each stage's sources, params and upstream fingerprints."""
+        prints = {}
+        for name in order:
+            stage = self.stages[name]
+            digest = hashlib.sha1(name.encode())
+            digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+            for source in stage.sources:
+                try:
+                    st = source.stat()
+                    digest.update(f"{source}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+                except OSError:
+                    digest.update(f"{source}:missing\n".encode())
+            for output in stage.outputs:
+                digest.update(f"{output.resolve()}\n".encode())
+            for upstream in stage.upstream:
+                digest.update(prints[upstream].encode())
+            prints[name] = digest.hexdigest()
+        return prints
+
+    def cache_path(self, name: str) -> Path:
+        return self.cache_dir / (name.replace(":", "-").replace("/", "-") + ".json")
+
+    def load_state(self) -> dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, state: dict):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def plan(self, order: list, prints: dict, state: dict, force: bool = False) -> set:
+        """Return the names of the stages that have to run."""
+        runs = set()
+        for name in order:
+            stage = self.stages[name]
+            if (force or stage.always or state.get(name) != prints[name]
+                    or any(not output.exists() for output in stage.outputs)
+                    or (stage.cache and not self.cache_path(name).exists())):
+                runs.add(name)
+        # A running stage needs the results of its deps; uncached ones rerun
+        for name in reversed(order):
+            if name in runs or self.stages[name].cache:
+                continue
+            if any(name in self.stages[other].deps for other in runs):
+                runs.add(name)
+        return runs
+
+    def run(self, force: bool = False) -> dict:
+        """Run every stage that is not up to date; return results by stage name."""
+        order = self.order()
+        prints = self.fingerprints(order)
+        state = self.load_state()
+        runs = self.plan(order, prints, state, force)
+
+        results = {}
+        timings = {}
+        status = {}
+        started = time.perf_counter()
+        pending = list(order)
+        running = {}
+        error = None
+
+        use_pools = self.jobs > 1 and len(runs) > 1
+        threads = ThreadPoolExecutor(self.jobs) if use_pools else None
+        processes = None
+        if use_pools and any(self.stages[name].process for name in runs):
+            processes = ProcessPoolExecutor(self.jobs)
+
+        def finish(name, value):
+            stage = self.stages[name]
+            results[name] = value
+            status[name] = RAN
+            state[name] = prints[name]
+            if stage.cache:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.cache_path(name), 'w', encoding='utf-8') as f:
+                    json.dump(value, f, separators=(',', ':'))
+
+        try:
+            while pending or running:
+                # Start (or skip) everything whose upstream stages are finished
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if error is not None or not all(up in status for up in stage.upstream):
+                        continue
+                    pending.remove(name)
+                    if name not in runs:
+                        status[name] = SKIPPED
+                        if stage.cache and any(name in self.stages[other].deps for other in runs):
+                            with open(self.cache_path(name), 'r', encoding='utf-8') as f:
+                                results[name] = json.load(f)
+                        continue
+                    call_args = stage.args + tuple(results.get(dep) for dep in stage.deps)
+                    # Forget the old fingerprint so a failed or interrupted run is redone
+                    state.pop(name, None)
+                    timings[name] = [time.perf_counter() - started, None]
+                    if threads is None:
+                        try:
+                            value = stage.func(*call_args)
+                        except BaseException:
+                            status[name] = FAILED
+                            raise
+                        finally:
+                            timings[name][1] = time.perf_counter() - started
+                        finish(name, value)
+                    else:
+                        if stage.process:
+                            # Forked workers inherit unflushed output and print it again on exit
+                            sys.stdout.flush()
+                            sys.stderr.flush()
+                        pool = processes if stage.process else threads
+                        running[pool.submit(stage.func, *call_args)] = name
+
+                if error is not None and not running:
+                    break
+                if not running:
+                    # Only skipped stages became ready; loop to release their dependents
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    timings[name][1] = time.perf_counter() - started
+                    try:
+                        value = future.result()
+                    except BaseException as e:
+                        status[name] = FAILED
+                        if error is None:
+                            error = e
+                        continue
+                    finish(name, value)
+        finally:
+            for pool in (threads, processes):
+                if pool is not None:
+                    pool.shutdown(wait=True, cancel_futures=True)
+            self.save_state({name: state[name] for name in order if name in state})
+            self.report = self._report(order, status, timings, time.perf_counter() - started)
+
+        if error is not None:
+            raise error
+        return results
+
+    def _report(self, order: list, status: dict, timings: dict, wall: float) -> dict:
+        """Summarize stage timings and the critical path through the run."""
+        seconds = {name: end - start for name, (start, end) in timings.items() if end is not None}
+        # Longest chain of ran stages, following deps and `after` edges
+        chain = {}
+        for name in order:
+            if name not in seconds:
+                continue
+            best = max((chain[up] for up in self.stages[name].upstream if up in chain),
+                       key=lambda c: c[0], default=(0.0, []))
+            chain[name] = (best[0] + seconds[name], best[1] + [name])
+        critical = max(chain.values(), key=lambda c: c[0], default=(0.0, []))
+
+        return {
+            "stages": {
+                name: {"status": status.get(name, "pending"), "seconds": round(seconds.get(name, 0.0), 3)}
+                for name in order
+            },
+            "wall": round(wall, 3),
+            "busy": round(sum(seconds.values()), 3),
+            "criticalPath": critical[1],
+            "criticalSeconds": round(critical[0], 3),
+        }
+
+
+def print_report(report: dict):
+    """Print per-stage timings, the critical path and the wall time."""
+    stages = report["stages"]
+    skipped = [name for name, info in stages.items() if info["status"] == SKIPPED]
+    ran = sorted((info["seconds"], name) for name, info in stages.items() if info["status"] == RAN)
+    print(f"\nStages: {len(ran)} ran, {len(skipped)} up to date")
+    for seconds, name in reversed(ran):
+        print(f"  {name:<28} {seconds:7.2f}s")
+    if report["criticalPath"]:
+        print(f"Critical path: {' -> '.join(report['criticalPath'])} ({report['criticalSeconds']:.2f}s)")
+    print(f"Wall time: {report['wall']:.2f}s for {report['busy']:.2f}s of stage work")
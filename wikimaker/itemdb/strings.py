@@ -0,0 +1,100 @@
+"""Shared string table for repeated item text.
+
+Variants and cutscene copies of an item often share the same description
+and flavor text. `intern_text` replaces those fields with references into a
+shared table:
+
+    item["description"] = 12                # -> text["strings"][12]
+    item["description"] = [3, "2", "15"]    # -> text["templates"][3] with the
+                                            #    numbers filled in (templates only)
+
+A template is a list of literal parts; the numbers go between them. Templates
+are only used for near-duplicates, i.e. strings that differ only in their
+numbers, and only when `templates=True`.
+"""
+
+import re
+from collections import defaultdict
+
+TEXT_FIELDS = ("description", "flavorText")
+
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def _template_key(text: str) -> tuple:
+    """Split a string into its literal parts around digit runs."""
+    return tuple(NUMBER_PATTERN.split(text))
+
+
+def intern_text(items: list, fields: tuple = TEXT_FIELDS, templates: bool = False) -> tuple:
+    """Return (items with text fields replaced by references, text table).
+
+    The input items are not modified.
+    """
+    # Unique strings in order of first use, which keeps related text close together
+    unique = {}
+    for item in items:
+        for field in fields:
+            value = item.get(field)
+            if isinstance(value, str):
+                unique.setdefault(value, None)
+
+    refs = {}
+    template_list = []
+    if templates:
+        groups = defaultdict(list)
+        for text in unique:
+            parts = _template_key(text)
+            if len(parts) > 1:
+                groups[parts].append(text)
+        for parts, texts in groups.items():
+            if len(texts) < 2:
+                continue
+            tpl_idx = len(template_list)
+            template_list.append(list(parts))
+            for text in texts:
+                refs[text] = [tpl_idx, *NUMBER_PATTERN.findall(text)]
+
+    strings = []
+    for text in unique:
+        if text not in refs:
+            refs[text] = len(strings)
+            strings.append(text)
+
+    encoded = []
+    for item in items:
+        item = dict(item)
+        for field in fields:
+            value = item.get(field)
+            if isinstance(value, str):
+                item[field] = refs[value]
+        encoded.append(item)
+
+    table = {"fields": list(fields), "strings": strings}
+    if template_list:
+        table["templates"] = template_list
+    return encoded, table
+
+
+def resolve_text(ref, table: dict) -> str:
+    """Resolve a single string table reference."""
+    if isinstance(ref, int):
+        return table["strings"][ref]
+    parts = table["templates"][ref[0]]
+    numbers = ref[1:]
+    out = [parts[0]]
+    for number, part in zip(numbers, parts[1:]):
+        out.append(number)
+        out.append(part)
+    return "".join(out)
+
+
+def expand_text(items: list, table: dict) -> list:
+    """Replace string table references in items with the strings, in place."""
+    fields = table.get("fields", TEXT_FIELDS)
+    for item in items:
+        for field in fields:
+            ref = item.get(field)
+            if ref is not None and not isinstance(ref, str):
+                item[field] = resolve_text(ref, table)
+    return items
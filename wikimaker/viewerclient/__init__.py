@@ -0,0 +1,26 @@
+"""Python client for the viewer-mod in-game HTTP API.
+
+Example:
+    import asyncio
+    from viewerclient import ViewerClient
+
+    async def main():
+        async with ViewerClient("http://localhost:5000", pool_size=8) as client:
+            total = await client.get_blueprint_total()
+            page = await client.get_blueprint_range(0, 100)
+
+    asyncio.run(main())
+"""
+
+from .client import DEFAULT_BASE_URL, ConnectionPool, HttpError, Response, ViewerClient
+from .ndjson import IndexedNdjson, build_index
+
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "ConnectionPool",
+    "HttpError",
+    "IndexedNdjson",
+    "Response",
+    "ViewerClient",
+    "build_index",
+]
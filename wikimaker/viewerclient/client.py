@@ -0,0 +1,224 @@
+"""Pooled asyncio HTTP/1.1 client for the viewer-mod API.
+
+The in-game server is plain HTTP on localhost, so this uses asyncio streams
+directly instead of a third-party HTTP library. A fixed-size pool of
+keep-alive connections bounds how many requests run at once.
+"""
+
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+DEFAULT_BASE_URL = "http://localhost:5000"
+
+READ_CHUNK = 64 * 1024
+
+
+class HttpError(Exception):
+    """Non-2xx response from the server."""
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.body = body
+        super().__init__(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+
+
+class Response:
+    """A buffered HTTP response."""
+
+    def __init__(self, status: int, headers: dict, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class _Connection:
+    """One keep-alive connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+        self.used = False
+        self.responded = False
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Bounded pool of keep-alive connections to one host."""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, size: int = 4, timeout: float = 120.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only http:// URLs are supported: {base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.size = size
+        self.timeout = timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        return _Connection(reader, writer)
+
+    async def request(self, method: str, path: str, body=None, headers: dict = None, sink=None,
+                      check: bool = True) -> Response:
+        """Send a request and return the response.
+
+        `body` may be bytes or a JSON-serializable object. If `sink` is given,
+        it is called with each body chunk of a 2xx response as it arrives and
+        the returned Response has an empty body. Non-2xx responses raise
+        HttpError unless `check` is False.
+        """
+        if body is not None and not isinstance(body, (bytes, bytearray)):
+            body = json.dumps(body).encode("utf-8")
+            headers = {"Content-Type": "application/json", **(headers or {})}
+
+        async with self._slots:
+            # A reused connection may have been closed by the server while idle;
+            # retry once on a fresh connection if nothing was received yet
+            for attempt in range(2):
+                conn = self._idle.pop() if self._idle else await self._connect()
+                try:
+                    response = await asyncio.wait_for(
+                        self._send(conn, method, path, body, headers, sink), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    conn.close()
+                    if attempt == 0 and conn.used and not conn.responded:
+                        continue
+                    raise ConnectionError(f"{method} {path} failed: {e}") from e
+                except BaseException:
+                    conn.close()
+                    raise
+                conn.used = True
+                if conn.reusable:
+                    self._idle.append(conn)
+                else:
+                    conn.close()
+                break
+
+        if check and not 200 <= response.status < 300:
+            raise HttpError(response.status, response.body)
+        return response
+
+    async def _send(self, conn: _Connection, method: str, path: str, body, headers, sink) -> Response:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body is not None:
+            conn.writer.write(body)
+        await conn.writer.drain()
+
+        conn.responded = False
+        head = await conn.reader.readuntil(b"\r\n\r\n")
+        conn.responded = True
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        version, status = status_line.split(" ", 2)[:2]
+        status = int(status)
+        response_headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        conn.reusable = version == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+
+        # Error bodies are always buffered so they can go into HttpError
+        chunks = []
+        emit = sink if sink is not None and 200 <= status < 300 else chunks.append
+
+        if method == "HEAD" or status in (204, 304):
+            pass
+        elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await conn.reader.readuntil(b"\r\n")
+                size = int(size_line.split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while await conn.reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                result = emit(await conn.reader.readexactly(size))
+                if asyncio.iscoroutine(result):
+                    await result
+                await conn.reader.readexactly(2)
+        elif "content-length" in response_headers:
+            remaining = int(response_headers["content-length"])
+            while remaining > 0:
+                chunk = await conn.reader.readexactly(min(READ_CHUNK, remaining))
+                remaining -= len(chunk)
+                result = emit(chunk)
+                if asyncio.iscoroutine(result):
+                    await result
+        else:
+            conn.reusable = False
+            while chunk := await conn.reader.read(READ_CHUNK):
+                result = emit(chunk)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        return Response(status, response_headers, b"".join(chunks))
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+class ViewerClient:
+    """Typed wrappers around the viewer-mod HTTP API."""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, pool_size: int = 4, timeout: float = 120.0):
+        self.pool = ConnectionPool(base_url, pool_size, timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.pool.close()
+
+    async def get_roots(self) -> list:
+        return (await self.pool.request("POST", "/api/roots", body={})).json()
+
+    async def inspect(self, handle_id: str) -> dict:
+        return (await self.pool.request("POST", "/api/inspect", body={"handleId": handle_id})).json()
+
+    async def get_image(self, handle_id: str) -> bytes:
+        return (await self.pool.request("GET", f"/api/image/{handle_id}")).body
+
+    async def clear_handles(self) -> dict:
+        return (await self.pool.request("POST", "/api/handles/clear", body={})).json()
+
+    async def get_blueprint(self, guid: str) -> dict:
+        return (await self.pool.request("GET", f"/api/blueprints/{guid}")).json()
+
+    async def get_blueprint_range(self, start: int, count: int) -> dict:
+        return (await self.pool.request("POST", "/api/blueprints/range", body={"start": start, "count": count})).json()
+
+    async def get_blueprint_total(self) -> int:
+        return (await self.get_blueprint_range(0, 0))["total"]
+
+    async def stream_equipment(self, start: int, count: int, sink) -> None:
+        """Stream equipment NDJSON for a GUID range into `sink(chunk)`."""
+        await self.pool.request("POST", "/api/blueprints/equipment/stream",
+                                body={"start": start, "count": count}, sink=sink)
+
+    async def get_equipment_icon(self, guid: str):
+        """Return PNG bytes for an equipment icon, or None if it has no icon."""
+        try:
+            return (await self.pool.request("GET", f"/api/blueprints/equipment/icon/{guid}")).body
+        except HttpError as e:
+            if e.status == 404:
+                return None
+            raise
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Snapshot the game's object graph through the viewer-mod inspect API.
+
+Walks breadth-first from `/api/roots`, inspecting every handle reachable
+through members and collection elements, and writes:
+
+- `<output>.jsonl`: one inspect response per line, plus the `depth` and
+  first-seen `path` (e.g. `Game.Player.Party[0]`) of each object
+- `<output>.index.json`: crawl settings, stats, roots and a
+  handleId -> [offset, length] table, in the viewerclient.ndjson sidecar
+  format so the snapshot opens with Snapshot / IndexedNdjson
+
+The mod registers each live object under a single handle, so deduplicating
+by handle ID visits every object once even in cyclic graphs.
+
+Usage (run from wikimaker/):
+    python -m viewerclient.crawl --max-depth 3 --max-objects 5000
+    python -m viewerclient.crawl --root Blueprints --output /tmp/snapshot.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from .client import DEFAULT_BASE_URL, HttpError, ViewerClient
+from .ndjson import IndexedNdjson, index_path_for, write_index
+
+SNAPSHOT_KEY = "handleId"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Snapshot the game's object graph via the viewer-mod API")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"Viewer-mod server (default: {DEFAULT_BASE_URL})")
+    parser.add_argument("--output", type=Path, default=Path("snapshot.jsonl"), help="Snapshot file (default: snapshot.jsonl)")
+    parser.add_argument("--root", action="append", dest="roots", help="Only crawl roots with this name (repeatable)")
+    parser.add_argument("--max-depth", type=int, default=4, help="Levels below the roots to follow (default: 4)")
+    parser.add_argument("--max-objects", type=int, default=10000, help="Maximum objects to inspect (default: 10000)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Inspect requests in flight (default: 4)")
+    return parser.parse_args(argv)
+
+
+def child_handles(record: dict, path: str):
+    """Yield (handleId, path) for every object a record refers to."""
+    for member in record.get("members") or []:
+        if member.get("handleId"):
+            yield member["handleId"], f"{path}.{member['name']}"
+    collection = record.get("collectionInfo") or {}
+    for element in collection.get("elements") or []:
+        if element.get("handleId"):
+            yield element["handleId"], f"{path}[{element['index']}]"
+
+
+async def inspect_handle(client: ViewerClient, handle_id: str) -> dict:
+    """Inspect one handle, turning API errors into an error record."""
+    try:
+        return await client.inspect(handle_id)
+    except HttpError as e:
+        try:
+            error = json.loads(e.body).get("error", str(e))
+        except ValueError:
+            error = str(e)
+        return {"handleId": handle_id, "error": error, "status": e.status}
+
+
+async def crawl(client: ViewerClient, output: Path, root_names=None, max_depth: int = 4,
+                max_objects: int = 10000, concurrency: int = 4) -> dict:
+    """Crawl from the roots and write the snapshot and its index; return the index."""
+    roots = await client.get_roots()
+    if root_names:
+        wanted = set(root_names)
+        roots = [root for root in roots if root["name"] in wanted]
+
+    stats = {"objects": 0, "errors": 0, "bytes": 0, "skippedDepth": 0, "skippedBudget": 0}
+    offsets = {}
+    seen = set()
+    level = []
+    for root in roots:
+        if root["handleId"] not in seen:
+            seen.add(root["handleId"])
+            level.append((root["handleId"], root["name"]))
+
+    started = time.perf_counter()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'wb') as out:
+        for depth in range(max_depth + 1):
+            if not level:
+                break
+            next_level = []
+            pending = iter(level)
+            in_flight = deque()
+
+            def schedule():
+                for handle_id, path in pending:
+                    in_flight.append((handle_id, path, asyncio.ensure_future(inspect_handle(client, handle_id))))
+                    if len(in_flight) >= concurrency:
+                        break
+
+            # Inspect the level with a sliding window, writing in BFS order
+            schedule()
+            try:
+                while in_flight:
+                    handle_id, path, task = in_flight.popleft()
+                    record = await task
+                    schedule()
+
+                    record["depth"] = depth
+                    record["path"] = path
+                    line = json.dumps(record, separators=(',', ':')).encode("utf-8") + b"\n"
+                    offsets[handle_id] = [stats["bytes"], len(line) - 1]
+                    out.write(line)
+                    stats["bytes"] += len(line)
+                    stats["objects"] += 1
+                    if "error" in record:
+                        stats["errors"] += 1
+                        continue
+
+                    for child_id, child_path in child_handles(record, path):
+                        if child_id in seen:
+                            continue
+                        if depth == max_depth:
+                            stats["skippedDepth"] += 1
+                        elif len(seen) >= max_objects:
+                            stats["skippedBudget"] += 1
+                        else:
+                            seen.add(child_id)
+                            next_level.append((child_id, child_path))
+            finally:
+                for _, _, task in in_flight:
+                    task.cancel()
+
+            print(f"Depth {depth}: {len(level):,} objects ({stats['objects']:,} total)")
+            level = next_level
+
+    snapshot_stat = output.stat()
+    index = {
+        "source": output.name,
+        "size": snapshot_stat.st_size,
+        "mtimeNs": snapshot_stat.st_mtime_ns,
+        "key": SNAPSHOT_KEY,
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+        "maxDepth": max_depth,
+        "maxObjects": max_objects,
+        "roots": roots,
+        "stats": stats,
+        "offsets": offsets,
+    }
+    write_index(output, index)
+
+    print(f"Crawled {stats['objects']:,} objects ({stats['errors']:,} errors) in {time.perf_counter() - started:.1f}s")
+    if stats["skippedDepth"] or stats["skippedBudget"]:
+        print(f"Not followed: {stats['skippedDepth']:,} beyond max depth, {stats['skippedBudget']:,} over budget")
+    return index
+
+
+class Snapshot(IndexedNdjson):
+    """Random access to a crawled snapshot by handle ID."""
+
+    def __init__(self, snapshot_path: Path):
+        super().__init__(snapshot_path, key=SNAPSHOT_KEY)
+
+
+async def run(args) -> int:
+    async with ViewerClient(args.base_url, pool_size=args.concurrency) as client:
+        await crawl(client, args.output, args.roots, args.max_depth, args.max_objects, args.concurrency)
+    print(f"Snapshot: {args.output}")
+    print(f"Index:    {index_path_for(args.output)}")
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except (HttpError, ConnectionError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Dump equipment blueprints and icons from the viewer-mod API.
+
+Python counterpart of viewer-mod/scripts/extract-blueprints.js. It writes
+the same dump (`equipment.jsonl` plus `<guid>.png` icons in
+viewer-mod/blueprint-dump/) and then turns the dump into an extraction
+directory the site generator reads: `<Namespace path>/<Type>/<name>_<guid>.jbp`
+under ../extractions/<timestamp>-viewer/, which becomes the latest
+extraction. The generator takes item icons from the dump directory. Beyond
+the JS script:
+
+- range batches are fetched over a pool of keep-alive connections, several
+  at a time, and written in order
+- a checkpoint file records the next range offset and the output length, so
+  an interrupted run resumes where it stopped (use --fresh to start over)
+- icons are downloaded concurrently, skipping ones already on disk and
+  blueprints the server had no icon for on an earlier run (recorded in
+  equipment.noicon.json; --fresh retries them)
+
+Usage (run from wikimaker/):
+    python -m viewerclient.extract
+    python -m viewerclient.extract --base-url http://127.0.0.1:5055 --output-dir /tmp/dump --extraction-dir /tmp/x
+    python generate_site_v2.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+from itemdb.extract import default_extractions_dir
+
+from .client import DEFAULT_BASE_URL, HttpError, ViewerClient
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent.parent.parent / "viewer-mod" / "blueprint-dump"
+
+OUTPUT_NAME = "equipment.jsonl"
+CHECKPOINT_NAME = "equipment.checkpoint.json"
+NO_ICON_NAME = "equipment.noicon.json"
+
+# Characters the extraction tool replaces in .jbp file names
+UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Dump equipment blueprints and icons from the viewer-mod API")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"Viewer-mod server (default: {DEFAULT_BASE_URL})")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Output directory (default: viewer-mod/blueprint-dump)"
+    )
+    parser.add_argument("--batch-size", type=int, default=20000, help="GUIDs per range request (default: 20000)")
+    parser.add_argument("--concurrency", type=int, default=2, help="Range requests in flight (default: 2)")
+    parser.add_argument("--icon-concurrency", type=int, default=8, help="Icon downloads in flight (default: 8)")
+    parser.add_argument("--no-icons", action="store_true", help="Skip icon downloads")
+    parser.add_argument(
+        "--extraction-dir",
+        type=Path,
+        help="Where to write the .jbp extraction (default: ../extractions/<timestamp>-viewer)"
+    )
+    parser.add_argument("--no-extraction", action="store_true", help="Only write the dump, not the .jbp extraction")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignore any checkpoint and start from offset 0, and retry icons recorded as missing")
+    return parser.parse_args(argv)
+
+
+class Checkpoint:
+    """Resume point for the range scan: next offset and committed output length."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self, total: int, batch_size: int):
+        """Return (next_start, output_bytes), or None if there is no usable checkpoint."""
+        if not self.path.exists():
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get("total") != total or state.get("batchSize") != batch_size:
+            return None
+        return state["nextStart"], state["bytes"]
+
+    def save(self, total: int, batch_size: int, next_start: int, output_bytes: int):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"total": total, "batchSize": batch_size, "nextStart": next_start, "bytes": output_bytes}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+async def fetch_batch(client: ViewerClient, start: int, count: int) -> bytes:
+    """Fetch one range of the equipment stream into memory."""
+    chunks = []
+    await client.stream_equipment(start, count, chunks.append)
+    return b"".join(chunks)
+
+
+async def dump_equipment(client: ViewerClient, output_dir: Path, batch_size: int,
+                         concurrency: int, fresh: bool) -> Path:
+    """Stream all equipment blueprints into equipment.jsonl, resuming if possible."""
+    print("Fetching blueprint GUID total...")
+    total = await client.get_blueprint_total()
+    print(f"Total GUIDs: {total}")
+
+    out_path = output_dir / OUTPUT_NAME
+    checkpoint = Checkpoint(output_dir / CHECKPOINT_NAME)
+    resume = None if fresh else checkpoint.load(total, batch_size)
+
+    if resume and out_path.exists() and out_path.stat().st_size >= resume[1]:
+        next_start, committed = resume
+        print(f"Resuming at offset {next_start} ({committed:,} bytes already written)")
+    else:
+        next_start, committed = 0, 0
+
+    starts = iter(range(next_start, total, batch_size))
+    in_flight = deque()
+
+    def schedule():
+        for start in starts:
+            count = min(batch_size, total - start)
+            in_flight.append((start, count, asyncio.ensure_future(fetch_batch(client, start, count))))
+            if len(in_flight) >= concurrency:
+                break
+
+    mode = 'r+b' if committed else 'wb'
+    with open(out_path, mode) as out:
+        out.truncate(committed)
+        out.seek(committed)
+        schedule()
+        try:
+            while in_flight:
+                start, count, task = in_flight.popleft()
+                data = await task
+                out.write(data)
+                out.flush()
+                committed += len(data)
+                checkpoint.save(total, batch_size, start + count, committed)
+                print(f"{start + count}/{total}")
+                schedule()
+        finally:
+            for _, _, task in in_flight:
+                task.cancel()
+
+    checkpoint.clear()
+    print(f"Done. Output: {out_path}")
+    return out_path
+
+
+def read_guids(jsonl_path: Path) -> list:
+    """Return meta.Guid for every line of an equipment dump."""
+    guids = []
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                guid = json.loads(line).get("meta", {}).get("Guid")
+            except json.JSONDecodeError:
+                continue
+            if guid:
+                guids.append(guid)
+    return guids
+
+
+def load_no_icon(path: Path) -> set:
+    """GUIDs the server reported as having no icon on an earlier run."""
+    if not path.exists():
+        return set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return set(json.load(f))
+    except (json.JSONDecodeError, TypeError):
+        return set()
+
+
+def save_no_icon(path: Path, guids: set):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(sorted(guids), f, indent=0)
+    os.replace(tmp_path, path)
+
+
+def jbp_filename(name: str, guid: str) -> str:
+    """File name of a blueprint in an extraction: `<name>_<guid>.jbp`, made filesystem-safe."""
+    return f"{UNSAFE_FILENAME_CHARS.sub('_', name).strip('_')}_{guid}.jbp"
+
+
+def write_extraction(jsonl_path: Path, extraction_dir: Path) -> int:
+    """Write every blueprint of a dump as a .jbp file; return how many were written.
+
+    The directory is filled under a hidden temporary name and renamed when
+    complete, so an interrupted run never becomes the latest extraction.
+    """
+    if extraction_dir.exists():
+        raise FileExistsError(f"Extraction directory already exists: {extraction_dir}")
+    tmp_dir = extraction_dir.with_name(f".{extraction_dir.name}.partial")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+
+    written = 0
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            meta = record.get("meta", {})
+            guid, type_name, namespace = meta.get("Guid"), meta.get("Type"), meta.get("Namespace") or ""
+            if not guid or not type_name:
+                continue
+            blueprint = {
+                "$type": f"{namespace}.{type_name}" if namespace else type_name,
+                "guid": guid,
+                "name": meta.get("Name", ""),
+                "namespace": namespace,
+                "data": record.get("data", {}),
+            }
+            directory = tmp_dir.joinpath(*namespace.split("."), type_name) if namespace else tmp_dir / type_name
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / jbp_filename(blueprint["name"], guid)
+            # Same bytes as the extraction tool writes (CRLF, no trailing newline)
+            path.write_text(json.dumps(blueprint, indent=2, ensure_ascii=False), encoding='utf-8', newline='\r\n')
+            written += 1
+
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp_dir, extraction_dir)
+    return written
+
+
+async def fetch_icons(client: ViewerClient, guids: list, output_dir: Path, concurrency: int,
+                      fresh: bool = False) -> dict:
+    """Download missing icons with a bounded number of workers.
+
+    Blueprints without an icon are recorded next to the dump and not
+    requested again unless `fresh` is set.
+    """
+    no_icon_path = output_dir / NO_ICON_NAME
+    guids = list(dict.fromkeys(guids))
+    no_icon = set() if fresh else load_no_icon(no_icon_path) & set(guids)
+    queue = asyncio.Queue()
+    for guid in guids:
+        if guid not in no_icon and not (output_dir / f"{guid}.png").exists():
+            queue.put_nowait(guid)
+    stats = {"saved": 0, "missing": 0, "failed": 0, "noIcon": len(no_icon),
+             "skipped": len(guids) - len(no_icon) - queue.qsize()}
+
+    async def worker():
+        while True:
+            try:
+                guid = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                png = await client.get_equipment_icon(guid)
+            except Exception:
+                stats["failed"] += 1
+                continue
+            if png is None:
+                stats["missing"] += 1
+                no_icon.add(guid)
+                continue
+            icon_path = output_dir / f"{guid}.png"
+            tmp_path = icon_path.with_name(icon_path.name + ".tmp")
+            tmp_path.write_bytes(png)
+            os.replace(tmp_path, icon_path)
+            stats["saved"] += 1
+            if stats["saved"] % 50 == 0:
+                print(f"  Saved {stats['saved']} icons...")
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        save_no_icon(no_icon_path, no_icon)
+    return stats
+
+
+async def run(args) -> int:
+    extraction_dir = None
+    if not args.no_extraction:
+        extraction_dir = args.extraction_dir or default_extractions_dir() / f"{time.strftime('%Y-%m-%d-%H%M%S')}-viewer"
+        # Fail before the dump rather than after it
+        if extraction_dir.exists():
+            raise FileExistsError(f"Extraction directory already exists: {extraction_dir}")
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    pool_size = max(args.concurrency, args.icon_concurrency)
+    started = time.perf_counter()
+
+    async with ViewerClient(args.base_url, pool_size=pool_size) as client:
+        out_path = await dump_equipment(client, args.output_dir, args.batch_size, args.concurrency, args.fresh)
+
+        if not args.no_icons:
+            print("Fetching icons for each equipment item...")
+            stats = await fetch_icons(client, read_guids(out_path), args.output_dir, args.icon_concurrency, args.fresh)
+            print(f"Icon fetch complete. Saved: {stats['saved']}, already present: {stats['skipped']}, "
+                  f"no icon: {stats['missing']} (+{stats['noIcon']} known from earlier runs), "
+                  f"failed: {stats['failed']}")
+
+    if extraction_dir is not None:
+        print(f"Writing extraction to {extraction_dir}...")
+        count = write_extraction(out_path, extraction_dir)
+        print(f"Wrote {count:,} blueprints")
+
+    print(f"Finished in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except (HttpError, ConnectionError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
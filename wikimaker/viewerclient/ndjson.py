@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Random access into large NDJSON dumps through a sidecar offset index.
+
+`equipment.jsonl` and crawl snapshots are one JSON record per line. A single
+pass over the file records where each record starts and how long it is,
+keyed by a field such as `meta.Guid`, in `<name>.index.json` next to it:
+
+    {"source": "equipment.jsonl", "size": ..., "mtimeNs": ..., "key": "meta.Guid",
+     "offsets": {"<guid>": [offset, length], ...}}
+
+IndexedNdjson memory-maps the dump and decodes only the requested lines, so
+a lookup costs one dict probe plus one record parse regardless of file size.
+The index is rebuilt automatically when the dump's size or mtime changes.
+
+Usage (run from wikimaker/):
+    python -m viewerclient.ndjson ../viewer-mod/blueprint-dump/equipment.jsonl
+    python -m viewerclient.ndjson ../viewer-mod/blueprint-dump/equipment.jsonl <guid> [<guid> ...]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_KEY = "meta.Guid"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Index an NDJSON dump and look up records by key")
+    parser.add_argument("path", type=Path, help="NDJSON file")
+    parser.add_argument("keys", nargs="*", help="Keys to print (default: just build the index)")
+    parser.add_argument("--key", default=DEFAULT_KEY, help=f"Dotted field to index by (default: {DEFAULT_KEY})")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if it is up to date")
+    return parser.parse_args(argv)
+
+
+def index_path_for(ndjson_path: Path) -> Path:
+    """Return the sidecar index file for an NDJSON file."""
+    return ndjson_path.with_suffix(".index.json")
+
+
+def lookup_field(record: dict, key: str):
+    """Return a dotted field (e.g. `meta.Guid`) from a record, or None."""
+    value = record
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def iter_lines(data):
+    """Yield (offset, line) for each line of a bytes-like buffer, without the newline."""
+    offset = 0
+    size = len(data)
+    while offset < size:
+        end = data.find(b"\n", offset)
+        if end == -1:
+            end = size
+        line = data[offset:end]
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        yield offset, line
+        offset = end + 1
+
+
+def build_index(ndjson_path: Path, key: str = DEFAULT_KEY) -> dict:
+    """Scan an NDJSON file once and write its sidecar index; return the index."""
+    stat = ndjson_path.stat()
+    offsets = {}
+    stats = {"records": 0, "duplicates": 0, "invalid": 0, "unkeyed": 0}
+
+    if stat.st_size:
+        with open(ndjson_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset, line in iter_lines(data):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # e.g. a partial last line from an interrupted dump
+                    stats["invalid"] += 1
+                    continue
+                value = lookup_field(record, key)
+                if value is None:
+                    stats["unkeyed"] += 1
+                    continue
+                value = str(value)
+                if value in offsets:
+                    stats["duplicates"] += 1
+                offsets[value] = [offset, len(line)]
+                stats["records"] += 1
+
+    index = {
+        "source": ndjson_path.name,
+        "size": stat.st_size,
+        "mtimeNs": stat.st_mtime_ns,
+        "key": key,
+        "stats": stats,
+        "offsets": offsets,
+    }
+    write_index(ndjson_path, index)
+    return index
+
+
+def write_index(ndjson_path: Path, index: dict):
+    """Write a sidecar index atomically."""
+    index_path = index_path_for(ndjson_path)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, index_path)
+
+
+def load_index(ndjson_path: Path, key: str = DEFAULT_KEY, rebuild: bool = False) -> dict:
+    """Load the sidecar index, rebuilding it if missing, stale or keyed differently."""
+    index_path = index_path_for(ndjson_path)
+    if not rebuild and index_path.exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        stat = ndjson_path.stat()
+        if (index.get("key") == key and index.get("size") == stat.st_size
+                and index.get("mtimeNs", stat.st_mtime_ns) == stat.st_mtime_ns):
+            return index
+    return build_index(ndjson_path, key)
+
+
+class IndexedNdjson:
+    """Memory-mapped NDJSON file with constant-time lookup by key."""
+
+    def __init__(self, path: Path, key: str = DEFAULT_KEY, rebuild: bool = False):
+        self.path = Path(path)
+        self.index = load_index(self.path, key, rebuild)
+        self.offsets = self.index["offsets"]
+        self._file = None
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def keys(self):
+        return self.offsets.keys()
+
+    def _map(self):
+        if self._data is None:
+            self._file = open(self.path, 'rb')
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data
+
+    def raw(self, key: str):
+        """Return the undecoded bytes of a record, or None if the key is absent."""
+        location = self.offsets.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        return self._map()[offset:offset + length]
+
+    def get(self, key: str):
+        """Return the decoded record for a key, or None if it is absent."""
+        line = self.raw(key)
+        return None if line is None else json.loads(line)
+
+    def get_many(self, keys) -> dict:
+        """Decode several records, reading them in file order; absent keys are skipped."""
+        found = sorted((self.offsets[key][0], key) for key in set(keys) if key in self.offsets)
+        return {key: self.get(key) for _, key in found}
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._file.close()
+            self._data = self._file = None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.path.exists():
+        print(f"Error: {args.path} not found", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    with IndexedNdjson(args.path, args.key, args.rebuild) as dump:
+        stats = dump.index.get("stats", {})
+        print(f"Index: {index_path_for(args.path)} ({len(dump):,} keys, {time.perf_counter() - started:.2f}s)", file=sys.stderr)
+        if stats.get("duplicates") or stats.get("invalid") or stats.get("unkeyed"):
+            print(f"  duplicates: {stats['duplicates']:,}, invalid lines: {stats['invalid']:,}, "
+                  f"without {args.key}: {stats['unkeyed']:,}", file=sys.stderr)
+
+        missing = 0
+        for key in args.keys:
+            line = dump.raw(key)
+            if line is None:
+                print(f"Not found: {key}", file=sys.stderr)
+                missing += 1
+                continue
+            sys.stdout.buffer.write(bytes(line) + b"\n")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
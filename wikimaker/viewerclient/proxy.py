@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""Caching proxy in front of the viewer-mod HTTP server.
+
+Every API call is handled inside the running game, so repeated lookups from
+the web client and MCP server cost frame time. Point those at this proxy
+(e.g. VIEWER_MOD_URL=http://localhost:5001) instead of the game:
+
+- blueprint detail, list, range and icon responses are immutable for a game
+  session and kept in an LRU cache with a TTL; 404s are kept for a much
+  shorter negative TTL and other errors are not cached at all
+- `/api/image/<handle>` responses are cached until `/api/handles/clear`
+- `/api/inspect` and `/api/roots` are never cached (they show live state),
+  but identical calls that are in flight at the same time share one
+  upstream request, as do all cacheable calls
+- `/api/handles/clear` is forwarded and drops every handle-scoped entry
+- hit/miss counters are served at /__proxy/metrics (JSON, or Prometheus
+  text with ?format=prometheus); requests that joined another caller's
+  upstream fetch are counted as coalesced, not as misses
+
+Usage (run from wikimaker/):
+    python -m viewerclient.proxy
+    python -m viewerclient.proxy --upstream http://localhost:5000 --port 5001 --ttl 600 --negative-ttl 10
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from .client import DEFAULT_BASE_URL, ConnectionPool, Response
+
+METRICS_PATH = "/__proxy/metrics"
+
+BLUEPRINT_SCOPE = "blueprint"
+HANDLE_SCOPE = "handle"
+
+# Statuses worth remembering and whether they use the negative TTL;
+# anything else is retried next time
+CACHEABLE_STATUSES = {200: False, 404: True}
+
+# Uncached reads that still share identical in-flight requests
+COALESCED_PATHS = ("/api/roots", "/api/inspect")
+
+# Responses relayed chunk by chunk instead of buffered
+STREAMING_PATHS = {"/api/blueprints/equipment/stream": "application/x-ndjson"}
+
+# Same headers the mod's HttpServer adds to every response
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+CAMEL_CASE_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Caching proxy for the viewer-mod HTTP server")
+    parser.add_argument("--upstream", default=DEFAULT_BASE_URL, help=f"Viewer-mod server (default: {DEFAULT_BASE_URL})")
+    parser.add_argument("--port", type=int, default=5001, help="Port to listen on (default: 5001)")
+    parser.add_argument("--ttl", type=float, default=3600.0, help="Seconds a cached response stays valid (default: 3600)")
+    parser.add_argument("--negative-ttl", type=float, default=30.0,
+                        help="Seconds a cached 404 stays valid (default: 30)")
+    parser.add_argument("--max-entries", type=int, default=4096, help="Maximum cached responses (default: 4096)")
+    parser.add_argument("--max-mb", type=float, default=128.0, help="Maximum cached body size in MB (default: 128)")
+    parser.add_argument("--pool-size", type=int, default=4, help="Upstream connections (default: 4)")
+    return parser.parse_args(argv)
+
+
+def cache_scope(method: str, path: str):
+    """Return the cache scope for a request, or None if it must not be cached."""
+    if method == "GET" and path.startswith("/api/image/"):
+        return HANDLE_SCOPE
+    if method == "GET" and (path == "/api/blueprints" or path.startswith("/api/blueprints/")):
+        return BLUEPRINT_SCOPE
+    if method == "POST" and path == "/api/blueprints/range":
+        return BLUEPRINT_SCOPE
+    return None
+
+
+class CacheEntry:
+    """A cached upstream response."""
+
+    __slots__ = ("response", "scope", "expires", "size")
+
+    def __init__(self, response: Response, scope: str, expires: float):
+        self.response = response
+        self.scope = scope
+        self.expires = expires
+        self.size = len(response.body)
+
+
+class ResponseCache:
+    """LRU cache with a TTL and limits on entry count and total body size."""
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 128 * 1024 * 1024,
+                 ttl: float = 3600.0, negative_ttl: float = 30.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= self.clock():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self.entries.move_to_end(key)
+        return entry.response
+
+    def put(self, key, response: Response, scope: str, negative: bool = False):
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl <= 0:
+            return
+        entry = CacheEntry(response, scope, self.clock() + ttl)
+        if entry.size > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = entry
+        self.bytes += entry.size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def invalidate(self, scope: str) -> int:
+        """Drop every entry in a scope; return how many were dropped."""
+        keys = [key for key, entry in self.entries.items() if entry.scope == scope]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def _remove(self, key):
+        self.bytes -= self.entries.pop(key).size
+
+
+class CachingProxy:
+    """HTTP/1.1 front end that serves cached or coalesced upstream responses."""
+
+    def __init__(self, upstream: str, cache: ResponseCache, pool_size: int = 4):
+        self.pool = ConnectionPool(upstream, pool_size)
+        self.cache = cache
+        self.in_flight = {}
+        # Bumped around every handle clear so responses fetched across one
+        # are neither shared with nor cached for later callers
+        self.generation = 0
+        self.started = time.monotonic()
+        self.counters = {"requests": 0, "hits": 0, "misses": 0, "coalesced": 0,
+                         "passthrough": 0, "upstreamRequests": 0, "upstreamErrors": 0}
+        self.scope_counters = {scope: {"hits": 0, "misses": 0, "coalesced": 0}
+                               for scope in (BLUEPRINT_SCOPE, HANDLE_SCOPE)}
+
+    # -- metrics ----------------------------------------------------------
+
+    def metrics(self) -> dict:
+        # Cache lookups include coalesced followers: they missed the cache
+        # but cost no upstream request of their own
+        lookups = sum(sum(counts.values()) for counts in self.scope_counters.values())
+        return {
+            **self.counters,
+            "hitRate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "scopes": self.scope_counters,
+            "cache": {
+                "entries": len(self.cache.entries),
+                "bytes": self.cache.bytes,
+                "evictions": self.cache.evictions,
+                "expirations": self.cache.expirations,
+                "invalidations": self.cache.invalidations,
+            },
+            "uptimeSeconds": round(time.monotonic() - self.started, 1),
+        }
+
+    def prometheus_metrics(self) -> str:
+        metrics = self.metrics()
+        lines = []
+        for name in self.counters:
+            metric = CAMEL_CASE_BOUNDARY.sub("_", name).lower()
+            lines.append(f"viewer_proxy_{metric}_total {metrics[name]}")
+        lines.append(f"viewer_proxy_hit_rate {metrics['hitRate']}")
+        for scope, counts in self.scope_counters.items():
+            for name, value in counts.items():
+                lines.append(f'viewer_proxy_scope_{name}_total{{scope="{scope}"}} {value}')
+        for name, value in metrics["cache"].items():
+            lines.append(f"viewer_proxy_cache_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    # -- upstream ---------------------------------------------------------
+
+    async def fetch(self, method: str, target: str, body: bytes, headers: dict, sink=None) -> Response:
+        self.counters["upstreamRequests"] += 1
+        try:
+            return await self.pool.request(method, target, body=body, headers=headers, sink=sink, check=False)
+        except (ConnectionError, OSError, asyncio.TimeoutError):
+            self.counters["upstreamErrors"] += 1
+            raise
+
+    async def coalesced_fetch(self, key, method: str, target: str, body: bytes, headers: dict):
+        """Fetch once for all identical concurrent requests; return (response, shared)."""
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            response = await self.fetch(method, target, body, headers)
+            future.set_result(response)
+            return response, False
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self.in_flight[key]
+
+    async def clear_handles(self, target: str, body: bytes, headers: dict) -> Response:
+        self.generation += 1
+        self.cache.invalidate(HANDLE_SCOPE)
+        try:
+            return await self.fetch("POST", target, body, headers)
+        finally:
+            self.generation += 1
+            self.cache.invalidate(HANDLE_SCOPE)
+
+    # -- client side ------------------------------------------------------
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self.send(writer, 400, {"content-type": "application/json"},
+                                    b'{"error":"Bad request"}', close=True)
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.handle_request(writer, method.upper(), target, body, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, writer, method: str, target: str, body: bytes, headers: dict, keep_alive: bool):
+        self.counters["requests"] += 1
+        parts = urlsplit(target)
+        path = parts.path.lower()
+        close = not keep_alive
+
+        if method == "OPTIONS":
+            await self.send(writer, 200, {}, b"", close=close)
+            return
+        if path == METRICS_PATH:
+            if parse_qs(parts.query).get("format") == ["prometheus"]:
+                data, content_type = self.prometheus_metrics().encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                data, content_type = json.dumps(self.metrics(), indent=2).encode("utf-8"), "application/json"
+            await self.send(writer, 200, {"content-type": content_type}, data, close=close)
+            return
+
+        upstream_headers = {"Content-Type": headers["content-type"]} if "content-type" in headers else None
+        request_body = body if body or method == "POST" else None
+        scope = cache_scope(method, path)
+
+        try:
+            if scope is not None:
+                key = (method, path, body)
+                response = self.cache.get(key)
+                if response is not None:
+                    self.counters["hits"] += 1
+                    self.scope_counters[scope]["hits"] += 1
+                    await self.send(writer, response.status, response.headers, response.body, "HIT", close)
+                    return
+                generation = self.generation
+                if (generation, key) in self.in_flight:
+                    self.scope_counters[scope]["coalesced"] += 1
+                else:
+                    self.counters["misses"] += 1
+                    self.scope_counters[scope]["misses"] += 1
+                response, shared = await self.coalesced_fetch(
+                    (generation, key), method, target, request_body, upstream_headers)
+                if (not shared and response.status in CACHEABLE_STATUSES
+                        and (scope != HANDLE_SCOPE or generation == self.generation)):
+                    self.cache.put(key, response, scope, CACHEABLE_STATUSES[response.status])
+                await self.send(writer, response.status, response.headers, response.body,
+                                "COALESCED" if shared else "MISS", close)
+            elif method == "POST" and path == "/api/handles/clear":
+                self.counters["passthrough"] += 1
+                response = await self.clear_handles(target, request_body, upstream_headers)
+                await self.send(writer, response.status, response.headers, response.body, "PASS", close)
+            elif path in COALESCED_PATHS:
+                self.counters["passthrough"] += 1
+                response, shared = await self.coalesced_fetch(
+                    (self.generation, method, path, body), method, target, request_body, upstream_headers)
+                await self.send(writer, response.status, response.headers, response.body,
+                                "COALESCED" if shared else "PASS", close)
+            elif path in STREAMING_PATHS:
+                self.counters["passthrough"] += 1
+                await self.relay_stream(writer, method, target, request_body, upstream_headers,
+                                        STREAMING_PATHS[path], close)
+            else:
+                self.counters["passthrough"] += 1
+                response = await self.fetch(method, target, request_body, upstream_headers)
+                await self.send(writer, response.status, response.headers, response.body, "PASS", close)
+        except (ConnectionError, OSError, asyncio.TimeoutError) as e:
+            error = json.dumps({"error": f"Upstream unavailable: {e}"}).encode("utf-8")
+            await self.send(writer, 502, {"content-type": "application/json"}, error, close=close)
+
+    async def relay_stream(self, writer, method: str, target: str, body, headers, content_type: str, close: bool):
+        """Forward a chunked upstream response without buffering it."""
+        started = False
+
+        async def sink(chunk: bytes):
+            nonlocal started
+            if not started:
+                started = True
+                self.write_head(writer, 200, {"content-type": content_type}, "PASS", close, chunked=True)
+            writer.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+            await writer.drain()
+
+        try:
+            response = await self.fetch(method, target, body, headers, sink=sink)
+        except (ConnectionError, OSError, asyncio.TimeoutError):
+            if not started:
+                raise
+            # Too late for a 502; dropping the connection tells the client
+            writer.close()
+            return
+        if started:
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        else:
+            await self.send(writer, response.status, response.headers, response.body, "PASS", close)
+
+    def write_head(self, writer, status: int, headers: dict, cache_state: str, close: bool,
+                   length: int = None, chunked: bool = False):
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        if "content-type" in headers:
+            lines.append(f"Content-Type: {headers['content-type']}")
+        lines.extend(f"{name}: {value}" for name, value in CORS_HEADERS.items())
+        if cache_state:
+            lines.append(f"X-Cache: {cache_state}")
+        if chunked:
+            lines.append("Transfer-Encoding: chunked")
+        else:
+            lines.append(f"Content-Length: {length or 0}")
+        lines.append("Connection: close" if close else "Connection: keep-alive")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def send(self, writer, status: int, headers: dict, body: bytes, cache_state: str = "", close: bool = False):
+        self.write_head(writer, status, headers, cache_state, close, length=len(body))
+        writer.write(body)
+        await writer.drain()
+
+    async def close(self):
+        await self.pool.close()
+
+
+async def run(args) -> int:
+    cache = ResponseCache(args.max_entries, int(args.max_mb * 1024 * 1024), args.ttl, args.negative_ttl)
+    proxy = CachingProxy(args.upstream, cache, args.pool_size)
+    server = await asyncio.start_server(proxy.handle_client, "127.0.0.1", args.port)
+    print(f"Proxying {args.upstream} at http://127.0.0.1:{args.port}/ (Ctrl+C to stop)")
+    print(f"Metrics: http://127.0.0.1:{args.port}{METRICS_PATH}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        metrics = proxy.metrics()
+        print(f"\nRequests: {metrics['requests']:,}, cache hits: {metrics['hits']:,}, "
+              f"misses: {metrics['misses']:,} (hit rate {metrics['hitRate']:.1%}), "
+              f"coalesced: {metrics['coalesced']:,}, upstream: {metrics['upstreamRequests']:,}")
+        await proxy.close()
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 0
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
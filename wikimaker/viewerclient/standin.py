@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Local stand-in for the viewer-mod blueprint API.
+
+Serves blueprints from an extraction directory (.jbp files) and icons from
+viewer-mod/blueprint-dump/ using the same endpoints and response shapes as
+the in-game server, so the Python tools can be exercised without the game.
+The loaded blueprints double as the object graph behind the handle API:
+
+    POST /api/roots                         -> [{"name", "handleId", "type", "assemblyName"}]
+    POST /api/inspect                       {"handleId"} -> members / collectionInfo
+    POST /api/handles/clear
+    GET  /api/image/<handle>                (icon of a blueprint handle)
+    GET  /api/blueprints
+    POST /api/blueprints/range              {"start", "count"} -> {"total", "blueprints": [...]}
+    POST /api/blueprints/equipment/stream   {"start", "count"} -> chunked NDJSON
+    GET  /api/blueprints/equipment/icon/<guid>
+    GET  /api/blueprints/<guid>
+
+Usage (run from wikimaker/):
+    python -m viewerclient.standin --port 5055 --latency 5
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from itemdb.extract import default_extractions_dir, get_latest_extraction
+
+DEFAULT_ICON_DIR = Path(__file__).resolve().parent.parent.parent / "viewer-mod" / "blueprint-dump"
+
+# Extraction subtrees whose blueprints count as equipment
+EQUIPMENT_ROOTS = ["Kingmaker/Blueprints/Items", "Warhammer/SpaceCombat/Blueprints"]
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Stand-in for the viewer-mod blueprint API")
+    parser.add_argument("--port", type=int, default=5055, help="Port to listen on (default: 5055)")
+    parser.add_argument(
+        "--extraction-dir",
+        type=Path,
+        help="Extraction to serve blueprints from (default: latest in ../extractions/)"
+    )
+    parser.add_argument(
+        "--icon-dir",
+        type=Path,
+        default=DEFAULT_ICON_DIR,
+        help="Directory of <guid>.png icons (default: viewer-mod/blueprint-dump)"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated per-request latency in ms")
+    return parser.parse_args(argv)
+
+
+class BlueprintStore:
+    """Blueprints loaded from an extraction, in a stable GUID order."""
+
+    def __init__(self, data_dir: Path, icon_dir: Path):
+        self.icon_dir = icon_dir
+        self.blueprints = {}
+        for root in EQUIPMENT_ROOTS:
+            for jbp_file in sorted((data_dir / root).rglob("*.jbp")):
+                with open(jbp_file, 'r', encoding='utf-8') as f:
+                    item = json.load(f)
+                type_name = item.get("$type", "")
+                namespace, _, short_type = type_name.rpartition(".")
+                self.blueprints[item["guid"]] = {
+                    "meta": {"Guid": item["guid"], "Name": item.get("name", ""), "Type": short_type, "Namespace": namespace},
+                    "data": item.get("data", {}),
+                }
+        self.guids = list(self.blueprints)
+
+    def range(self, start: int, count: int) -> list:
+        start = max(0, min(start, len(self.guids)))
+        count = max(0, min(count, len(self.guids) - start))
+        return [self.blueprints[guid] for guid in self.guids[start:start + count]]
+
+    def icon(self, guid: str):
+        path = self.icon_dir / f"{guid}.png"
+        return path.read_bytes() if path.exists() else None
+
+
+class HandleRegistry:
+    """Opaque handle IDs for objects in the stand-in graph, like the mod's HandleRegistry."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.objects = {}
+        self.handles = {}
+
+    def register(self, obj) -> str:
+        with self.lock:
+            handle = self.handles.get(id(obj))
+            if handle is None:
+                handle = str(uuid.uuid4())
+                self.handles[id(obj)] = handle
+                self.objects[handle] = obj
+            return handle
+
+    def get(self, handle: str):
+        with self.lock:
+            return self.objects.get(handle)
+
+    def clear(self):
+        with self.lock:
+            self.objects.clear()
+            self.handles.clear()
+
+
+def type_of(value) -> str:
+    if isinstance(value, dict):
+        if "meta" in value and "data" in value:
+            return f"{value['meta']['Namespace']}.{value['meta']['Type']}"
+        return value.get("$type", "System.Object").split(",")[0]
+    if isinstance(value, list):
+        return "System.Collections.Generic.List"
+    return type(value).__name__
+
+
+def is_primitive(value) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def inspect_object(registry: HandleRegistry, handle: str, obj) -> dict:
+    """Describe an object the way ObjectInspector does."""
+    def child(value):
+        return None if is_primitive(value) else registry.register(value)
+
+    result = {"handleId": handle, "type": type_of(obj), "assemblyName": "Standin",
+              "value": None, "members": [], "collectionInfo": None}
+    if isinstance(obj, list):
+        result["collectionInfo"] = {
+            "isCollection": True,
+            "count": len(obj),
+            "elementType": "System.Object",
+            "elements": [
+                {"index": i, "handleId": child(value), "type": type_of(value),
+                 "value": value if is_primitive(value) else None}
+                for i, value in enumerate(obj)
+            ],
+        }
+    else:
+        for name, value in obj.items():
+            result["members"].append({
+                "name": name, "type": type_of(value), "assemblyName": "Standin",
+                "isPrimitive": is_primitive(value), "handleId": child(value),
+                "value": value if is_primitive(value) else None,
+            })
+    return result
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler mirroring viewer-mod's Router for blueprint endpoints."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes on a keep-alive connection;
+    # with Nagle on, each follow-up request waits for a delayed ACK
+    disable_nagle_algorithm = True
+    store: BlueprintStore = None
+    registry: HandleRegistry = None
+    latency: float = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, status: int, data):
+        body = json.dumps(data, separators=(',', ':')).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_bytes(self, content_type: str, body: bytes):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunked_lines(self, lines):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            data = line.encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def simulate_latency(self):
+        if self.latency:
+            time.sleep(self.latency / 1000)
+
+    def roots(self) -> list:
+        blueprints = [self.store.blueprints[guid] for guid in self.store.guids]
+        roots = [("Blueprints", blueprints)]
+        if blueprints:
+            roots.append(("Selected", blueprints[0]))
+        return [{"name": name, "handleId": self.registry.register(obj), "type": type_of(obj),
+                 "assemblyName": "Standin"} for name, obj in roots]
+
+    def do_POST(self):
+        self.simulate_latency()
+        path = self.path.lower()
+        if path == "/api/roots":
+            self.read_json()
+            self.send_json(200, self.roots())
+            return
+        if path == "/api/inspect":
+            handle = str(self.read_json().get("handleId", ""))
+            try:
+                uuid.UUID(handle)
+            except ValueError:
+                self.send_json(400, {"error": "Invalid or missing handleId"})
+                return
+            obj = self.registry.get(handle)
+            if obj is None:
+                self.send_json(404, {"error": "Handle not found", "handleId": handle})
+                return
+            self.send_json(200, inspect_object(self.registry, handle, obj))
+            return
+        if path == "/api/handles/clear":
+            self.read_json()
+            self.registry.clear()
+            self.send_json(200, {"cleared": True})
+            return
+        if path in ("/api/blueprints/range", "/api/blueprints/equipment/stream"):
+            body = self.read_json()
+            if "start" not in body or "count" not in body:
+                self.send_json(400, {"error": "Missing start/count"})
+                return
+            blueprints = self.store.range(int(body["start"]), int(body["count"]))
+            if path == "/api/blueprints/range":
+                self.send_json(200, {"total": len(self.store.guids), "start": body["start"],
+                                     "count": body["count"], "blueprints": blueprints})
+            else:
+                self.send_chunked_lines(json.dumps(bp, separators=(',', ':')) for bp in blueprints)
+            return
+        self.read_json()
+        self.send_json(404, {"error": "Not found", "path": path})
+
+    def do_GET(self):
+        self.simulate_latency()
+        path = self.path.lower()
+        if path.startswith("/api/image/"):
+            obj = self.registry.get(path[len("/api/image/"):])
+            png = self.store.icon(obj["meta"]["Guid"]) if isinstance(obj, dict) and "meta" in obj else None
+            if png is None:
+                self.send_json(404, {"error": "Could not extract image from handle"})
+                return
+            self.send_bytes("image/png", png)
+        elif path == "/api/blueprints":
+            self.send_json(200, {"blueprints": [bp["meta"] for bp in self.store.blueprints.values()]})
+        elif path.startswith("/api/blueprints/equipment/icon/"):
+            guid = path[len("/api/blueprints/equipment/icon/"):].strip("/").removesuffix(".png")
+            if guid not in self.store.blueprints:
+                self.send_json(404, {"error": "Blueprint not found"})
+                return
+            png = self.store.icon(guid)
+            if png is None:
+                self.send_json(404, {"error": "Icon not found on blueprint"})
+                return
+            self.send_bytes("image/png", png)
+        elif path.startswith("/api/blueprints/"):
+            guid = path[len("/api/blueprints/"):].replace("-", "")
+            blueprint = self.store.blueprints.get(guid)
+            if blueprint is None:
+                self.send_json(404, {"error": "Blueprint not found"})
+                return
+            self.send_json(200, blueprint)
+        else:
+            self.send_json(404, {"error": "Not found", "path": path})
+
+
+def make_server(store: BlueprintStore, port: int, latency: float = 0.0) -> ThreadingHTTPServer:
+    """Create (but do not start) a stand-in server bound to 127.0.0.1:port."""
+    handler = type("Handler", (StandInHandler,), {"store": store, "registry": HandleRegistry(), "latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    data_dir = args.extraction_dir or get_latest_extraction(default_extractions_dir())
+
+    print(f"Loading blueprints from {data_dir}...")
+    store = BlueprintStore(data_dir, args.icon_dir)
+    server = make_server(store, args.port, args.latency)
+    print(f"Serving {len(store.guids):,} blueprints at http://127.0.0.1:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1042 @@
+// Global state
+let db = null;
+let analyticsById = new Map();
+let itemsById = new Map();
+let currentItems = [];
+let currentSort = 'name-asc';
+
+// Old paginated links (?page=N) scroll to where that page started
+const ITEMS_PER_PAGE = 50;
+
+// Filter state
+let filtersExpanded = false;
+let activeFilters = {
+    rarity: [],
+    weaponType: [],
+    family: [],
+    armorCategory: []
+};
+
+// Search runs in js/search-worker.js against the build's search-index.json
+// (itemdb/search.py); without Worker support it runs here via js/search.js
+const FUSE_URL = 'https://cdn.jsdelivr.net/npm/fuse.js@7.0.0/dist/fuse.min.js';
+let searchReady = null;
+let searchWorker = null;
+let localSearch = null;
+let queryCounter = 0;
+const pendingQueries = new Map();
+
+// Virtualized grid: every row is as tall as the tallest card measured so
+// far, so only the rows near the viewport have to be in the DOM
+const ROW_HEIGHT_ESTIMATE = 260;
+const OVERSCAN_ROWS = 2;
+let grid = { rowHeight: ROW_HEIGHT_ESTIMATE, columns: 1, gap: 0, first: -1, last: -1 };
+let gridFrame = 0;
+let routeCounter = 0;
+
+// Load the database
+async function loadDatabase() {
+    try {
+        const startTime = performance.now();
+        const response = await fetch('items.json');
+        db = await response.json();
+        const loadTime = performance.now() - startTime;
+
+        expandText(db);
+        itemsById = new Map(db.items.map(item => [item.id, item]));
+        buildAnalyticsIndex();
+
+        // Show database size info
+        document.getElementById('db-size').textContent = `Loaded ${db.items.length.toLocaleString()} items in ${loadTime.toFixed(0)}ms`;
+
+        startSearch();
+        renderNavigation();
+        handleRouteChange();
+    } catch (error) {
+        console.error('Failed to load database:', error);
+        document.getElementById('content').innerHTML =
+            '<div class="no-results"><h2>Failed to load database</h2><p>' + error.message + '</p></div>';
+    }
+}
+
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = () => reject(new Error('Failed to load ' + src));
+        document.head.appendChild(script);
+    });
+}
+
+function startSearch() {
+    searchReady = startWorkerSearch().catch(error => {
+        console.warn('Search worker unavailable, searching on the main thread:', error);
+        return startLocalSearch();
+    });
+}
+
+function startWorkerSearch() {
+    return new Promise((resolve, reject) => {
+        if (typeof Worker === 'undefined') throw new Error('Web Workers are not supported');
+        const worker = new Worker('js/search-worker.js');
+        worker.onmessage = ({ data }) => {
+            if (data.type === 'need-items') {
+                // No usable search-index.json; send the fields it indexes
+                const items = db.items.map(item => {
+                    const record = {};
+                    data.fields.forEach(field => { record[field] = item[field]; });
+                    return record;
+                });
+                worker.postMessage({ type: 'items', items });
+            } else if (data.type === 'ready') {
+                searchWorker = worker;
+                resolve();
+            } else if (data.type === 'results') {
+                const pending = pendingQueries.get(data.id);
+                pendingQueries.delete(data.id);
+                if (pending) pending.resolve(data.rows);
+            }
+        };
+        worker.onerror = event => {
+            event.preventDefault();
+            worker.terminate();
+            const error = new Error(event.message || 'Search worker failed');
+            if (searchWorker !== worker) {
+                reject(error);
+                return;
+            }
+            // Failed after starting: answer the outstanding queries here
+            console.warn('Search worker failed, searching on the main thread:', error);
+            searchWorker = null;
+            searchReady = startLocalSearch();
+            pendingQueries.forEach(({ resolve: done, request }) => {
+                done(searchReady.then(() => localSearch.query(request)));
+            });
+            pendingQueries.clear();
+        };
+        worker.postMessage({
+            type: 'init',
+            url: new URL('search-index.json', window.location.href).href,
+            items: db.items.length
+        });
+    });
+}
+
+async function startLocalSearch() {
+    if (!window.Fuse) await loadScript(FUSE_URL);
+    if (!window.itemSearch) await loadScript('js/search.js');
+    localSearch = itemSearch.createSearch(itemSearch.indexFromItems(db.items));
+}
+
+// Resolve to the matching rows of db.items, filtered and in display order
+async function queryItems(request) {
+    await searchReady;
+    if (!searchWorker) return localSearch.query(request);
+    return new Promise(resolve => {
+        const id = ++queryCounter;
+        pendingQueries.set(id, { resolve, request });
+        searchWorker.postMessage({ type: 'query', id, ...request });
+    });
+}
+
+// Prerendered shells (itemdb/prerender.py) hold only their route's markup.
+// Take the rest of the page (search, sort and filter controls) from
+// index.html and move the prerendered parts into it.
+async function adoptPageShell() {
+    const response = await fetch('index.html');
+    if (!response.ok) throw new Error(`index.html: HTTP ${response.status}`);
+    const page = new DOMParser().parseFromString(await response.text(), 'text/html');
+    ['page-title', 'page-description', 'nav-categories', 'content'].forEach(id => {
+        page.getElementById(id).innerHTML = document.getElementById(id).innerHTML;
+    });
+    page.body.querySelectorAll('script').forEach(script => script.remove());
+    document.body.replaceChildren(...Array.from(page.body.childNodes, node => document.adoptNode(node)));
+    if (document.body.dataset.prerendered === 'item') {
+        document.getElementById('sort-controls').style.display = 'none';
+        document.getElementById('filter-controls').style.display = 'none';
+    }
+}
+
+// Item links opened on index.html: show the item's static shell
+// (itemdb/prerender.py) while the database loads. Shells carry their
+// content already, and older builds have none.
+async function loadPrerendered() {
+    const { itemId } = parseHash();
+    if (!itemId || document.body.dataset.prerendered) return;
+    try {
+        const response = await fetch(`items/${encodeURIComponent(itemId)}.html`);
+        if (!response.ok) return;
+        const page = new DOMParser().parseFromString(await response.text(), 'text/html');
+        // The database won the race, or the route moved on
+        if (db || parseHash().itemId !== itemId) return;
+        ['page-title', 'page-description', 'nav-categories', 'content'].forEach(id => {
+            const element = page.getElementById(id);
+            if (element) document.getElementById(id).innerHTML = element.innerHTML;
+        });
+        document.getElementById('sort-controls').style.display = 'none';
+        document.getElementById('filter-controls').style.display = 'none';
+    } catch (error) {
+        console.warn('No prerendered page for this item:', error);
+    }
+}
+
+// Resolve string table references (see itemdb/strings.py). Identical
+// texts resolve to the same string, so they are only held once.
+function expandText(db) {
+    if (!db.text) return;
+    const { fields, strings, templates } = db.text;
+    const resolve = ref => {
+        if (typeof ref === 'number') return strings[ref];
+        const parts = templates[ref[0]];
+        let text = parts[0];
+        for (let i = 1; i < parts.length; i++) {
+            text += ref[i] + parts[i];
+        }
+        return text;
+    };
+    db.items.forEach(item => {
+        fields.forEach(field => {
+            if (item[field] !== undefined && typeof item[field] !== 'string') {
+                item[field] = resolve(item[field]);
+            }
+        });
+    });
+}
+
+// Map item IDs to their precomputed analytics row (columns are built at generation time)
+function buildAnalyticsIndex() {
+    analyticsById = new Map();
+    if (!db.analytics) return;
+    Object.values(db.analytics).forEach(columns => {
+        const names = Object.keys(columns).filter(name => name !== 'rows');
+        columns.rows.forEach((itemIdx, j) => {
+            const row = {};
+            names.forEach(name => { row[name] = columns[name][j]; });
+            analyticsById.set(db.items[itemIdx].id, row);
+        });
+    });
+}
+
+// Render sidebar navigation
+function renderNavigation() {
+    const nav = document.getElementById('nav-categories');
+
+    let html = '<div class="nav-section"><div class="nav-section-title">Browse</div>';
+
+    // Equipment categories, then any extra ones the build declared per section
+    const equipmentCats = ['all', 'weapons', 'armor', 'shields', 'helmets', 'gloves', 'boots', 'cloaks', 'rings', 'amulets', 'usables'];
+    const starshipCats = ['starship-weapons', 'void-shields', 'plasma-drives', 'auger-arrays'];
+    const knownCats = new Set([...equipmentCats, ...starshipCats]);
+    Object.entries(db.categories).forEach(([catId, cat]) => {
+        if (knownCats.has(catId)) return;
+        (cat.section === 'starship' ? starshipCats : equipmentCats).push(catId);
+    });
+
+    equipmentCats.forEach(catId => {
+        const cat = db.categories[catId];
+        if (cat) {
+            const count = db.counts[catId] || 0;
+            html += `<a href="#/${catId}" class="nav-item" data-category="${catId}">
+                ${cat.title} <span class="count">${count.toLocaleString()}</span>
+            </a>`;
+        }
+    });
+
+    html += '</div><div class="nav-section"><div class="nav-section-title">Starship</div>';
+
+    // Starship categories
+    starshipCats.forEach(catId => {
+        const cat = db.categories[catId];
+        if (cat) {
+            const count = db.counts[catId] || 0;
+            html += `<a href="#/${catId}" class="nav-item" data-category="${catId}">
+                ${cat.title} <span class="count">${count.toLocaleString()}</span>
+            </a>`;
+        }
+    });
+
+    html += '</div>';
+    nav.innerHTML = html;
+}
+
+// Parse the URL hash
+function parseHash() {
+    const hash = window.location.hash.slice(1) || '/all';
+    const parts = hash.split('?');
+    const path = parts[0].slice(1) || 'all'; // Remove leading /
+
+    const params = new URLSearchParams(parts[1] || '');
+    const query = params.get('q') || '';
+    const page = parseInt(params.get('page')) || 1;
+
+    // Check if this is an item detail route: /item/{id}
+    if (path.startsWith('item/')) {
+        const itemId = path.slice(5); // Remove 'item/' prefix
+        return { category: null, query: '', page: 1, itemId };
+    }
+
+    return { category: path, query, page, itemId: null };
+}
+
+// Update URL hash
+function setHash(category, query = '', page = 1) {
+    let hash = `#/${category}`;
+    const params = new URLSearchParams();
+    if (query) params.set('q', query);
+    if (page > 1) params.set('page', page.toString());
+    const paramStr = params.toString();
+    if (paramStr) hash += '?' + paramStr;
+
+    if (window.location.hash !== hash) {
+        window.location.hash = hash;
+    }
+}
+
+// Handle route changes
+async function handleRouteChange() {
+    if (!db) return;
+
+    const route = ++routeCounter;
+    const { category, query, page, itemId } = parseHash();
+
+    // If viewing an item detail page
+    if (itemId) {
+        renderItemDetailPage(itemId);
+        return;
+    }
+
+    // Show sort controls and filter controls for list view
+    document.getElementById('sort-controls').style.display = 'flex';
+    document.getElementById('filter-controls').style.display = 'block';
+
+    // Show/hide category-specific filters
+    document.getElementById('filter-weapon-type').style.display = (category === 'weapons' || category === 'all') ? 'block' : 'none';
+    document.getElementById('filter-weapon-family').style.display = (category === 'weapons' || category === 'all') ? 'block' : 'none';
+    document.getElementById('filter-armor-category').style.display = (category === 'armor' || category === 'all') ? 'block' : 'none';
+
+    // Update active nav item
+    document.querySelectorAll('.nav-item').forEach(item => {
+        item.classList.toggle('active', item.dataset.category === category);
+    });
+
+    // Update search input
+    const searchInput = document.getElementById('search-input');
+    if (searchInput.value !== query) {
+        searchInput.value = query;
+    }
+
+    // Search, filter and sort off the main thread
+    const rows = await queryItems({
+        category,
+        query,
+        filters: filtersExpanded ? activeFilters : null,
+        sort: currentSort
+    });
+    // A later route change replaced this one while the query ran
+    if (route !== routeCounter) return;
+    const items = Array.from(rows, row => db.items[row]);
+
+    currentItems = items;
+
+    // Update page header
+    const catInfo = db.categories[category] || { title: 'Items', icon: '' };
+    document.getElementById('page-title').textContent = query
+        ? `Search: "${query}"`
+        : catInfo.title;
+    document.getElementById('page-description').textContent =
+        `${items.length.toLocaleString()} items${category !== 'all' ? ' in ' + catInfo.title.toLowerCase() : ''}`;
+
+    // Search info bar
+    const searchInfoContainer = document.getElementById('search-info-container');
+    if (query) {
+        searchInfoContainer.innerHTML = `
+            <div class="search-info">
+                <span>Showing ${items.length.toLocaleString()} results for "<strong>${escapeHtml(query)}</strong>"${category !== 'all' ? ' in ' + catInfo.title : ''}</span>
+                <button class="clear-btn" onclick="clearSearch()">Clear Search</button>
+            </div>
+        `;
+    } else {
+        searchInfoContainer.innerHTML = '';
+    }
+
+    renderItems(page > 1 ? (page - 1) * ITEMS_PER_PAGE : 0);
+}
+
+// Render the result grid, scrolled to show the item at `startIndex`
+function renderItems(startIndex = 0) {
+    const content = document.getElementById('content');
+
+    if (currentItems.length === 0) {
+        content.innerHTML = '<div class="no-results"><h2>No items found</h2><p>Try a different search or category.</p></div>';
+        return;
+    }
+
+    content.innerHTML = '<div class="virtual-grid" id="virtual-grid"><div class="item-grid"></div></div>';
+    measureGrid();
+    updateGrid(true);
+
+    const startRow = Math.floor(startIndex / grid.columns);
+    const gridTop = document.getElementById('virtual-grid').getBoundingClientRect().top + window.scrollY;
+    window.scrollTo(0, startRow > 0 ? gridTop + startRow * (grid.rowHeight + grid.gap) : 0);
+    updateGrid();
+}
+
+// Read the column count and gap the stylesheet gives the grid
+function measureGrid() {
+    const container = document.getElementById('virtual-grid');
+    if (!container) return;
+    const style = getComputedStyle(container.firstElementChild);
+    grid.columns = Math.max(1, style.gridTemplateColumns.split(' ').length);
+    grid.gap = parseFloat(style.rowGap) || 0;
+}
+
+// Render the rows that are in or near the viewport
+function updateGrid(force = false) {
+    const container = document.getElementById('virtual-grid');
+    if (!container) return;
+    const inner = container.firstElementChild;
+    const stride = grid.rowHeight + grid.gap;
+    const rowCount = Math.ceil(currentItems.length / grid.columns);
+    container.style.height = `${rowCount * stride - grid.gap}px`;
+    inner.style.gridAutoRows = `${grid.rowHeight}px`;
+
+    const top = container.getBoundingClientRect().top;
+    const first = Math.max(0, Math.floor(-top / stride) - OVERSCAN_ROWS);
+    const last = Math.min(rowCount - 1, Math.floor((window.innerHeight - top) / stride) + OVERSCAN_ROWS);
+    if (!force && first === grid.first && last === grid.last) return;
+    grid.first = first;
+    grid.last = last;
+
+    inner.style.transform = `translateY(${first * stride}px)`;
+    inner.innerHTML = currentItems
+        .slice(first * grid.columns, (last + 1) * grid.columns)
+        .map(renderItemCard)
+        .join('');
+
+    // Grow the rows to fit the tallest card, keeping the rows in view in place
+    const tallest = Math.max(0, ...Array.from(inner.children, card => card.scrollHeight));
+    if (tallest > grid.rowHeight) {
+        grid.rowHeight = tallest;
+        if (top < 0) window.scrollBy(0, (-top / stride) * (tallest + grid.gap - stride));
+        updateGrid(true);
+    }
+}
+
+function scheduleGridUpdate() {
+    if (gridFrame) return;
+    gridFrame = requestAnimationFrame(() => {
+        gridFrame = 0;
+        updateGrid();
+    });
+}
+
+// Render a single item card
+function renderItemCard(item) {
+    const rarityClass = getRarityClass(item.rarity);
+    let statsHtml = '';
+
+    // Clean up type labels
+    const categoryLabels = {
+        'helmets': 'Helmet',
+        'gloves': 'Gloves',
+        'boots': 'Boots',
+        'cloaks': 'Cloak',
+        'rings': 'Ring',
+        'amulets': 'Amulet',
+        'shields': 'Shield',
+        'usables': 'Consumable'
+    };
+    let typeLabel = categoryLabels[item.category] || item.type.replace('Blueprint', '').replace('Item', '').replace('Equipment', '');
+
+    if (item.category === 'weapons') {
+        const attackType = item.isRanged ? 'Ranged' : item.isMelee ? 'Melee' : '';
+        typeLabel = [attackType, item.family].filter(Boolean).join(' • ') || typeLabel;
+        statsHtml = `
+            <div class="stat-row">
+                <span class="stat-label">Damage</span>
+                <span class="stat-value damage">${item.damageMin}-${item.damageMax}</span>
+            </div>
+            <div class="stat-row">
+                <span class="stat-label">Penetration</span>
+                <span class="stat-value penetration">${item.penetration}%</span>
+            </div>
+            <div class="stat-row">
+                <span class="stat-label">Range</span>
+                <span class="stat-value range">${item.range}</span>
+            </div>
+        `;
+    } else if (item.category === 'armor') {
+        typeLabel = item.armorCategory ? item.armorCategory + ' Armor' : 'Armor';
+        statsHtml = `
+            <div class="stat-row">
+                <span class="stat-label">Absorption</span>
+                <span class="stat-value">${item.damageAbsorption}%</span>
+            </div>
+            <div class="stat-row">
+                <span class="stat-label">Deflection</span>
+                <span class="stat-value">${item.damageDeflection}</span>
+            </div>
+        `;
+    } else if (item.category === 'starship-weapons') {
+        typeLabel = item.weaponType || 'Starship Weapon';
+        const slots = Array.isArray(item.allowedSlots) ? item.allowedSlots.join(', ') : '';
+        statsHtml = `
+            <div class="stat-row">
+                <span class="stat-label">Shots</span>
+                <span class="stat-value">${item.damageInstances}</span>
+            </div>
+            <div class="stat-row">
+                <span class="stat-label">Slot</span>
+                <span class="stat-value">${slots || 'Any'}</span>
+            </div>
+        `;
+    } else if (item.category === 'void-shields') {
+        typeLabel = 'Void Shield Generator';
+        statsHtml = `
+            <div class="stat-row">
+                <span class="stat-label">Shield Bonus</span>
+                <span class="stat-value">${item.shieldStrength || 0}</span>
+            </div>
+        `;
+    } else if (item.category === 'plasma-drives') {
+        typeLabel = 'Plasma Drive';
+        statsHtml = `
+            <div class="stat-row">
+                <span class="stat-label">Speed</span>
+                <span class="stat-value">${item.speed || 0}</span>
+            </div>
+            <div class="stat-row">
+                <span class="stat-label">Maneuver</span>
+                <span class="stat-value">${item.maneuverability || 0}</span>
+            </div>
+        `;
+    } else if (item.category === 'auger-arrays') {
+        typeLabel = 'Auger Array';
+        statsHtml = `
+            <div class="stat-row">
+                <span class="stat-label">Detection</span>
+                <span class="stat-value">${item.detectionRadius || 0}</span>
+            </div>
+        `;
+    }
+
+    // Add rarity to all cards
+    statsHtml += `
+        <div class="stat-row">
+            <span class="stat-label">Rarity</span>
+            <span class="stat-value rarity-${rarityClass}">${item.rarity}</span>
+        </div>
+    `;
+
+    // Plain-text summary is compiled at build time (CSS handles truncation)
+    const shortDesc = item.summary;
+
+    const imgHtml = renderIcon(item);
+
+    return `
+        <div class="item-card" onclick="showItemDetail('${item.id}')">
+            <div class="item-card-header">
+                <div class="item-icon rarity-border-${rarityClass}">${imgHtml}</div>
+                <div class="item-title-area">
+                    <div class="item-name rarity-${rarityClass}">${escapeHtml(item.name)}</div>
+                    <div class="item-type">${escapeHtml(typeLabel)}</div>
+                </div>
+            </div>
+            <div class="item-card-body">
+                <div class="item-stats">${statsHtml}</div>
+                ${shortDesc ? `<div class="item-description">${escapeHtml(shortDesc)}</div>` : ''}
+            </div>
+        </div>
+    `;
+}
+
+// Item icon, using the build's icon metadata (itemdb/images.py) when present:
+// items without an icon make no request, and the others lazy-load over
+// their dominant colour in a box sized from the icon's dimensions
+function renderIcon(item) {
+    const fallback = `onerror="this.style.display='none';this.parentElement.innerHTML='[IMG]';"`;
+    if (item.icon === undefined) {
+        return `<img src="images/${item.id}.png" alt="" ${fallback}>`;
+    }
+    if (!item.icon) return '[IMG]';
+    const { width, height, color } = item.icon;
+    const placeholder = color ? ` style="background-color: ${color}" onload="this.style.backgroundColor=''"` : '';
+    return `<img src="images/${item.id}.png" alt="" width="${width}" height="${height}" loading="lazy" decoding="async"${placeholder} ${fallback}>`;
+}
+
+// Navigate to item detail page
+function showItemDetail(itemId) {
+    window.location.hash = `#/item/${itemId}`;
+}
+
+// Render item detail page in main content
+function renderItemDetailPage(itemId) {
+    const item = itemsById.get(itemId);
+    const content = document.getElementById('content');
+    const searchInfoContainer = document.getElementById('search-info-container');
+
+    // Hide sort controls and filters for detail view
+    document.getElementById('sort-controls').style.display = 'none';
+    document.getElementById('filter-controls').style.display = 'none';
+    searchInfoContainer.innerHTML = '';
+
+    if (!item) {
+        document.getElementById('page-title').textContent = 'Item Not Found';
+        document.getElementById('page-description').textContent = '';
+        content.innerHTML = `
+            <div class="no-results">
+                <h2>Item not found</h2>
+                <p>The item with ID "${escapeHtml(itemId)}" was not found.</p>
+                <a href="#/all" class="back-link">Back to all items</a>
+            </div>
+        `;
+        return;
+    }
+
+    const rarityClass = getRarityClass(item.rarity);
+    const catInfo = db.categories[item.category] || { title: 'Item' };
+
+    // Update page header
+    document.getElementById('page-title').textContent = item.name;
+    document.getElementById('page-description').textContent = `${catInfo.title} - ${item.rarity}`;
+
+    // Clear nav active states for item pages
+    document.querySelectorAll('.nav-item').forEach(nav => nav.classList.remove('active'));
+
+    let statsHtml = '';
+
+    if (item.category === 'weapons') {
+        statsHtml = `
+            <div class="stat-box"><div class="label">Damage</div><div class="value">${item.damageMin} - ${item.damageMax}</div></div>
+            <div class="stat-box"><div class="label">Armour Penetration</div><div class="value">${item.penetration}%</div></div>
+            ${item.dodgePenetration ? `<div class="stat-box"><div class="label">Dodge Penalty</div><div class="value">-${item.dodgePenetration}</div></div>` : ''}
+            ${item.rateOfFire !== undefined ? `<div class="stat-box"><div class="label">Rate of Fire</div><div class="value">${item.rateOfFire}${item.recoil ? ` (Recoil ${item.recoil})` : ''}</div></div>` : ''}
+            <div class="stat-box"><div class="label">Range</div><div class="value">${item.range}</div></div>
+            ${item.ammo !== undefined ? `<div class="stat-box"><div class="label">Max Ammo</div><div class="value">${item.ammo}</div></div>` : ''}
+            ${item.family ? `<div class="stat-box"><div class="label">Family</div><div class="value">${item.family}</div></div>` : ''}
+            ${item.holdingType ? `<div class="stat-box"><div class="label">Holding</div><div class="value">${item.holdingType}</div></div>` : ''}
+            ${item.damageType ? `<div class="stat-box"><div class="label">Damage Type</div><div class="value">${item.damageType}</div></div>` : ''}
+        `;
+    } else if (item.category === 'armor') {
+        statsHtml = `
+            <div class="stat-box"><div class="label">Damage Absorption</div><div class="value">${item.damageAbsorption}%</div></div>
+            <div class="stat-box"><div class="label">Damage Deflection</div><div class="value">${item.damageDeflection}</div></div>
+            <div class="stat-box"><div class="label">Category</div><div class="value">${item.armorCategory || 'Unknown'}</div></div>
+        `;
+    } else if (item.category === 'starship-weapons') {
+        const slots = Array.isArray(item.allowedSlots) ? item.allowedSlots.join(', ') : 'Any';
+        statsHtml = `
+            <div class="stat-box"><div class="label">Weapon Type</div><div class="value">${item.weaponType || 'Unknown'}</div></div>
+            <div class="stat-box"><div class="label">Damage Instances</div><div class="value">${item.damageInstances}</div></div>
+            <div class="stat-box"><div class="label">Allowed Slots</div><div class="value">${slots}</div></div>
+        `;
+    } else if (item.category === 'void-shields') {
+        statsHtml = `
+            <div class="stat-box"><div class="label">Shield Strength Bonus</div><div class="value">${item.shieldStrength || 0}</div></div>
+        `;
+    } else if (item.category === 'plasma-drives') {
+        statsHtml = `
+            <div class="stat-box"><div class="label">Speed</div><div class="value">${item.speed || 0}</div></div>
+            <div class="stat-box"><div class="label">Maneuverability</div><div class="value">${item.maneuverability || 0}</div></div>
+        `;
+    } else if (item.category === 'auger-arrays') {
+        statsHtml = `
+            <div class="stat-box"><div class="label">Detection Radius Bonus</div><div class="value">${item.detectionRadius || 0}</div></div>
+        `;
+    }
+
+    // Rankings section (from build-time analytics)
+    let rankingsHtml = '';
+    const stats = analyticsById.get(item.id);
+    if (stats) {
+        const familyLabel = item.family || item.armorCategory || 'family';
+        const rankBox = (label, metric) => stats[metric + 'CategoryPct'] == null ? '' :
+            `<div class="stat-box"><div class="label">${label}</div><div class="value">${ordinal(stats[metric + 'CategoryPct'])} pct` +
+            `${stats[metric + 'FamilyPct'] != null ? ` <span class="tech-info">(${ordinal(stats[metric + 'FamilyPct'])} in ${escapeHtml(familyLabel)})</span>` : ''}</div></div>`;
+        rankingsHtml = `
+            ${stats.avgDamage != null ? `<div class="stat-box"><div class="label">Average Damage</div><div class="value">${stats.avgDamage}</div></div>` : ''}
+            ${stats.damagePerAP != null ? `<div class="stat-box"><div class="label">Damage per AP</div><div class="value">${stats.damagePerAP}</div></div>` : ''}
+            ${rankBox('Average Damage Rank', 'avgDamage')}
+            ${rankBox('Damage per AP Rank', 'damagePerAP')}
+            ${rankBox('Penetration Rank', 'penetration')}
+            ${rankBox('Rate of Fire Rank', 'rateOfFire')}
+            ${rankBox('Range Rank', 'range')}
+            ${rankBox('Absorption Rank', 'damageAbsorption')}
+            ${rankBox('Deflection Rank', 'damageDeflection')}
+        `;
+    }
+
+    // Abilities section for weapons
+    let abilitiesHtml = '';
+    if (item.abilities && item.abilities.length > 0) {
+        abilitiesHtml = `
+            <div class="detail-section">
+                <h2>Weapon Abilities</h2>
+                <div class="abilities-list">
+                    ${item.abilities.map(ab => `<span class="ability-tag">${ab.type}<span class="ap">${ab.ap} AP</span></span>`).join('')}
+                </div>
+            </div>
+        `;
+    }
+
+    // Compiled HTML from the build (itemdb/markup.py)
+    const descriptionHtml = item.descriptionHtml;
+    const flavorTextHtml = item.flavorTextHtml;
+
+    const detailImgHtml = renderIcon(item);
+
+    const detailHtml = `
+        <div class="item-detail-page">
+            <a href="#/${item.category}" class="back-link">&larr; Back to ${catInfo.title}</a>
+
+            <div class="detail-header">
+                <div class="detail-icon rarity-border-${rarityClass}">${detailImgHtml}</div>
+                <div class="detail-title">
+                    <h1 class="rarity-${rarityClass}">${escapeHtml(item.name)}</h1>
+                    <div class="detail-meta">
+                        <span class="rarity-${rarityClass}">${item.rarity}</span>
+                        <span>${catInfo.title}</span>
+                    </div>
+                </div>
+            </div>
+
+            ${statsHtml ? `<div class="detail-section"><h2>Statistics</h2><div class="stats-grid">${statsHtml}</div></div>` : ''}
+            ${rankingsHtml ? `<div class="detail-section"><h2>Rankings</h2><div class="stats-grid">${rankingsHtml}</div></div>` : ''}
+            ${abilitiesHtml}
+
+            <div class="detail-section">
+                <h2>Description</h2>
+                <p class="description-text">${descriptionHtml || 'No description available.'}</p>
+            </div>
+
+            ${flavorTextHtml ? `<div class="detail-section"><h2>Flavor Text</h2><p class="flavor-text">${flavorTextHtml}</p></div>` : ''}
+
+            <div id="item-references"></div>
+
+            <div id="item-history"></div>
+
+            <div class="detail-section">
+                <h2>Technical Info</h2>
+                <p class="tech-info">GUID: <code>${item.id}</code></p>
+            </div>
+        </div>
+    `;
+
+    content.innerHTML = detailHtml;
+    window.scrollTo(0, 0);
+
+    renderItemReferences(item.id);
+    renderItemHistory(item.id);
+}
+
+// Load change history (history.json is optional, only built with --history)
+let historyPromise = null;
+function loadHistory() {
+    if (!historyPromise) {
+        historyPromise = fetch('history.json')
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null);
+    }
+    return historyPromise;
+}
+
+// Render the change timeline for an item, if it has one
+async function renderItemHistory(itemId) {
+    const history = await loadHistory();
+    const container = document.getElementById('item-history');
+    if (!history || !container || parseHash().itemId !== itemId) return;
+
+    const timeline = history.timelines[itemId];
+    if (!timeline || timeline.length === 0) return;
+
+    const entries = timeline.map(([idx, field, from, to]) => {
+        const snapshot = escapeHtml(history.snapshots[idx]);
+        if (field === '$added') return `<li>Added in ${snapshot}</li>`;
+        if (field === '$removed') return `<li>Removed in ${snapshot}</li>`;
+        if (from === null && to === null) return `<li>${escapeHtml(field)} changed in ${snapshot}</li>`;
+        return `<li>${escapeHtml(field)} ${escapeHtml(JSON.stringify(from))} &rarr; ${escapeHtml(JSON.stringify(to))} in ${snapshot}</li>`;
+    });
+
+    container.innerHTML = `
+        <div class="detail-section">
+            <h2>Change History</h2>
+            <ul class="tech-info">${entries.join('')}</ul>
+        </div>
+    `;
+}
+
+// Load the blueprint reference index (references.json, see itemdb/references.py)
+const SHARED_LIMIT = 12;
+let referencesPromise = null;
+function loadReferences() {
+    if (!referencesPromise) {
+        referencesPromise = fetch('references.json')
+            .then(response => response.ok ? response.json() : null)
+            .then(index => {
+                if (index) index.nodeByGuid = new Map(index.guids.map((guid, node) => [guid, node]));
+                return index;
+            })
+            .catch(() => null);
+    }
+    return referencesPromise;
+}
+
+// References from (forward) or to (reverse) a node: [{field, node}, ...]
+function referenceSlice(table, others, node) {
+    const refs = [];
+    for (let j = table.offsets[node]; j < table.offsets[node + 1]; j++) {
+        refs.push({ field: table.fields[j], node: others[j] });
+    }
+    return refs;
+}
+
+// "m_AttackOfOpportunityAbility" -> "Attack Of Opportunity Ability"
+function referenceLabel(field) {
+    return field.replace(/^m_/, '').replace(/([a-z])([A-Z])/g, '$1 $2');
+}
+
+// A referenced blueprint: a link if it is a site item, else its name and type
+function renderReferenceTag(index, node) {
+    const guid = index.guids[node];
+    const item = itemsById.get(guid);
+    if (item) {
+        return `<a class="ability-tag rarity-${getRarityClass(item.rarity)}" href="#/item/${guid}">${escapeHtml(item.name)}</a>`;
+    }
+    if (node >= index.blueprints) {
+        return `<span class="ability-tag" title="Not in this extraction"><code>${guid}</code></span>`;
+    }
+    const name = index.names[node] || guid;
+    return `<span class="ability-tag">${escapeHtml(name)}<span class="ap">${escapeHtml(index.typeNames[index.types[node]])}</span></span>`;
+}
+
+function renderReferenceGroups(index, refs) {
+    const groups = new Map();
+    refs.forEach(({ field, node }) => {
+        if (!groups.has(field)) groups.set(field, []);
+        groups.get(field).push(node);
+    });
+    return [...groups].map(([field, nodes]) => `
+        <div class="reference-group">
+            <h3>${escapeHtml(referenceLabel(index.fields[field]))}</h3>
+            <div class="abilities-list">${nodes.map(node => renderReferenceTag(index, node)).join('')}</div>
+        </div>
+    `).join('');
+}
+
+// Show what an item references, what references it and the items that
+// share a referenced blueprint (same enchantment, armor type, ...)
+async function renderItemReferences(itemId) {
+    const index = await loadReferences();
+    const container = document.getElementById('item-references');
+    if (!index || !container || parseHash().itemId !== itemId) return;
+
+    const node = index.nodeByGuid.get(itemId);
+    if (node === undefined) return;
+    const uses = referenceSlice(index.forward, index.forward.targets, node);
+    const usedBy = referenceSlice(index.reverse, index.reverse.sources, node);
+
+    let sharedHtml = '';
+    uses.forEach(({ field, node: target }) => {
+        const siblings = referenceSlice(index.reverse, index.reverse.sources, target)
+            .filter(ref => ref.field === field && ref.node !== node && itemsById.has(index.guids[ref.node]));
+        if (siblings.length === 0) return;
+        const more = siblings.length - SHARED_LIMIT;
+        sharedHtml += `
+            <div class="reference-group">
+                <h3>Same ${escapeHtml(referenceLabel(index.fields[field]))} (${siblings.length.toLocaleString()})</h3>
+                <div class="abilities-list">
+                    ${siblings.slice(0, SHARED_LIMIT).map(ref => renderReferenceTag(index, ref.node)).join('')}
+                    ${more > 0 ? `<span class="ability-tag">+${more.toLocaleString()} more</span>` : ''}
+                </div>
+            </div>
+        `;
+    });
+
+    const sections = [
+        ['References', renderReferenceGroups(index, uses)],
+        ['Referenced By', renderReferenceGroups(index, usedBy)],
+        ['Shared References', sharedHtml]
+    ].filter(([, html]) => html);
+    container.innerHTML = sections.map(([title, html]) => `
+        <div class="detail-section">
+            <h2>${title}</h2>
+            ${html}
+        </div>
+    `).join('');
+}
+
+// Clear search
+function clearSearch() {
+    const { category } = parseHash();
+    document.getElementById('search-input').value = '';
+    setHash(category);
+}
+
+// Helper: Get rarity CSS class
+function getRarityClass(rarity) {
+    const map = {
+        'Common': 'common',
+        'Uncommon': 'uncommon',
+        'Rare': 'rare',
+        'VeryRare': 'veryrare',
+        'Unique': 'unique'
+    };
+    return map[rarity] || 'common';
+}
+
+// Helper: Escape HTML
+function escapeHtml(text) {
+    if (!text) return '';
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+// Helper: English ordinal (1st, 2nd, 3rd, 11th, 22nd, ...)
+function ordinal(n) {
+    const tens = n % 100;
+    if (tens >= 11 && tens <= 13) return `${n}th`;
+    return n + ({ 1: 'st', 2: 'nd', 3: 'rd' }[n % 10] || 'th');
+}
+
+// Update filter UI state
+function updateFilterUI() {
+    const totalActive = Object.values(activeFilters).reduce((sum, arr) => sum + arr.length, 0);
+    const countEl = document.getElementById('active-filter-count');
+    const clearBtn = document.getElementById('clear-filters-btn');
+
+    if (totalActive > 0) {
+        countEl.textContent = totalActive;
+        countEl.style.display = 'inline';
+        clearBtn.style.display = 'inline';
+    } else {
+        countEl.style.display = 'none';
+        clearBtn.style.display = 'none';
+    }
+}
+
+// Clear all filters
+function clearFilters() {
+    activeFilters = {
+        rarity: [],
+        weaponType: [],
+        family: [],
+        armorCategory: []
+    };
+
+    // Uncheck all checkboxes and remove active class
+    document.querySelectorAll('.filter-chip').forEach(chip => {
+        chip.classList.remove('active');
+        chip.querySelector('input').checked = false;
+    });
+
+    updateFilterUI();
+    handleRouteChange();
+}
+
+// Toggle filters expanded/collapsed
+function toggleFilters() {
+    filtersExpanded = !filtersExpanded;
+    const sections = document.getElementById('filter-sections');
+    const toggleBtn = document.getElementById('filter-toggle-btn');
+
+    if (filtersExpanded) {
+        sections.classList.remove('collapsed');
+        sections.style.maxHeight = sections.scrollHeight + 'px';
+        toggleBtn.textContent = '−';
+        toggleBtn.title = 'Collapse filters';
+    } else {
+        sections.classList.add('collapsed');
+        sections.style.maxHeight = '0';
+        toggleBtn.textContent = '+';
+        toggleBtn.title = 'Expand filters';
+    }
+
+    handleRouteChange();
+}
+
+// Event listeners
+document.addEventListener('DOMContentLoaded', async () => {
+    if (document.body.dataset.prerendered) {
+        try {
+            await adoptPageShell();
+        } catch (error) {
+            // The prerendered page stays readable; its links lead to the SPA
+            console.error('Failed to load the page shell:', error);
+            return;
+        }
+    }
+    loadPrerendered();
+    loadDatabase();
+
+    // Search input with debounce
+    let searchTimeout;
+    document.getElementById('search-input').addEventListener('input', (e) => {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(() => {
+            const { category } = parseHash();
+            setHash(category, e.target.value.trim(), 1);
+        }, 300);
+    });
+
+    // Enter key in search
+    document.getElementById('search-input').addEventListener('keydown', (e) => {
+        if (e.key === 'Enter') {
+            clearTimeout(searchTimeout);
+            const { category } = parseHash();
+            setHash(category, e.target.value.trim(), 1);
+        }
+    });
+
+    // Sort dropdown
+    document.getElementById('sort-select').addEventListener('change', (e) => {
+        currentSort = e.target.value;
+        const { category, query } = parseHash();
+        setHash(category, query, 1);
+        handleRouteChange();
+    });
+
+    // Filter chips
+    document.querySelectorAll('.filter-chip').forEach(chip => {
+        chip.addEventListener('click', (e) => {
+            const filterType = chip.dataset.filter;
+            const filterValue = chip.dataset.value;
+            const checkbox = chip.querySelector('input');
+
+            // Toggle state
+            checkbox.checked = !checkbox.checked;
+            chip.classList.toggle('active', checkbox.checked);
+
+            // Update activeFilters
+            if (checkbox.checked) {
+                if (!activeFilters[filterType].includes(filterValue)) {
+                    activeFilters[filterType].push(filterValue);
+                }
+            } else {
+                activeFilters[filterType] = activeFilters[filterType].filter(v => v !== filterValue);
+            }
+
+            updateFilterUI();
+            handleRouteChange();
+        });
+    });
+
+    // Clear filters button
+    document.getElementById('clear-filters-btn').addEventListener('click', clearFilters);
+
+    // Toggle filters button
+    document.getElementById('filter-toggle-btn').addEventListener('click', toggleFilters);
+
+});
+
+// Hash change listener
+window.addEventListener('hashchange', handleRouteChange);
+
+// Keep the virtualized grid in step with the viewport
+window.addEventListener('scroll', scheduleGridUpdate, { passive: true });
+window.addEventListener('resize', () => {
+    grid.rowHeight = ROW_HEIGHT_ESTIMATE;
+    measureGrid();
+    updateGrid(true);
+});
@@ -0,0 +1,49 @@
+// Search worker: runs js/search.js off the main thread.
+//
+// Messages from the page:
+//   {type: 'init', url, items}      load the build's search index; `items` is
+//                                   the page's item count, to catch a stale index
+//   {type: 'items', items}          item records, if the index could not be used
+//   {type: 'query', id, category, query, filters, sort}
+//
+// Replies:
+//   {type: 'need-items', fields}    send the listed fields of every item
+//   {type: 'ready', size}
+//   {type: 'results', id, rows}     rows index db.items, in display order
+importScripts('https://cdn.jsdelivr.net/npm/fuse.js@7.0.0/dist/fuse.min.js', 'search.js');
+
+let search = null;
+
+async function loadIndex(url, expected) {
+    try {
+        const response = await fetch(url);
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const index = await response.json();
+        if (index.items !== expected) throw new Error(`index has ${index.items} items, page has ${expected}`);
+        return index;
+    } catch (error) {
+        console.warn('Search index unavailable, indexing the loaded items:', error);
+        return null;
+    }
+}
+
+function ready(index) {
+    search = itemSearch.createSearch(index);
+    postMessage({ type: 'ready', size: search.size });
+}
+
+self.onmessage = async ({ data }) => {
+    if (data.type === 'init') {
+        const index = await loadIndex(data.url, data.items);
+        if (index) {
+            ready(index);
+        } else {
+            postMessage({ type: 'need-items', fields: itemSearch.SEARCH_FIELDS });
+        }
+    } else if (data.type === 'items') {
+        ready(itemSearch.indexFromItems(data.items));
+    } else if (data.type === 'query') {
+        const rows = search.query(data);
+        postMessage({ type: 'results', id: data.id, rows }, [rows.buffer]);
+    }
+};
@@ -0,0 +1,141 @@
+// Item search, filtering and sorting over the build's search index.
+//
+// The index (search-index.json, written by itemdb/search.py) holds one
+// column per field in items.json order. Queries return row numbers into
+// db.items, already filtered and ordered:
+//
+//   const search = itemSearch.createSearch(index);
+//   const rows = search.query({ category, query, filters, sort });
+//
+// js/search-worker.js runs this off the main thread; the page loads it
+// directly only when Workers are unavailable. Needs Fuse.js.
+(function (global) {
+    'use strict';
+
+    // Fields the index must provide (see itemdb/search.py)
+    const SEARCH_FIELDS = ['id', 'name', 'summary', 'family', 'type',
+        'category', 'rarity', 'isMelee', 'isRanged', 'armorCategory'];
+
+    const FUSE_OPTIONS = {
+        keys: [
+            { name: 'name', weight: 2 },
+            { name: 'summary', weight: 1 },
+            { name: 'family', weight: 0.5 },
+            { name: 'type', weight: 0.5 }
+        ],
+        threshold: 0.15,
+        includeScore: true
+    };
+
+    // Rarity order for sorting
+    const RARITY_ORDER = {
+        'Common': 1,
+        'Pattern': 2,
+        'Unique': 3,
+        'Quest': 4,
+        'Trash': 0
+    };
+
+    // Build an index from loaded items (for databases without search-index.json).
+    // Columns stay plain lists; createSearch also accepts those.
+    function indexFromItems(items) {
+        const columns = {};
+        SEARCH_FIELDS.forEach(field => {
+            columns[field] = items.map(item => {
+                const value = item[field];
+                if (field === 'isMelee' || field === 'isRanged') return value ? 1 : 0;
+                return value === undefined || value === null ? '' : value;
+            });
+        });
+        return { items: items.length, fields: SEARCH_FIELDS, columns };
+    }
+
+    // A plain column, or {values, codes} for a dictionary-encoded one
+    function decodeColumn(column) {
+        return Array.isArray(column) ? column : column.codes.map(code => column.values[code]);
+    }
+
+    function createSearch(index) {
+        const columns = {};
+        SEARCH_FIELDS.forEach(field => { columns[field] = decodeColumn(index.columns[field]); });
+        const records = [];
+        for (let row = 0; row < index.items; row++) {
+            const record = { row };
+            SEARCH_FIELDS.forEach(field => { record[field] = columns[field][row]; });
+            records.push(record);
+        }
+        const fuse = new Fuse(records, FUSE_OPTIONS);
+        const orders = {};
+
+        const byName = (a, b) => (a.name || '').localeCompare(b.name || '');
+        const byRarity = (a, b) => (RARITY_ORDER[a.rarity] || 0) - (RARITY_ORDER[b.rarity] || 0);
+
+        // Every record in sort order; computed once per sort key
+        function sorted(sortKey) {
+            if (orders[sortKey]) return orders[sortKey];
+            const list = [...records];
+            switch (sortKey) {
+                case 'name-asc':
+                    list.sort(byName);
+                    break;
+                case 'name-desc':
+                    list.sort((a, b) => byName(b, a));
+                    break;
+                case 'rarity-asc':
+                    list.sort((a, b) => byRarity(a, b) || byName(a, b));
+                    break;
+                case 'rarity-desc':
+                    list.sort((a, b) => byRarity(b, a) || byName(a, b));
+                    break;
+            }
+            orders[sortKey] = list;
+            return list;
+        }
+
+        // Category and filter-chip test; `filters` is null while filters are collapsed
+        function matcher(category, filters) {
+            const all = category === 'all';
+            if (!filters) return record => all || record.category === category;
+
+            const weaponFilters = filters.weaponType.length > 0 || filters.family.length > 0;
+            const armorFilters = filters.armorCategory.length > 0;
+            return record => {
+                if (!all && record.category !== category) return false;
+                if (filters.rarity.length > 0 && !filters.rarity.includes(record.rarity)) return false;
+
+                // Weapon filters only show weapons that match
+                if (weaponFilters) {
+                    if (record.category !== 'weapons') return false;
+                    if (filters.weaponType.length > 0) {
+                        const matchesType = (filters.weaponType.includes('melee') && record.isMelee) ||
+                                            (filters.weaponType.includes('ranged') && record.isRanged);
+                        if (!matchesType) return false;
+                    }
+                    if (filters.family.length > 0 && !filters.family.includes(record.family)) return false;
+                }
+
+                // Armor filters only show armor that matches
+                if (armorFilters) {
+                    if (record.category !== 'armor') return false;
+                    if (!filters.armorCategory.includes(record.armorCategory)) return false;
+                }
+                return true;
+            };
+        }
+
+        // Search results keep relevance order; everything else uses the sort key
+        function query({ category = 'all', query = '', filters = null, sort = 'name-asc' }) {
+            const matches = matcher(category, filters);
+            const candidates = query ? fuse.search(query).map(result => result.item) : sorted(sort);
+            const rows = [];
+            candidates.forEach(record => {
+                if (matches(record)) rows.push(record.row);
+            });
+            return Int32Array.from(rows);
+        }
+
+        return { query, size: records.length };
+    }
+
+    global.itemSearch = { SEARCH_FIELDS, createSearch, indexFromItems };
+})(typeof window !== 'undefined' ? window : globalThis);